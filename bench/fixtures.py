@@ -0,0 +1,236 @@
+"""
+Synthetic fixtures for the coordinator benchmarks
+
+Everything is generated under a temporary CLAUDE_HOME with a fixed random
+seed, so runs at the same scale see identical data:
+
+- phase templates for create_workflow
+- N workflows with M tasks in dependency graphs (workflow.db)
+- K review board sessions of specialist reports
+- a large project tree for project type detection
+- a Phase 4 project database with execution history for check_health
+"""
+
+import json
+import random
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+SCALES = {
+    "small": {"workflows": 20, "tasks": 200, "reports": 10, "tree_files": 500, "history": 2000},
+    "medium": {"workflows": 200, "tasks": 2000, "reports": 50, "tree_files": 5000, "history": 20000},
+    "large": {"workflows": 1000, "tasks": 10000, "reports": 200, "tree_files": 20000, "history": 100000},
+}
+
+# Templates copied by WorkflowCoordinator.create_project_structure
+TEMPLATE_NAMES = [
+    "project-brief-template.md", "vision-template.md", "mission-template.md",
+    "execution-template.md", "test-plan-template.md", "research-readme-template.md",
+    "technical-research-template.md", "architecture-decisions-template.md",
+    "dependencies-template.md", "references-template.md", "examples-readme-template.md",
+    "review-checklist-template.md", "feedback-template.md",
+    "communication-log-template.md", "decisions-log-template.md",
+]
+
+AGENTS = ["backend-architect", "frontend-developer", "security-auditor", "task-manager",
+          "agent-testing-engineer", "documentation-expert", "research-manager"]
+
+
+def _ts(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def make_templates(claude_home: Path):
+    """Phase templates with the placeholders create_workflow fills in"""
+    templates = claude_home / "templates"
+    templates.mkdir(parents=True, exist_ok=True)
+    body = "\n".join(f"- [ ] Item {i} for [Project Name] ([project-slug])" for i in range(80))
+    for name in TEMPLATE_NAMES:
+        (templates / name).write_text(
+            f"# {name} - [Project Name]\n\n**Date:** [Date]\n\n"
+            "<!-- The initial user prompt/request that started this project -->\n\n" + body + "\n"
+        )
+
+
+def make_workflows(db_path: Path, workflows: int, tasks: int, rng: random.Random) -> Dict:
+    """
+    Workflows spread over all phases, tasks in per-workflow dependency graphs.
+
+    The first workflow ("hot") holds a tenth of the tasks so single-workflow
+    queries see a realistic large project; the rest are spread evenly.
+
+    Returns:
+        {'hot': workflow id, 'workflow_ids': [...]}
+    """
+    workflow_rows, task_rows = [], []
+    now = datetime.now()
+    workflow_ids = [str(uuid.uuid4()) for _ in range(workflows)]
+
+    hot_tasks = max(1, tasks // 10)
+    per_workflow = max(1, (tasks - hot_tasks) // max(1, workflows - 1))
+
+    for index, workflow_id in enumerate(workflow_ids):
+        updated = now - timedelta(minutes=rng.randrange(60 * 24 * 90))
+        workflow_rows.append((workflow_id, f"bench-project-{index}", rng.randint(1, 5),
+                              rng.choice(["in_progress", "review", "completed"]), _ts(updated)))
+
+        count = hot_tasks if index == 0 else per_workflow
+        ids: List[str] = []
+        for number in range(count):
+            task_id = str(uuid.uuid4())
+            # DAG: each task depends on up to 3 earlier tasks of its workflow
+            dependencies = rng.sample(ids, min(len(ids), rng.randint(0, 3))) if ids else []
+            task_rows.append((task_id, workflow_id, rng.randint(3, 5), f"Task {number}: implement component",
+                              rng.choice(AGENTS), json.dumps(dependencies) if dependencies else None,
+                              rng.choice(["pending", "in_progress", "completed"]),
+                              _ts(updated + timedelta(seconds=number))))
+            ids.append(task_id)
+
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.executemany("""
+            INSERT INTO workflows (id, project_name, current_phase, phase_status, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, workflow_rows)
+        conn.executemany("""
+            INSERT INTO phase_tasks
+            (id, workflow_id, phase, task_description, assigned_agent, dependencies, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, task_rows)
+    conn.close()
+
+    return {"hot": workflow_ids[0], "workflow_ids": workflow_ids}
+
+
+def make_transition_workflow(db_path: Path, tasks: int) -> str:
+    """A Phase 3 workflow whose tasks are done and deliverable approved"""
+    workflow_id = str(uuid.uuid4())
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.execute("""
+            INSERT INTO workflows (id, project_name, current_phase, phase_status)
+            VALUES (?, 'bench-transition', 3, 'in_progress')
+        """, (workflow_id,))
+        conn.execute("""
+            INSERT INTO phase_deliverables (id, workflow_id, phase, deliverable_type, content_path, status)
+            VALUES (?, ?, 3, 'execution', '03-execution.md', 'approved')
+        """, (str(uuid.uuid4()), workflow_id))
+        conn.executemany("""
+            INSERT INTO phase_tasks (id, workflow_id, phase, task_description, status)
+            VALUES (?, ?, 3, 'Completed task', 'completed')
+        """, [(str(uuid.uuid4()), workflow_id) for _ in range(tasks)])
+    conn.close()
+    return workflow_id
+
+
+def make_review_sessions(root: Path, sessions: int, roles: List[str], rng: random.Random) -> List[Path]:
+    """Review session directories with one report per specialist role"""
+    session_dirs = []
+    for index in range(sessions):
+        session_dir = root / f"session-{index:04d}"
+        session_dir.mkdir(parents=True, exist_ok=True)
+        for role in roles:
+            verdict = rng.choice(["APPROVED", "APPROVED WITH CONCERNS", "BLOCKED"])
+            sections = []
+            for heading in ("Blockers ❌", "Concerns ⚠️", "Recommendations 💡"):
+                items = "\n".join(f"- Finding {i}: {'detail ' * 12}" for i in range(rng.randint(0, 25)))
+                sections.append(f"## {heading}\n\n{items}\n")
+            (session_dir / f"{role}-review.md").write_text(
+                f"# {role.upper()} Review\n\n## Summary\n\n{'Context. ' * 200}\n\n"
+                + "\n".join(sections)
+                + f"\n## Final Verdict\n- Status: {verdict}\n- Confidence: High\n"
+            )
+        session_dirs.append(session_dir)
+    return session_dirs
+
+
+def make_project_tree(root: Path, files: int, rng: random.Random) -> Path:
+    """A polyglot project with nested source, test and infrastructure files"""
+    root.mkdir(parents=True, exist_ok=True)
+    for marker in ("package.json", "pyproject.toml", "Dockerfile", "manage.py", "main.tf"):
+        (root / marker).write_text("{}\n")
+    for directory in (".github/workflows", "migrations", "tests"):
+        (root / directory).mkdir(parents=True, exist_ok=True)
+
+    extensions = [".py", ".js", ".ts", ".go", ".md", ".json", ".txt"]
+    for index in range(files):
+        depth = rng.randint(1, 5)
+        directory = root.joinpath(*(f"{p}{rng.randrange(8)}" for p in ["pkg", "mod", "sub", "lib", "x"][:depth]))
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file_{index}{rng.choice(extensions)}").write_text("x = 1\n")
+    return root
+
+
+def make_execution_history(db_path: Path, rows: int, rng: random.Random):
+    """Phase 4 execution tables filled with a mix of recent and old activity"""
+    from project_migrations import migrate
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    migrate(db_path)
+    now = datetime.now()
+
+    def when():
+        return _ts(now - timedelta(minutes=rng.randrange(60 * 24 * 30)))
+
+    teams = ["Foundation", "Backend", "Frontend", "Research", "Quality", "Integration"]
+    sops = ["task_completion", "team_handoff", "quality_gate_enforcement", "blocker_escalation", "daily_sync"]
+
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.executemany("""
+            INSERT INTO agent_messages (timestamp, from_agent, to_agent, message_type, content, priority)
+            VALUES (?, ?, ?, 'status_update', 'Progress update', ?)
+        """, [(when(), rng.choice(AGENTS), rng.choice(AGENTS), rng.choice(["P0", "P1", "P2"]))
+              for _ in range(rows)])
+        conn.executemany("""
+            INSERT INTO handoff_log (timestamp, from_team, to_team, deliverable, status)
+            VALUES (?, ?, ?, 'deliverable', 'complete')
+        """, [(when(), rng.choice(teams), rng.choice(teams)) for _ in range(rows // 4)])
+        conn.executemany("""
+            INSERT INTO quality_gates (timestamp, gate_level, item_id, item_name, gate_status)
+            VALUES (?, 'task', ?, 'item', ?)
+        """, [(when(), f"T-{i}", rng.choice(["passed", "failed"])) for i in range(rows // 4)])
+        conn.executemany("""
+            INSERT INTO sop_compliance (timestamp, sop_name, item_id, compliance_status)
+            VALUES (?, ?, ?, ?)
+        """, [(when(), rng.choice(sops), f"T-{i}", rng.choice(["compliant", "compliant", "violation"]))
+              for i in range(rows)])
+        conn.executemany("""
+            INSERT INTO blockers (timestamp, blocker_id, blocker_type, description, current_level, status)
+            VALUES (?, ?, 'technical', 'Blocked', 'L1', ?)
+        """, [(when(), f"B-{i}", rng.choice(["active", "resolved"])) for i in range(rows // 20)])
+    conn.close()
+
+
+def build(claude_home: Path, scale: str, review_roles: List[str], seed: int = 42) -> Dict:
+    """
+    Generate every fixture for a scale under claude_home.
+
+    Returns:
+        Paths and ids the benchmarks need
+    """
+    from schema_registry import init_database
+
+    sizes = SCALES[scale]
+    rng = random.Random(seed)
+
+    make_templates(claude_home)
+    workflow_db = init_database("workflow", claude_home / "data" / "workflow.db")
+    workflows = make_workflows(workflow_db, sizes["workflows"], sizes["tasks"], rng)
+
+    project_db = claude_home / "projects" / "bench-execution" / "workflow.db"
+    make_execution_history(project_db, sizes["history"], rng)
+
+    return {
+        "sizes": sizes,
+        "workflow_db": workflow_db,
+        "hot_workflow": workflows["hot"],
+        "transition_workflow": make_transition_workflow(workflow_db, max(1, sizes["tasks"] // 10)),
+        "review_sessions": make_review_sessions(claude_home / "bench" / "reviews", sizes["reports"],
+                                                review_roles, rng),
+        "project_tree": make_project_tree(claude_home / "bench" / "tree", sizes["tree_files"], rng),
+        "project_db": project_db,
+    }
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Coordinator Benchmarks - Time the workflow hot paths against synthetic data
+
+Builds fixtures (bench/fixtures.py) in a temporary CLAUDE_HOME, times the
+hot paths of WorkflowCoordinator, ReviewBoardCoordinator and
+execution-coordinator.py, and writes JSON results. Results can be
+compared against a stored baseline; a benchmark regresses when its median
+is slower than the baseline by more than the threshold (default 25%) and
+by more than MIN_DELTA_MS, which keeps sub-millisecond noise out.
+
+Baselines live in bench/baselines/<scale>.json. Per-benchmark thresholds
+can be set in a baseline's "thresholds" object ({"create_workflow": 0.5}).
+
+Usage:
+    python3 bench/run_benchmarks.py [--scale small|medium|large] [--repeat N]
+                                    [--only name,...] [--output results.json]
+                                    [--baseline PATH] [--save-baseline]
+                                    [--threshold 0.25]
+
+Exit status is 1 when any benchmark regressed.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+BASELINES_DIR = BENCH_DIR / "baselines"
+
+DEFAULT_THRESHOLD = 0.25
+MIN_DELTA_MS = 0.05
+DEFAULT_REPEAT = {"small": 20, "medium": 10, "large": 5}
+
+# (iteration, reset) - reset runs untimed before each iteration
+Case = Tuple[Callable[[int], None], Optional[Callable[[], None]]]
+
+
+def load_script(name: str, filename: str):
+    """Import a script from scripts/ (several have hyphenated file names)"""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def build_cases(fixtures: Dict, modules: Dict) -> Dict[str, Case]:
+    """Benchmark name -> case, bound to the generated fixtures"""
+    workflow = modules["workflow"].WorkflowCoordinator(fixtures["workflow_db"])
+    review = modules["review"].ReviewBoardCoordinator()
+    execution = modules["execution"]
+    hot = fixtures["hot_workflow"]
+    transition = fixtures["transition_workflow"]
+
+    def create_workflow(i):
+        workflow.create_workflow(f"Bench Created {time.time_ns()} {i}", "Synthetic benchmark prompt")
+
+    def get_tasks(i):
+        workflow.get_tasks(hot)
+
+    def get_tasks_filtered(i):
+        workflow.get_tasks(hot, phase=4, status="pending")
+
+    def transition_phase(i):
+        success, message = workflow.transition_phase(transition)
+        assert success, message
+
+    def reset_transition():
+        workflow.update_phase(transition, 3)
+
+    def detect_project_type(i):
+        workflow.detect_project_type(fixtures["project_tree"])
+
+    def detect_current_phase(i):
+        workflow.detect_current_phase_from_state(fixtures["project_tree"])
+
+    def aggregate_findings(i):
+        for session_dir in fixtures["review_sessions"]:
+            review.aggregate_findings(session_dir)
+
+    def check_health(i):
+        with contextlib.redirect_stdout(io.StringIO()):
+            execution.check_health(fixtures["project_db"])
+
+    return {
+        "create_workflow": (create_workflow, None),
+        "get_tasks": (get_tasks, None),
+        "get_tasks_filtered": (get_tasks_filtered, None),
+        "transition_phase": (transition_phase, reset_transition),
+        "detect_project_type": (detect_project_type, None),
+        "detect_current_phase": (detect_current_phase, None),
+        "aggregate_findings": (aggregate_findings, None),
+        "check_health": (check_health, None),
+    }
+
+
+def time_case(case: Case, repeat: int) -> Dict:
+    """Run one warm-up and `repeat` timed iterations"""
+    iteration, reset = case
+    samples = []
+    for i in range(repeat + 1):
+        if reset:
+            reset()
+        started = time.perf_counter()
+        iteration(i)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i:
+            samples.append(elapsed)
+
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "max_ms": round(samples[-1], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)], 4),
+        "iterations": repeat,
+    }
+
+
+def run(scale: str, repeat: int, only: Optional[List[str]] = None) -> Dict:
+    """
+    Build fixtures in a temporary CLAUDE_HOME and time every benchmark.
+
+    HOME is pointed at the temporary directory before any script is
+    imported, since the scripts resolve ~/.claude at import time.
+    """
+    tmp_home = tempfile.mkdtemp(prefix="claude-bench-")
+    original_home = os.environ.get("HOME")
+    os.environ["HOME"] = tmp_home
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    sys.path.insert(0, str(BENCH_DIR))
+
+    try:
+        import fixtures as fixture_builder
+
+        modules = {
+            "workflow": load_script("workflow_coordinator", "workflow-coordinator.py"),
+            "review": load_script("review_board_coordinator", "review-board-coordinator.py"),
+            "execution": load_script("execution_coordinator", "execution-coordinator.py"),
+        }
+        roles = [s["role"] for s in modules["review"].ReviewBoardCoordinator().specialists]
+
+        started = time.time()
+        fixtures = fixture_builder.build(Path(tmp_home) / ".claude", scale, roles)
+        fixture_seconds = time.time() - started
+
+        cases = build_cases(fixtures, modules)
+        unknown = set(only or []) - set(cases)
+        if unknown:
+            raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+        results = {}
+        for name, case in cases.items():
+            if only and name not in only:
+                continue
+            results[name] = time_case(case, repeat)
+    finally:
+        if original_home is not None:
+            os.environ["HOME"] = original_home
+        shutil.rmtree(tmp_home, ignore_errors=True)
+
+    return {
+        "meta": {
+            "scale": scale,
+            "repeat": repeat,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixture_seconds": round(fixture_seconds, 2),
+        },
+        "sizes": fixtures["sizes"],
+        "results": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare(report: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare medians with a baseline.
+
+    Returns:
+        One row per benchmark with status 'ok', 'regression', 'improvement',
+        'new' (not in baseline) or 'missing' (only in baseline)
+    """
+    thresholds = baseline.get("thresholds", {})
+    base_results = baseline.get("results", {})
+    rows = []
+
+    for name in list(report["results"]) + [n for n in base_results if n not in report["results"]]:
+        current = report["results"].get(name)
+        base = base_results.get(name)
+        row = {"name": name, "baseline_ms": base and base["median_ms"],
+               "current_ms": current and current["median_ms"], "change": None}
+        if base is None:
+            row["status"] = "new"
+        elif current is None:
+            row["status"] = "missing"
+        else:
+            limit = thresholds.get(name, threshold)
+            delta = current["median_ms"] - base["median_ms"]
+            row["change"] = round(delta / base["median_ms"], 3) if base["median_ms"] else None
+            if delta > MIN_DELTA_MS and current["median_ms"] > base["median_ms"] * (1 + limit):
+                row["status"] = "regression"
+            elif -delta > MIN_DELTA_MS and current["median_ms"] < base["median_ms"] / (1 + limit):
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+
+    return rows
+
+
+def _print_report(report: Dict, comparison: Optional[List[Dict]]):
+    meta = report["meta"]
+    sizes = report["sizes"]
+    print(f"⏱️  Coordinator benchmarks ({meta['scale']}: {sizes['workflows']} workflows, "
+          f"{sizes['tasks']} tasks, {sizes['reports']} review sessions, {sizes['tree_files']} files)")
+    print(f"   fixtures built in {meta['fixture_seconds']}s, {meta['repeat']} iterations each\n")
+
+    rows = {r["name"]: r for r in comparison or []}
+    icons = {"ok": "✅", "regression": "❌", "improvement": "🚀", "new": "🆕", "missing": "⚠️ "}
+
+    for name, result in report["results"].items():
+        line = f"  {name:<22} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms"
+        row = rows.get(name)
+        if row:
+            change = f" ({row['change']:+.0%} vs {row['baseline_ms']:.3f} ms)" if row["change"] is not None else ""
+            line = f"{icons[row['status']]} {line.strip()}{change}"
+        print(line)
+
+    for row in comparison or []:
+        if row["status"] == "missing":
+            print(f"⚠️  {row['name']}: in baseline but not run")
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Time coordinator hot paths against synthetic fixtures")
+    parser.add_argument("--scale", choices=["small", "medium", "large"], default="small")
+    parser.add_argument("--repeat", type=int, help="Timed iterations per benchmark")
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--baseline", type=Path, help="Baseline to compare with (default: bench/baselines/<scale>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a regression (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    repeat = args.repeat or DEFAULT_REPEAT[args.scale]
+    only = [n.strip() for n in args.only.split(",")] if args.only else None
+    report = run(args.scale, repeat, only)
+
+    baseline_path = args.baseline or BASELINES_DIR / f"{args.scale}.json"
+    comparison = None
+    if not args.save_baseline and baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("meta", {}).get("scale", args.scale) != args.scale:
+            print(f"⚠️  Baseline {baseline_path} is for scale '{baseline['meta']['scale']}', not compared",
+                  file=sys.stderr)
+        else:
+            comparison = compare(report, baseline, args.threshold)
+            report["comparison"] = {"baseline": str(baseline_path), "threshold": args.threshold,
+                                    "benchmarks": comparison}
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        # Hand-tuned thresholds survive re-baselining
+        if baseline_path.exists():
+            report["thresholds"] = json.loads(baseline_path.read_text()).get("thresholds", {})
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report, comparison)
+        if args.save_baseline:
+            print(f"\n💾 Baseline saved: {baseline_path}")
+        elif comparison is None:
+            print(f"\nℹ️  No baseline at {baseline_path} (create one with --save-baseline)")
+
+    regressions = [r["name"] for r in comparison or [] if r["status"] == "regression"]
+    if regressions:
+        if not args.json:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
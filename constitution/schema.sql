@@ -1,4 +1,6 @@
 -- Agent Constitution Compliance Database Schema v1.0
+-- Declared in scripts/schema_registry.py ("constitution"); keep both in sync.
+-- Check a live database with: python3 ~/.claude/scripts/schema_registry.py verify constitution
 
 -- Track every agent session
 CREATE TABLE IF NOT EXISTS agent_sessions (
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Agent Accounting - Token and cost totals with per-agent budgets
+
+Keeps running per-day totals (calls, tokens, estimated USD) for every
+agent, every project and overall in ~/.claude/data/accounting.db, and
+enforces daily budgets before a request is sent.
+
+Budgets live in ~/.claude/config/budgets.json:
+
+    {
+      "agent":   {"*": {"daily_usd": 5}, "code-review-expert": {"daily_tokens": 500000}},
+      "project": {"my-app": {"daily_usd": 10}},
+      "total":   {"daily_usd": 50},
+      "pricing": {"claude-sonnet-4": [3.0, 15.0]}
+    }
+
+Pre-call estimates use the size of the agent's instructions (from the
+registry index, without reading the body) plus the task at ~4 bytes per
+token, and assume the full max_tokens of output, so a call is refused only
+if it could push a total over its budget.
+
+An admitted call holds a reservation for its estimate until record()
+replaces it with the actual usage (or release() drops it after an error).
+The check and the reservation share one BEGIN IMMEDIATE transaction, so
+concurrent calls from a batch, the agent server or other processes all
+count each other's pending estimates. Reservations left behind by a
+crashed process expire after RESERVATION_TTL seconds.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CLAUDE_HOME = Path.home() / ".claude"
+ACCOUNTING_DB = CLAUDE_HOME / "data" / "accounting.db"
+BUDGETS_PATH = CLAUDE_HOME / "config" / "budgets.json"
+
+BYTES_PER_TOKEN = 4
+RESERVATION_TTL = 3600
+
+# USD per million tokens (input, output), matched by model family
+DEFAULT_PRICING = {
+    "opus": (15.0, 75.0),
+    "sonnet": (3.0, 15.0),
+    "haiku": (0.8, 4.0),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_totals (
+    scope TEXT NOT NULL,           -- 'agent', 'project' or 'total'
+    name TEXT NOT NULL,
+    day TEXT NOT NULL,             -- YYYY-MM-DD
+    calls INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, name, day)
+);
+
+CREATE TABLE IF NOT EXISTS reservations (
+    id TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    project TEXT,
+    day TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class BudgetExceeded(Exception):
+    """Raised when an invocation could push a daily total over its budget"""
+
+
+def estimate_tokens(text_or_bytes) -> int:
+    """Rough token count (~4 bytes per token)"""
+    size = text_or_bytes if isinstance(text_or_bytes, int) else len(
+        text_or_bytes.encode() if isinstance(text_or_bytes, str) else text_or_bytes)
+    return (size + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def load_budgets(budgets_path: Path = BUDGETS_PATH) -> Dict:
+    if budgets_path.exists():
+        try:
+            return json.loads(budgets_path.read_text())
+        except (json.JSONDecodeError, IOError):
+            return {}
+    return {}
+
+
+class Accounting:
+    """Daily usage totals and budget checks"""
+
+    def __init__(self, db_path: Path = ACCOUNTING_DB, budgets_path: Path = BUDGETS_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.budgets = load_budgets(Path(budgets_path))
+
+    def price(self, model: Optional[str]) -> Tuple[float, float]:
+        """(input, output) USD per million tokens for a model"""
+        model = model or ""
+        overrides = self.budgets.get("pricing", {})
+        if model in overrides:
+            return tuple(overrides[model])
+        for family, prices in DEFAULT_PRICING.items():
+            if family in model:
+                return prices
+        return DEFAULT_PRICING["sonnet"]
+
+    def cost(self, model: Optional[str], input_tokens: int, output_tokens: int) -> float:
+        input_price, output_price = self.price(model)
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def _scopes(self, agent: str, project: Optional[str]) -> List[Tuple[str, str]]:
+        scopes = [("agent", agent), ("total", "*")]
+        if project:
+            scopes.append(("project", project))
+        return scopes
+
+    def _limits(self, scope: str, name: str) -> Dict:
+        if scope == "total":
+            return self.budgets.get("total", {})
+        configured = self.budgets.get(scope, {})
+        return configured.get(name, configured.get("*", {}))
+
+    def today(self, scope: str, name: str, day: Optional[str] = None) -> Dict:
+        """Totals for one scope on one day (default today)"""
+        row = self.conn.execute("""
+            SELECT calls, input_tokens, output_tokens, cost_usd FROM usage_totals
+            WHERE scope = ? AND name = ? AND day = ?
+        """, (scope, name, day or datetime.now().strftime("%Y-%m-%d"))).fetchone()
+        calls, input_tokens, output_tokens, cost = row or (0, 0, 0, 0.0)
+        return {"calls": calls, "input_tokens": input_tokens,
+                "output_tokens": output_tokens, "cost_usd": cost}
+
+    def _reserved(self, scope: str, name: str, day: str) -> Tuple[int, float]:
+        """(tokens, USD) held by pending reservations for one scope"""
+        where = {"agent": " AND agent = ?", "project": " AND project = ?", "total": ""}[scope]
+        params = (day, name) if where else (day,)
+        tokens, cost = self.conn.execute(
+            f"SELECT COALESCE(SUM(tokens), 0), COALESCE(SUM(cost_usd), 0) FROM reservations WHERE day = ?{where}",
+            params).fetchone()
+        return tokens, cost
+
+    def check(self, agent: str, model: Optional[str], input_tokens: int, max_output_tokens: int,
+              project: Optional[str] = None) -> Dict:
+        """
+        Refuse an invocation that could exceed a daily budget, and reserve
+        its estimate otherwise.
+
+        Pass the returned estimate's 'reservation' to record() when the call
+        completes, or to release() if it fails.
+
+        Raises:
+            BudgetExceeded: naming the first budget that would be exceeded
+
+        Returns:
+            The estimate: {'input_tokens', 'max_output_tokens', 'max_cost_usd', 'reservation'}
+        """
+        estimate = {
+            "input_tokens": input_tokens,
+            "max_output_tokens": max_output_tokens,
+            "max_cost_usd": round(self.cost(model, input_tokens, max_output_tokens), 6),
+            "reservation": None,
+        }
+        scopes = [(scope, name, self._limits(scope, name)) for scope, name in self._scopes(agent, project)]
+        if not any(limits for _, _, limits in scopes):
+            return estimate
+
+        day = datetime.now().strftime("%Y-%m-%d")
+        tokens_needed = input_tokens + max_output_tokens
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM reservations WHERE created_at < ?", (time.time() - RESERVATION_TTL,))
+
+            for scope, name, limits in scopes:
+                if not limits:
+                    continue
+                spent = self.today(scope, name, day)
+                reserved_tokens, reserved_usd = self._reserved(scope, name, day)
+                label = "total" if scope == "total" else f"{scope} '{name}'"
+
+                committed_usd = spent["cost_usd"] + reserved_usd
+                if "daily_usd" in limits and committed_usd + estimate["max_cost_usd"] > limits["daily_usd"]:
+                    raise BudgetExceeded(
+                        f"Budget exceeded for {label}: ${spent['cost_usd']:.4f} spent today + "
+                        f"${reserved_usd:.4f} reserved by calls in flight + up to "
+                        f"${estimate['max_cost_usd']:.4f} for this call > ${limits['daily_usd']:.2f}/day"
+                    )
+
+                tokens = spent["input_tokens"] + spent["output_tokens"]
+                if "daily_tokens" in limits and tokens + reserved_tokens + tokens_needed > limits["daily_tokens"]:
+                    raise BudgetExceeded(
+                        f"Token budget exceeded for {label}: {tokens} used today + {reserved_tokens} "
+                        f"reserved by calls in flight + up to {tokens_needed} for this call "
+                        f"> {limits['daily_tokens']}/day"
+                    )
+
+            estimate["reservation"] = str(uuid.uuid4())
+            self.conn.execute("""
+                INSERT INTO reservations (id, agent, project, day, tokens, cost_usd, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (estimate["reservation"], agent, project, day, tokens_needed,
+                  estimate["max_cost_usd"], time.time()))
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        return estimate
+
+    def release(self, reservation: Optional[str]):
+        """Drop the reservation of a call that failed or was abandoned"""
+        if reservation:
+            with self.conn:
+                self.conn.execute("DELETE FROM reservations WHERE id = ?", (reservation,))
+
+    def record(self, result: Dict, project: Optional[str] = None, reservation: Optional[str] = None) -> float:
+        """Add a completed invocation to the daily totals, settling its reservation; returns its cost"""
+        usage = result.get("usage") or {}
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        cost = self.cost(result.get("model"), input_tokens, output_tokens)
+        day = (result.get("timestamp") or datetime.now().isoformat())[:10]
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO usage_totals (scope, name, day, calls, input_tokens, output_tokens, cost_usd)
+                VALUES (?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT(scope, name, day) DO UPDATE SET
+                    calls = calls + 1,
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    cost_usd = cost_usd + excluded.cost_usd
+            """, [(scope, name, day, input_tokens, output_tokens, cost)
+                  for scope, name in self._scopes(result.get("agent") or "unknown", project)])
+            if reservation:
+                self.conn.execute("DELETE FROM reservations WHERE id = ?", (reservation,))
+        return cost
+
+    def report(self, scope: str = "agent", since_day: Optional[str] = None) -> List[Dict]:
+        """Totals per name (or per day for scope 'total'), highest cost first"""
+        rows = self.conn.execute(f"""
+            SELECT {'day' if scope == 'total' else 'name'} AS grp,
+                   SUM(calls), SUM(input_tokens), SUM(output_tokens), SUM(cost_usd)
+            FROM usage_totals
+            WHERE scope = ? AND day >= ?
+            GROUP BY grp
+            ORDER BY {'grp' if scope == 'total' else 'SUM(cost_usd) DESC'}
+        """, (scope, since_day or "")).fetchall()
+
+        return [{
+            "name": grp,
+            "calls": calls,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": round(cost, 4),
+            "daily_budget_usd": self._limits(scope, grp).get("daily_usd"),
+        } for grp, calls, input_tokens, output_tokens, cost in rows]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Agent Batch - Concurrent specialist invocations over one async client
+
+Runs many {agent, task} requests through a single shared
+anthropic.AsyncAnthropic client:
+
+- a semaphore bounds how many requests are in flight
+- a token bucket bounds how many requests start per second
+- 429 / 5xx / connection errors are retried with full-jitter exponential
+  backoff (honouring Retry-After when the API sends it)
+- results are handed to a callback as each request finishes, so callers
+  can stream them out as JSONL instead of waiting for the whole batch
+
+Fanning out N tasks therefore takes roughly as long as the slowest one
+(subject to the concurrency and rate limits).
+
+The client honours base_url (or ANTHROPIC_BASE_URL), so batches can be
+pointed at a local mock HTTP server for testing.
+"""
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def load_requests(lines: Iterable[str]) -> List[Dict]:
+    """Parse JSONL {agent, task} requests, skipping blank lines"""
+    requests = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        request = json.loads(line)
+        if not request.get("agent") or not request.get("task"):
+            raise ValueError(f"Line {number}: each request needs 'agent' and 'task'")
+        requests.append(request)
+    return requests
+
+
+def _retry_delay(error, attempt: int, base: float, cap: float) -> Optional[float]:
+    """Seconds to wait before retrying, or None if the error is not retryable"""
+    import anthropic
+
+    if isinstance(error, anthropic.APIStatusError):
+        if error.status_code not in RETRYABLE_STATUS:
+            return None
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(cap, float(retry_after))
+            except ValueError:
+                pass
+    elif not isinstance(error, anthropic.APIConnectionError):
+        return None
+
+    # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def _invoke_one(client, semaphore: asyncio.Semaphore, bucket: Optional[TokenBucket],
+                      index: int, request: Dict, agent: Dict, max_tokens: int,
+                      max_retries: int, backoff_base: float, backoff_cap: float,
+                      admit: Optional[Callable[[Dict, Dict], Optional[str]]] = None) -> Dict:
+    result = {
+        "index": index,
+        "id": request.get("id", index),
+        "agent": request["agent"],
+        "task": request["task"],
+    }
+
+    async with semaphore:
+        refusal = admit(request, agent) if admit else None
+        if refusal:
+            result.update({"model": agent["model"], "error": refusal, "attempts": 0,
+                           "timestamp": datetime.now().isoformat()})
+            return result
+
+        start = time.monotonic()
+        for attempt in range(max_retries + 1):
+            if bucket:
+                await bucket.acquire()
+            try:
+                message = await client.messages.create(
+                    model=agent["model"],
+                    max_tokens=max_tokens,
+                    system=agent["instructions"],
+                    messages=[{"role": "user", "content": request["task"]}]
+                )
+            except Exception as e:
+                delay = _retry_delay(e, attempt, backoff_base, backoff_cap)
+                if delay is None or attempt == max_retries:
+                    result.update({
+                        "error": str(e),
+                        "attempts": attempt + 1,
+                        "timestamp": datetime.now().isoformat()
+                    })
+                    return result
+                await asyncio.sleep(delay)
+                continue
+
+            result.update({
+                "response": message.content[0].text if message.content else "",
+                "model": message.model,
+                "usage": {
+                    "input_tokens": message.usage.input_tokens,
+                    "output_tokens": message.usage.output_tokens
+                },
+                "duration_seconds": round(time.monotonic() - start, 3),
+                "attempts": attempt + 1,
+                "timestamp": datetime.now().isoformat()
+            })
+            return result
+
+    return result
+
+
+async def run_batch(requests: List[Dict], load_agent: Callable[[str], Dict],
+                    on_result: Callable[[Dict], None], api_key: str,
+                    concurrency: int = 8, rate: Optional[float] = None,
+                    base_url: Optional[str] = None, max_tokens: int = 4096,
+                    max_retries: int = 5, backoff_base: float = 1.0,
+                    backoff_cap: float = 30.0,
+                    admit: Optional[Callable[[Dict, Dict], Optional[str]]] = None) -> Dict:
+    """
+    Invoke every request concurrently and report each result as it completes.
+
+    Args:
+        requests: Dicts with 'agent', 'task' and optional 'id'
+        load_agent: Agent name -> definition dict (model, instructions)
+        on_result: Called once per finished request, in completion order
+        api_key: Anthropic API key
+        concurrency: Maximum requests in flight
+        rate: Maximum request starts per second (None = unlimited)
+        base_url: Override API endpoint (e.g. a local mock server)
+        admit: Called just before a request is sent; returning a string
+            refuses the request with that error (e.g. a budget check)
+
+    Returns:
+        Summary: {'total', 'succeeded', 'failed', 'duration_seconds'}
+    """
+    import anthropic
+
+    started = time.monotonic()
+
+    # Definitions are loaded once per agent, not once per request
+    agents, failures = {}, {}
+    for name in {r["agent"] for r in requests}:
+        try:
+            agents[name] = load_agent(name)
+        except (FileNotFoundError, ValueError) as e:
+            failures[name] = str(e)
+
+    # SDK retries are disabled so backoff and rate limiting stay in one place
+    client = anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=0)
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate, capacity=concurrency) if rate else None
+
+    summary = {"total": len(requests), "succeeded": 0, "failed": 0}
+    tasks = []
+
+    for index, request in enumerate(requests):
+        if request["agent"] in failures:
+            result = {"index": index, "id": request.get("id", index), "agent": request["agent"],
+                      "task": request["task"], "error": failures[request["agent"]],
+                      "attempts": 0, "timestamp": datetime.now().isoformat()}
+            summary["failed"] += 1
+            on_result(result)
+            continue
+        tasks.append(asyncio.ensure_future(_invoke_one(
+            client, semaphore, bucket, index, request, agents[request["agent"]],
+            max_tokens, max_retries, backoff_base, backoff_cap, admit
+        )))
+
+    try:
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            summary["failed" if "error" in result else "succeeded"] += 1
+            on_result(result)
+    finally:
+        await client.close()
+
+    summary["duration_seconds"] = round(time.monotonic() - started, 3)
+    return summary
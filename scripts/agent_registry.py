@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Agent Registry - Indexed agent definitions
+
+Agent definitions are markdown files with YAML frontmatter:
+
+    ---
+    name: backend-developer
+    description: >
+      Builds APIs and services
+    tools: Read, Write, Edit, Bash
+    model: claude-sonnet-4
+    ---
+    <instructions>
+
+Instead of reading and re-parsing every file on each lookup, the registry
+scans the agents directory once and keeps a compact index in
+~/.claude/data/agent-index.json: name, description, tools, model and the
+byte offset where the instruction body starts.
+
+- The index is reused while the mtimes of the agents directory (and its
+  subdirectories) are unchanged, so listing or resolving agents costs one
+  stat plus an index read.
+- Instruction bodies are loaded lazily through mmap from the recorded
+  offset. If the file changed in place since indexing, it is re-parsed.
+"""
+
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CLAUDE_HOME = Path.home() / ".claude"
+AGENTS_DIR = CLAUDE_HOME / "agents"
+INDEX_PATH = CLAUDE_HOME / "data" / "agent-index.json"
+
+# Bump when the index layout or parser changes so old indexes are rebuilt
+INDEX_VERSION = 1
+
+KEY_LINE = re.compile(r"^([A-Za-z_][\w-]*)\s*:(?:\s+(.*))?$")
+BLOCK_INDICATOR = re.compile(r"^([|>])([+-]?)\d*$")
+
+
+# ============================================================================
+# FRONTMATTER PARSING
+# ============================================================================
+
+def split_frontmatter(data: bytes) -> Tuple[Optional[str], int]:
+    """
+    Split a definition into its frontmatter text and body offset.
+
+    Returns:
+        (frontmatter text or None if absent, byte offset of the body)
+    """
+    if not data.startswith(b"---"):
+        return None, 0
+
+    first_line_end = data.find(b"\n")
+    if first_line_end == -1 or data[:first_line_end].strip() != b"---":
+        return None, 0
+
+    position = first_line_end + 1
+    while position <= len(data):
+        line_end = data.find(b"\n", position)
+        if line_end == -1:
+            line_end = len(data)
+        if data[position:line_end].strip() == b"---":
+            return data[first_line_end + 1:position].decode("utf-8", errors="replace"), min(line_end + 1, len(data))
+        position = line_end + 1
+
+    return None, 0
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        inner = value[1:-1]
+        if value[0] == '"':
+            return inner.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\")
+        return inner.replace("''", "'")
+    return value
+
+
+def _strip_comment(value: str) -> str:
+    if value[:1] in "\"'":
+        return value
+    return re.sub(r"\s+#.*$", "", value)
+
+
+def _scalar(value: str):
+    value = _strip_comment(value.strip())
+    if value.startswith("[") and value.endswith("]"):
+        return [_unquote(item.strip()) for item in value[1:-1].split(",") if item.strip()]
+    return _unquote(value)
+
+
+def _block_scalar(lines: List[str], style: str, chomp: str) -> str:
+    """Assemble a | (literal) or > (folded) block scalar from its indented lines"""
+    indents = [len(line) - len(line.lstrip()) for line in lines if line.strip()]
+    indent = min(indents) if indents else 0
+    body = [line[indent:] if line.strip() else "" for line in lines]
+
+    if style == "|":
+        text = "\n".join(body)
+    else:
+        # Folded: single newlines become spaces, blank lines become newlines
+        paragraphs, current = [], []
+        for line in body:
+            if line:
+                current.append(line)
+            else:
+                paragraphs.append(" ".join(current))
+                current = []
+        paragraphs.append(" ".join(current))
+        text = "\n".join(paragraphs)
+
+    text = text.rstrip("\n")
+    if chomp == "-" or not text:
+        return text
+    return text + "\n"
+
+
+def parse_frontmatter(text: str) -> Dict:
+    """
+    Parse agent frontmatter.
+
+    Supports the YAML subset agent definitions use: plain and quoted
+    scalars, inline [a, b] lists, "- item" lists, indented continuation
+    lines, and | / > block scalars.
+    """
+    metadata: Dict = {}
+    lines = text.splitlines()
+    i = 0
+
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip() or line.lstrip().startswith("#") or line[:1].isspace():
+            i += 1
+            continue
+
+        match = KEY_LINE.match(line.rstrip())
+        if not match:
+            i += 1
+            continue
+
+        key, value = match.group(1), (match.group(2) or "").strip()
+
+        # Collect the indented (or list) lines belonging to this key
+        j = i + 1
+        nested = []
+        while j < len(lines) and (not lines[j].strip() or lines[j][:1].isspace()
+                                  or (not value and lines[j].startswith("- "))):
+            nested.append(lines[j])
+            j += 1
+        while nested and not nested[-1].strip():
+            nested.pop()
+
+        block = BLOCK_INDICATOR.match(value)
+        if block:
+            metadata[key] = _block_scalar(nested, block.group(1), block.group(2))
+        elif not value and any(l.strip().startswith("- ") or l.strip() == "-" for l in nested):
+            metadata[key] = [_scalar(l.strip()[1:]) for l in nested if l.strip().startswith("-")]
+        elif nested:
+            # Plain multi-line scalar: continuation lines fold into one value
+            parts = [value] + [l.strip() for l in nested if l.strip()]
+            metadata[key] = _scalar(" ".join(p for p in parts if p))
+        else:
+            metadata[key] = _scalar(value)
+
+        i = j
+
+    return metadata
+
+
+def parse_agent_file(path: Path) -> Dict:
+    """Parse one definition file into an index entry (without the body)"""
+    data = path.read_bytes()
+    st = path.stat()
+    entry = {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    frontmatter, body_offset = split_frontmatter(data)
+    if frontmatter is None:
+        entry["error"] = f"Agent file {path.name} missing YAML frontmatter"
+        return entry
+
+    metadata = parse_frontmatter(frontmatter)
+    tools = metadata.get("tools", [])
+    if isinstance(tools, str):
+        tools = [t.strip() for t in tools.split(",") if t.strip()]
+
+    entry.update({
+        "name": str(metadata.get("name") or path.stem),
+        "description": str(metadata.get("description", "")).strip(),
+        "tools": tools,
+        "model": metadata.get("model"),
+        "body_offset": body_offset,
+        "metadata": metadata,
+    })
+    return entry
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class AgentRegistry:
+    """Indexed view of an agents directory"""
+
+    def __init__(self, agents_dir: Path = AGENTS_DIR, index_path: Optional[Path] = INDEX_PATH):
+        self.agents_dir = Path(agents_dir)
+        self.index_path = Path(index_path) if index_path else None
+        self._index: Optional[Dict] = None
+
+    def _signature(self, directories: List[str]) -> Optional[List]:
+        signature = []
+        for rel in directories:
+            try:
+                signature.append([rel, (self.agents_dir / rel).stat().st_mtime_ns])
+            except FileNotFoundError:
+                return None
+        return signature
+
+    def _scan(self) -> Dict:
+        """Parse every definition and build a fresh index"""
+        agents = {}
+        directories = ["."]
+
+        if self.agents_dir.is_dir():
+            for root, dirs, files in os.walk(self.agents_dir):
+                dirs.sort()
+                rel_root = os.path.relpath(root, self.agents_dir)
+                if rel_root != ".":
+                    directories.append(rel_root)
+                for filename in sorted(files):
+                    if not filename.endswith(".md") or filename == "README.md":
+                        continue
+                    stem = filename[:-3]
+                    # First definition wins when names repeat across subdirectories
+                    if stem not in agents:
+                        agents[stem] = parse_agent_file(Path(root) / filename)
+
+        return {
+            "version": INDEX_VERSION,
+            "agents_dir": str(self.agents_dir),
+            "signature": self._signature(directories) or [],
+            "agents": agents,
+        }
+
+    def _save(self, index: Dict):
+        if not self.index_path:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(index))
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # Read-only home: the registry still works, just without persistence
+            pass
+
+    def _is_current(self, index: Optional[Dict]) -> bool:
+        return bool(
+            index
+            and index.get("version") == INDEX_VERSION
+            and index.get("agents_dir") == str(self.agents_dir)
+            and index.get("signature")
+            and self._signature([rel for rel, _ in index["signature"]]) == index["signature"]
+        )
+
+    def index(self) -> Dict:
+        """Return the current index, rebuilding it if the directory changed"""
+        if self._is_current(self._index):
+            return self._index
+
+        index = None
+        if self.index_path and self.index_path.exists():
+            try:
+                index = json.loads(self.index_path.read_text())
+            except (json.JSONDecodeError, IOError):
+                index = None
+
+        if not self._is_current(index):
+            index = self._scan()
+            self._save(index)
+
+        self._index = index
+        return index
+
+    def refresh(self) -> Dict:
+        """Force a full rescan"""
+        self._index = self._scan()
+        self._save(self._index)
+        return self._index
+
+    def agents(self) -> Dict[str, Dict]:
+        """All index entries keyed by file name (without .md)"""
+        return self.index()["agents"]
+
+    def get(self, agent_name: str) -> Optional[Dict]:
+        """Index entry for one agent, or None"""
+        return self.agents().get(agent_name)
+
+    def read_body(self, agent_name: str) -> str:
+        """Load an agent's instruction body via mmap from its indexed offset"""
+        entry = self.get(agent_name)
+        if entry is None:
+            raise FileNotFoundError(f"Agent not found: {agent_name}")
+        if "error" in entry:
+            raise ValueError(entry["error"])
+
+        path = Path(entry["path"])
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size != entry["size"] or st.st_mtime_ns != entry["mtime_ns"]:
+                # Edited in place (directory mtime unchanged): re-parse this file
+                entry = parse_agent_file(path)
+                self.index()["agents"][agent_name] = entry
+                self._save(self._index)
+                if "error" in entry:
+                    raise ValueError(entry["error"])
+                st = os.fstat(f.fileno())
+
+            if st.st_size <= entry["body_offset"]:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[entry["body_offset"]:].decode("utf-8", errors="replace").strip()
+
+    def load(self, agent_name: str) -> Dict:
+        """Full definition: index metadata plus instruction body"""
+        instructions = self.read_body(agent_name)
+        entry = self.get(agent_name)
+        return {
+            "name": entry["name"],
+            "description": entry["description"],
+            "tools": entry["tools"],
+            "model": entry["model"],
+            "instructions": instructions,
+        }
+
+
+_default_registry: Optional[AgentRegistry] = None
+
+
+def get_registry() -> AgentRegistry:
+    """Shared registry for ~/.claude/agents"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = AgentRegistry()
+    return _default_registry
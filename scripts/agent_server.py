@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Agent Server - Warm invocation process behind a Unix socket
+
+Every CLI run of invoke-specialist-agent.py otherwise starts a fresh
+interpreter, imports the anthropic SDK, builds a client and negotiates TLS
+before the first byte is sent. `invoke-specialist-agent.py serve` keeps one
+process alive with a pooled client (plus the agent registry, caches and
+database connections), and the CLI forwards `invoke` requests to it.
+
+Protocol (newline-delimited JSON, one request per connection):
+
+    client -> {"op": "invoke", "args": {...}}      | {"op": "ping"} | {"op": "shutdown"}
+    server -> {"event": "output", "text": "..."}   (zero or more, as printed)
+              {"event": "done", "exit_code": 0, ...}
+
+Everything the handler prints is forwarded as it is written, so streamed
+tokens reach the client immediately. Requests run on their own threads.
+
+The socket lives at ~/.claude/run/agent-server.sock with 0600 permissions.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+CLAUDE_HOME = Path.home() / ".claude"
+SOCKET_PATH = CLAUDE_HOME / "run" / "agent-server.sock"
+
+CONNECT_TIMEOUT = 0.5
+
+
+class _ThreadOutput:
+    """sys.stdout replacement that routes each thread's prints to its own sink"""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self._local = threading.local()
+
+    def set_sink(self, sink: Optional[Callable[[str], None]]):
+        self._local.sink = sink
+
+    def write(self, text: str) -> int:
+        sink = getattr(self._local, "sink", None)
+        if sink:
+            sink(text)
+        else:
+            self.fallback.write(text)
+        return len(text)
+
+    def flush(self):
+        if not getattr(self._local, "sink", None):
+            self.fallback.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def serve(handler: Callable[[Dict], int], socket_path: Path = SOCKET_PATH):
+    """
+    Serve invoke requests until a shutdown request arrives.
+
+    Args:
+        handler: Called with the request's args dict on a worker thread;
+            returns the exit code. Its printed output goes to the client.
+        socket_path: Unix socket to listen on
+    """
+    # Only the server needs socketserver; clients import this module too
+    import socketserver
+
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if socket_path.exists():
+        if ping(socket_path):
+            raise RuntimeError(f"Agent server already running at {socket_path}")
+        socket_path.unlink()  # stale socket from a crashed server
+
+    output = _ThreadOutput(sys.stdout)
+    stats = {"started": time.time(), "requests": 0, "active": 0}
+    stats_lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def send(self, message: Dict):
+            self.wfile.write((json.dumps(message) + "\n").encode())
+            self.wfile.flush()
+
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                self.send({"event": "done", "exit_code": 2, "error": "invalid request"})
+                return
+
+            op = request.get("op")
+            if op == "ping":
+                with stats_lock:
+                    self.send({"event": "done", "exit_code": 0, "pid": os.getpid(),
+                               "uptime_seconds": round(time.time() - stats["started"], 1),
+                               "requests": stats["requests"], "active": stats["active"]})
+            elif op == "shutdown":
+                self.send({"event": "done", "exit_code": 0})
+                threading.Thread(target=server.shutdown, daemon=True).start()
+            elif op == "invoke":
+                with stats_lock:
+                    stats["requests"] += 1
+                    stats["active"] += 1
+                output.set_sink(lambda text: self.send({"event": "output", "text": text}))
+                try:
+                    exit_code = handler(request.get("args", {}))
+                except BrokenPipeError:
+                    return  # client went away
+                except Exception as e:
+                    print(f"❌ Server error: {e}")
+                    exit_code = 1
+                finally:
+                    output.set_sink(None)
+                    with stats_lock:
+                        stats["active"] -= 1
+                self.send({"event": "done", "exit_code": exit_code})
+            else:
+                self.send({"event": "done", "exit_code": 2, "error": f"unknown op: {op}"})
+
+    server = _Server(str(socket_path), Handler)
+    os.chmod(socket_path, 0o600)
+    sys.stdout = output
+
+    print(f"🟢 Agent server listening on {socket_path} (pid {os.getpid()})", file=sys.__stdout__)
+    try:
+        server.serve_forever()
+    finally:
+        sys.stdout = output.fallback
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+        print("🔴 Agent server stopped", file=sys.__stdout__)
+
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    if not Path(socket_path).exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def request(payload: Dict, socket_path: Path = SOCKET_PATH,
+            on_output: Callable[[str], None] = None) -> Optional[Dict]:
+    """
+    Send one request to the server, forwarding its output as it arrives.
+
+    Returns:
+        The final 'done' message, or None if no server is listening
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rb") as reader:
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        for line in reader:
+            message = json.loads(line)
+            if message.get("event") == "output":
+                if on_output:
+                    on_output(message["text"])
+            elif message.get("event") == "done":
+                return message
+    return {"event": "done", "exit_code": 1, "error": "server closed the connection"}
+
+
+def ping(socket_path: Path = SOCKET_PATH) -> Optional[Dict]:
+    """Server status, or None if not running"""
+    return request({"op": "ping"}, socket_path)
+
+
+def stop(socket_path: Path = SOCKET_PATH) -> bool:
+    """Ask a running server to shut down; returns False if none was running"""
+    return request({"op": "shutdown"}, socket_path) is not None
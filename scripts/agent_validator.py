@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Agent Validator - Lint agent definitions in one process
+
+Replaces the grep/awk pipeline in validate-agents.sh (several processes per
+file and field) with a single pass that uses the same frontmatter parser as
+the agent registry and invoke-specialist-agent.py, so anything that passes
+here loads the same way at invocation time.
+
+Checks:
+    errors    missing frontmatter, missing name/description, unknown model
+              IDs, duplicate agent names
+    warnings  missing tools (inherits all), unknown tool names, name not
+              matching the file name
+    references  every agent named in workflow-coordinator.py (PHASES,
+              _get_type_specific_agents and the Phase 4 support list) must
+              have a definition; missing ones are warnings, or errors
+              with --strict
+
+Files are parsed on a process pool once there are enough of them to
+amortise the worker start-up.
+
+Usage:
+    python3 agent_validator.py [agents-dir] [--json] [--strict] [--workers N]
+"""
+
+import ast
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from agent_registry import AGENTS_DIR, parse_agent_file
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+COORDINATOR_PATH = SCRIPTS_DIR / "workflow-coordinator.py"
+BUDGETS_PATH = Path.home() / ".claude" / "config" / "budgets.json"
+
+# Same list as validate-agents.sh, plus current Claude Code tools
+VALID_TOOLS = {
+    "Task", "TodoWrite", "Bash", "Read", "Write", "Edit", "MultiEdit", "Grep", "Glob",
+    "WebSearch", "WebFetch", "NotebookEdit", "NotebookRead", "LS", "BashOutput",
+    "KillShell", "ExitPlanMode", "SlashCommand",
+}
+MCP_TOOL = re.compile(r"^mcp__[\w-]+(__[\w-]+)?$")
+
+MODEL_ALIASES = {"inherit", "opus", "sonnet", "haiku"}
+MODEL_ID = re.compile(r"^claude-[a-z0-9.-]*(opus|sonnet|haiku)[a-z0-9.-]*$")
+
+# Parse in-process below this many files (pool start-up costs more)
+PARALLEL_THRESHOLD = 64
+
+
+# ============================================================================
+# CROSS-REFERENCES
+# ============================================================================
+
+def _string_lists(node: ast.AST) -> List[str]:
+    """Every string inside list literals under a node"""
+    found = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.List):
+            found.extend(e.value for e in child.elts
+                         if isinstance(e, ast.Constant) and isinstance(e.value, str))
+    return found
+
+
+def coordinator_references(coordinator_path: Path = COORDINATOR_PATH) -> Dict[str, List[str]]:
+    """
+    Agent names referenced by workflow-coordinator.py, read statically.
+
+    Returns:
+        {agent name: [where it is referenced]}
+    """
+    tree = ast.parse(coordinator_path.read_text(), str(coordinator_path))
+    references: Dict[str, List[str]] = {}
+
+    def add(agent: str, where: str):
+        references.setdefault(agent, []).append(where)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "PHASES"
+                                                for t in node.targets):
+            for number, phase in ast.literal_eval(node.value).items():
+                for role in ("primary_agents", "support_agents"):
+                    if isinstance(phase[role], list):
+                        for agent in phase[role]:
+                            add(agent, f"PHASES[{number}].{role}")
+
+        if isinstance(node, ast.ClassDef):
+            for method in node.body:
+                if not isinstance(method, ast.FunctionDef):
+                    continue
+                if method.name == "_get_type_specific_agents":
+                    for statement in ast.walk(method):
+                        if isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Dict):
+                            for project_type, agents in ast.literal_eval(statement.value).items():
+                                for agent in agents:
+                                    add(agent, f"_get_type_specific_agents[{project_type}]")
+                elif method.name == "get_recommended_agents_for_phase":
+                    for agent in _string_lists(method):
+                        add(agent, "get_recommended_agents_for_phase")
+
+    return references
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def find_agent_files(agents_dir: Path) -> List[Path]:
+    """Every agent definition (README.md excluded), in a stable order"""
+    files = []
+    for root, dirs, names in os.walk(agents_dir):
+        dirs.sort()
+        files.extend(Path(root) / n for n in sorted(names) if n.endswith(".md") and n != "README.md")
+    return files
+
+
+def _known_models() -> set:
+    """Model IDs priced in budgets.json are accepted as-is"""
+    try:
+        return set(json.loads(BUDGETS_PATH.read_text()).get("pricing", {}))
+    except (IOError, ValueError):
+        return set()
+
+
+def validate_entry(entry: Dict, known_models: set = frozenset()) -> Dict:
+    """Errors and warnings for one parsed definition"""
+    path = Path(entry["path"])
+    result = {"file": str(path), "name": entry.get("name", path.stem), "errors": [], "warnings": []}
+
+    if "error" in entry:
+        result["errors"].append("Missing YAML frontmatter")
+        return result
+
+    metadata = entry["metadata"]
+    for field in ("name", "description"):
+        if not str(metadata.get(field) or "").strip():
+            result["errors"].append(f"Missing required field: {field}")
+    if metadata.get("name") and metadata["name"] != path.stem:
+        result["warnings"].append(f"Name '{metadata['name']}' does not match file name '{path.stem}'")
+
+    if "tools" not in metadata:
+        result["warnings"].append("Missing optional field: tools (will inherit all)")
+    for tool in entry["tools"]:
+        if tool not in VALID_TOOLS and not MCP_TOOL.match(str(tool)):
+            result["warnings"].append(f"Unknown tool: {tool}")
+
+    model = entry.get("model")
+    if model is not None:
+        model = str(model)
+        if model not in MODEL_ALIASES and model not in known_models and not MODEL_ID.match(model):
+            result["errors"].append(f"Unknown model: {model}")
+
+    return result
+
+
+def parse_all(files: List[Path], workers: Optional[int] = None) -> List[Dict]:
+    """Parse definitions, on a process pool for large directories"""
+    workers = workers or os.cpu_count() or 1
+    if len(files) < PARALLEL_THRESHOLD or workers == 1:
+        return [parse_agent_file(f) for f in files]
+
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_agent_file, files, chunksize=chunksize))
+
+
+def validate_agents(agents_dir: Path = AGENTS_DIR, strict: bool = False,
+                    workers: Optional[int] = None,
+                    coordinator_path: Path = COORDINATOR_PATH) -> Dict:
+    """
+    Validate every definition in an agents directory.
+
+    Returns:
+        JSON-ready report: totals, per-agent results (only those with
+        findings) and missing cross-references
+    """
+    started = time.time()
+    files = find_agent_files(Path(agents_dir))
+    known_models = _known_models()
+    results = [validate_entry(entry, known_models) for entry in parse_all(files, workers)]
+
+    # Duplicate names shadow each other in the registry (first one wins)
+    by_name: Dict[str, List[Dict]] = {}
+    for result in results:
+        by_name.setdefault(result["name"], []).append(result)
+    for name, duplicates in by_name.items():
+        if len(duplicates) > 1:
+            for result in duplicates[1:]:
+                result["errors"].append(f"Duplicate agent name '{name}' (also {duplicates[0]['file']})")
+
+    defined = {Path(r["file"]).stem for r in results} | set(by_name)
+    missing = {}
+    if coordinator_path.exists():
+        missing = {agent: where for agent, where in coordinator_references(coordinator_path).items()
+                   if agent not in defined}
+
+    reference_level = "errors" if strict else "warnings"
+    failed = sum(1 for r in results if r["errors"])
+
+    return {
+        "agents_dir": str(agents_dir),
+        "total": len(results),
+        "passed": len(results) - failed,
+        "errors": sum(len(r["errors"]) for r in results) + (len(missing) if strict else 0),
+        "warnings": sum(len(r["warnings"]) for r in results) + (0 if strict else len(missing)),
+        "seconds": round(time.time() - started, 3),
+        "agents": [r for r in results if r["errors"] or r["warnings"]],
+        "missing_references": {"level": reference_level, "agents": missing},
+    }
+
+
+def main():
+    """CLI entry point."""
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    strict = "--strict" in args
+    workers = None
+    if "--workers" in args:
+        index = args.index("--workers")
+        workers = int(args[index + 1])
+        del args[index:index + 2]
+    positional = [a for a in args if not a.startswith("--")]
+
+    agents_dir = Path(positional[0]) if positional else Path(os.environ.get("CLAUDE_AGENTS_DIR", AGENTS_DIR))
+    if not agents_dir.is_dir():
+        print(f"❌ Agents directory not found: {agents_dir}")
+        sys.exit(1)
+
+    report = validate_agents(agents_dir, strict=strict, workers=workers)
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"🔍 Validating agents in {agents_dir}\n")
+        for result in report["agents"]:
+            print(f"Checking: {Path(result['file']).name}")
+            for error in result["errors"]:
+                print(f"  ❌ ERROR: {error}")
+            for warning in result["warnings"]:
+                print(f"  ⚠️  WARNING: {warning}")
+
+        missing = report["missing_references"]["agents"]
+        if missing:
+            icon = "❌" if strict else "⚠️ "
+            print(f"\n{icon} Agents referenced by workflow-coordinator.py without a definition:")
+            for agent, where in sorted(missing.items()):
+                print(f"  - {agent} ({', '.join(where)})")
+
+        print("\n📊 Validation Summary")
+        print(f"  Total agents: {report['total']}")
+        print(f"  ✅ Passed: {report['passed']}")
+        print(f"  ❌ Errors: {report['errors']}")
+        print(f"  ⚠️  Warnings: {report['warnings']}")
+        print(f"  ⏱️  {report['seconds']}s")
+
+        if report["errors"]:
+            print("\n❌ VALIDATION FAILED - Fix errors before deployment")
+        else:
+            print("\n✅ ALL AGENTS VALID")
+
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
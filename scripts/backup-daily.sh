@@ -1,6 +1,10 @@
 #!/bin/bash
 # Claude Daily Backup Script with Rotation
 # Maintains 7 daily, 4 weekly, and 3 monthly backups
+#
+# `backup` takes an incremental, deduplicated snapshot with backup_engine.py
+# (only changed files are read, only new chunks are stored). `full` keeps the
+# original full tar.gz archives.
 
 set -e
 
@@ -11,6 +15,7 @@ DAILY_DIR="$BACKUP_ROOT/daily"
 WEEKLY_DIR="$BACKUP_ROOT/weekly"
 MONTHLY_DIR="$BACKUP_ROOT/monthly"
 LOG_FILE="$BACKUP_ROOT/backup.log"
+ENGINE="$(dirname "$0")/backup_engine.py"
 
 # Retention policy
 DAILY_RETENTION=7
@@ -201,20 +206,31 @@ restore_backup() {
 # Parse command line arguments
 case "${1:-backup}" in
     backup)
+        python3 "$ENGINE" backup
+        ;;
+    full)
         main
         ;;
     restore)
         if [ -z "$2" ]; then
-            echo "Usage: $0 restore <backup-file> [restore-directory]"
+            echo "Usage: $0 restore <backup-file|snapshot-id|latest> [restore-directory] [path]"
             exit 1
         fi
-        restore_backup "$2" "$3"
+        if [ -f "$2" ]; then
+            restore_backup "$2" "$3"
+        else
+            python3 "$ENGINE" restore "$2" --dest "${3:-$HOME/.claude-restored/.claude}" ${4:+--path "$4"}
+        fi
         ;;
     report)
         generate_report
         cat "$BACKUP_ROOT/backup-report.txt"
         ;;
     list)
+        echo "=== Incremental Snapshots ==="
+        echo
+        python3 "$ENGINE" list
+        echo
         echo "=== Available Backups ==="
         echo
         echo "Daily:"
@@ -227,9 +243,10 @@ case "${1:-backup}" in
         ls -1t "$MONTHLY_DIR"/*.tar.gz 2>/dev/null | head -$MONTHLY_RETENTION || echo "  None"
         ;;
     *)
-        echo "Usage: $0 [backup|restore|report|list]"
-        echo "  backup  - Create a new backup (default)"
-        echo "  restore - Restore from a backup file"
+        echo "Usage: $0 [backup|full|restore|report|list]"
+        echo "  backup  - Create an incremental snapshot (default)"
+        echo "  full    - Create a full tar.gz backup"
+        echo "  restore - Restore from a backup file or snapshot (optionally one path)"
         echo "  report  - Generate and display backup report"
         echo "  list    - List available backups"
         exit 1
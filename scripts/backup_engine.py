@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Backup Engine - Incremental, deduplicating snapshots of ~/.claude
+
+Replaces the nightly full `tar -czf` with a content-addressed repository:
+
+    ~/.claude/backups/repo/chunks/ab/<sha256>
+        file content split into fixed-size chunks, stored once each
+        (zlib-compressed unless compression does not help)
+    ~/.claude/backups/repo/snapshots/<tier>/<snapshot-id>.json
+        manifest: every backed-up path with its size, mtime, mode and
+        chunk hashes
+
+A nightly run only reads files whose size or mtime changed since the
+previous snapshot and only writes chunks the repository has not seen, so
+its cost is proportional to what changed. Chunks are hashed and compressed
+on a thread pool (hashlib and zlib release the GIL).
+
+SQLite databases are not copied as live files: each one is snapshotted with
+the online backup API into a temporary file first (db_snapshot.py: paged,
+throttled and checked with PRAGMA quick_check), so a coordinator writing
+mid-backup cannot produce a torn copy.
+
+Retention is the same 7 daily / 4 weekly / 3 monthly policy as
+backup-daily.sh. Promoting a daily snapshot to weekly or monthly copies
+only its manifest; chunks no manifest references are deleted by prune.
+
+Usage:
+    python3 backup_engine.py backup [--workers N] [--throttle MB/s]
+    python3 backup_engine.py list
+    python3 backup_engine.py restore <snapshot-id|latest> [--path <relpath>] [--dest <dir>]
+    python3 backup_engine.py prune
+"""
+
+import fcntl
+import fnmatch
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from db_snapshot import SnapshotError, load_config, make_throttle, snapshot_database
+
+CLAUDE_HOME = Path.home() / ".claude"
+BACKUP_ROOT = CLAUDE_HOME / "backups"
+REPO_PATH = BACKUP_ROOT / "repo"
+LOG_FILE = BACKUP_ROOT / "backup.log"
+
+CHUNK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6
+
+# Retention policy (matches backup-daily.sh)
+RETENTION = {
+    "daily": 7,
+    "weekly": 4,
+    "monthly": 3,
+}
+
+# Same exclusions as backup-daily.sh
+EXCLUDE = ["*.pyc", "__pycache__", ".git", ".DS_Store", "*.log", "*.tmp", "*.swp", "backups"]
+
+# SQLite sidecar files are captured through the backup API instead
+SQLITE_SIDECARS = ("-wal", "-shm", "-journal")
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Chunk encodings (first byte of each stored chunk)
+RAW = b"R"
+ZLIB = b"Z"
+
+
+def log(message: str):
+    """Print and append to the backup log (same format as backup-daily.sh)"""
+    line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}"
+    print(line)
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_FILE, "a") as f:
+        f.write(line + "\n")
+
+
+def _excluded(name: str) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDE)
+
+
+def _is_sqlite(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+class BackupRepository:
+    """Content-addressed chunk store plus per-tier snapshot manifests"""
+
+    def __init__(self, repo_path: Path = REPO_PATH, source: Path = CLAUDE_HOME,
+                 throttle_mb_per_sec: Optional[float] = None):
+        self.repo_path = Path(repo_path)
+        self.source = Path(source)
+        self.snapshot_config = load_config()
+        self.throttle = make_throttle(throttle_mb_per_sec or self.snapshot_config["throttle_mb_per_sec"])
+        self.chunks_dir = self.repo_path / "chunks"
+        self.snapshots_dir = self.repo_path / "snapshots"
+        self.tmp_dir = self.repo_path / "tmp"
+        for directory in (self.chunks_dir, self.snapshots_dir, self.tmp_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def lock(self):
+        """Exclusive repository lock (backup and prune never overlap)"""
+        with open(self.repo_path / "lock", "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Chunks
+    # ------------------------------------------------------------------
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def put_chunk(self, data: bytes) -> Tuple[str, int]:
+        """
+        Store a chunk if new.
+
+        Returns:
+            (sha256 hex digest, bytes written; 0 if already stored)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if path.exists():
+            return digest, 0
+
+        compressed = zlib.compress(data, COMPRESS_LEVEL)
+        payload = ZLIB + compressed if len(compressed) < len(data) else RAW + data
+
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f".{digest}.{os.getpid()}.{id(data)}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return digest, len(payload)
+
+    def get_chunk(self, digest: str) -> bytes:
+        """Read, decompress and verify a chunk"""
+        payload = self._chunk_path(digest).read_bytes()
+        data = zlib.decompress(payload[1:]) if payload[:1] == ZLIB else payload[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    # ------------------------------------------------------------------
+    # Manifests
+    # ------------------------------------------------------------------
+
+    def _manifest_paths(self, tier: Optional[str] = None) -> List[Path]:
+        tiers = [tier] if tier else list(RETENTION)
+        paths = []
+        for name in tiers:
+            paths.extend((self.snapshots_dir / name).glob("*.json"))
+        return sorted(paths, key=lambda p: p.stem.split("-", 1)[1])
+
+    def list_snapshots(self, tier: Optional[str] = None) -> List[Dict]:
+        """Snapshot summaries, oldest first"""
+        snapshots = []
+        for path in self._manifest_paths(tier):
+            manifest = json.loads(path.read_text())
+            snapshots.append({"id": manifest["id"], "tier": manifest["tier"],
+                              "created": manifest["created"], **manifest["stats"]})
+        return snapshots
+
+    def load_manifest(self, snapshot_id: str) -> Dict:
+        """Manifest by id, or 'latest'"""
+        paths = self._manifest_paths()
+        if snapshot_id == "latest":
+            if not paths:
+                raise FileNotFoundError("No snapshots in repository")
+            return json.loads(paths[-1].read_text())
+        for path in paths:
+            if path.stem == snapshot_id:
+                return json.loads(path.read_text())
+        raise FileNotFoundError(f"Snapshot not found: {snapshot_id}")
+
+    def _write_manifest(self, manifest: Dict):
+        """Publish a manifest atomically; never replaces an existing snapshot"""
+        path = self.snapshots_dir / manifest["tier"] / f"{manifest['id']}.json"
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(manifest, separators=(",", ":")))
+        try:
+            # link() fails if the name is taken, where replace() would
+            # silently drop the earlier snapshot and let prune free its chunks
+            os.link(tmp_path, path)
+        except FileExistsError:
+            raise FileExistsError(f"Snapshot already exists: {manifest['id']}") from None
+        finally:
+            tmp_path.unlink()
+
+    def promote(self, manifest: Dict, tier: str) -> Dict:
+        """Copy a snapshot's manifest into another tier (chunks are shared)"""
+        promoted = dict(manifest, tier=tier, id=manifest["id"].replace(manifest["tier"], tier, 1))
+        self._write_manifest(promoted)
+        return promoted
+
+    # ------------------------------------------------------------------
+    # Backup
+    # ------------------------------------------------------------------
+
+    def _walk(self) -> Iterator[Path]:
+        for root, dirs, files in os.walk(self.source):
+            dirs[:] = sorted(d for d in dirs if not _excluded(d))
+            for name in sorted(files):
+                if _excluded(name) or name.endswith(SQLITE_SIDECARS):
+                    continue
+                yield Path(root) / name
+
+    def _sqlite_snapshot(self, path: Path) -> Path:
+        """Consistent, verified copy of a live SQLite database"""
+        tmp_path = self.tmp_dir / f"{hashlib.sha1(str(path).encode()).hexdigest()}.db"
+        snapshot_database(path, tmp_path, pages=self.snapshot_config["pages"], throttle=self.throttle)
+        return tmp_path
+
+    def _store_file(self, path: Path, previous: Optional[Dict]) -> Tuple[Dict, Dict]:
+        """Back up one file; returns (manifest entry, stats)"""
+        st = path.lstat()
+        entry = {"size": st.st_size, "mtime": st.st_mtime, "mode": st.st_mode & 0o7777}
+        stats = {"reused": 0, "new_chunks": 0, "stored_bytes": 0, "read_bytes": 0}
+
+        if os.path.islink(path):
+            entry["link"] = os.readlink(path)
+            return entry, stats
+
+        # Change detection key; a database is unchanged only if its WAL is too
+        entry["stat"] = [st.st_size, st.st_mtime]
+        sqlite = _is_sqlite(path)
+        if sqlite:
+            entry["sqlite"] = True
+            wal = Path(f"{path}-wal")
+            if wal.exists():
+                wal_st = wal.stat()
+                entry["stat"] += [wal_st.st_size, wal_st.st_mtime]
+
+        if previous and previous.get("stat") == entry["stat"]:
+            entry["chunks"] = previous["chunks"]
+            entry["size"] = previous["size"]
+            stats["reused"] = 1
+            return entry, stats
+
+        read_path = self._sqlite_snapshot(path) if sqlite else path
+        chunks = []
+        try:
+            with open(read_path, "rb") as f:
+                while True:
+                    data = f.read(CHUNK_SIZE)
+                    if not data:
+                        break
+                    digest, written = self.put_chunk(data)
+                    chunks.append(digest)
+                    stats["read_bytes"] += len(data)
+                    if written:
+                        stats["new_chunks"] += 1
+                        stats["stored_bytes"] += written
+            if sqlite:
+                entry["size"] = read_path.stat().st_size
+        finally:
+            if sqlite and read_path.exists():
+                read_path.unlink()
+
+        entry["chunks"] = chunks
+        return entry, stats
+
+    def backup(self, tier: str = "daily", workers: Optional[int] = None,
+               now: Optional[datetime] = None) -> Dict:
+        """
+        Take a snapshot of the source tree.
+
+        Files unchanged since the latest snapshot (same size and mtime) reuse
+        its chunk list without being read.
+
+        Returns:
+            The new manifest
+        """
+        now = now or datetime.now()
+        started = time.time()
+
+        with self.lock():
+            try:
+                previous_files = self.load_manifest("latest")["files"]
+            except FileNotFoundError:
+                previous_files = {}
+
+            paths = list(self._walk())
+            relpaths = [str(p.relative_to(self.source)) for p in paths]
+
+            files = {}
+            totals = {"files": 0, "reused": 0, "new_chunks": 0, "stored_bytes": 0,
+                      "read_bytes": 0, "total_bytes": 0, "errors": 0}
+
+            def work(item):
+                path, relpath = item
+                try:
+                    return relpath, self._store_file(path, previous_files.get(relpath)), None
+                except (OSError, sqlite3.Error, SnapshotError) as e:
+                    return relpath, None, str(e)
+
+            with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as pool:
+                for relpath, result, error in pool.map(work, zip(paths, relpaths)):
+                    if error:
+                        totals["errors"] += 1
+                        log(f"⚠️  Skipped {relpath}: {error}")
+                        continue
+                    entry, stats = result
+                    files[relpath] = entry
+                    totals["files"] += 1
+                    totals["total_bytes"] += entry["size"]
+                    for key, value in stats.items():
+                        totals[key] += value
+
+            totals["seconds"] = round(time.time() - started, 2)
+            manifest = {
+                "id": f"{tier}-{now.strftime('%Y%m%d-%H%M%S-%f')}",
+                "tier": tier,
+                "created": now.isoformat(timespec="seconds"),
+                "source": str(self.source),
+                "chunk_size": CHUNK_SIZE,
+                "stats": totals,
+                "files": files,
+            }
+            self._write_manifest(manifest)
+
+        return manifest
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def prune(self, retention: Dict[str, int] = RETENTION) -> Dict:
+        """
+        Apply the retention policy, then delete unreferenced chunks.
+
+        Returns:
+            {'snapshots_removed', 'chunks_removed', 'bytes_freed'}
+        """
+        result = {"snapshots_removed": 0, "chunks_removed": 0, "bytes_freed": 0}
+
+        with self.lock():
+            for tier, keep in retention.items():
+                manifests = self._manifest_paths(tier)
+                for path in manifests[:max(0, len(manifests) - keep)]:
+                    path.unlink()
+                    result["snapshots_removed"] += 1
+
+            referenced = set()
+            for path in self._manifest_paths():
+                for entry in json.loads(path.read_text())["files"].values():
+                    referenced.update(entry.get("chunks", ()))
+
+            for chunk in self.chunks_dir.glob("*/*"):
+                if chunk.name not in referenced:
+                    result["bytes_freed"] += chunk.stat().st_size
+                    chunk.unlink()
+                    result["chunks_removed"] += 1
+
+        return result
+
+    # ------------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------------
+
+    def restore(self, snapshot_id: str, dest: Path, prefix: Optional[str] = None) -> int:
+        """
+        Restore a snapshot (or the files under one path within it).
+
+        Args:
+            snapshot_id: Snapshot id or 'latest'
+            dest: Directory to restore into
+            prefix: Relative path of a single file or directory to restore
+
+        Returns:
+            Number of files restored
+        """
+        manifest = self.load_manifest(snapshot_id)
+        prefix = prefix.strip("/") if prefix else None
+        dest = Path(dest)
+        restored = 0
+
+        for relpath, entry in manifest["files"].items():
+            if prefix and relpath != prefix and not relpath.startswith(prefix + "/"):
+                continue
+
+            target = dest / relpath
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if "link" in entry:
+                if target.is_symlink() or target.exists():
+                    target.unlink()
+                os.symlink(entry["link"], target)
+            else:
+                tmp_path = target.with_name(f".{target.name}.restore.tmp")
+                with open(tmp_path, "wb") as f:
+                    for digest in entry["chunks"]:
+                        f.write(self.get_chunk(digest))
+                os.replace(tmp_path, target)
+                os.chmod(target, entry["mode"])
+                os.utime(target, (entry["mtime"], entry["mtime"]))
+            restored += 1
+
+        if prefix and not restored:
+            raise FileNotFoundError(f"{prefix} is not in snapshot {manifest['id']}")
+        return restored
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{int(size)}B"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def run_backup(workers: Optional[int] = None, throttle_mb_per_sec: Optional[float] = None) -> Dict:
+    """Nightly entry point: daily snapshot, promotions, retention"""
+    repo = BackupRepository(throttle_mb_per_sec=throttle_mb_per_sec)
+    now = datetime.now()
+
+    log("=== Starting Claude Incremental Backup ===")
+    manifest = repo.backup("daily", workers=workers, now=now)
+    stats = manifest["stats"]
+    log(f"✅ Snapshot {manifest['id']}: {stats['files']} files ({_format_bytes(stats['total_bytes'])}), "
+        f"{stats['reused']} unchanged, {stats['new_chunks']} new chunks "
+        f"({_format_bytes(stats['stored_bytes'])} stored) in {stats['seconds']}s")
+
+    # Sunday → weekly, 1st of month → monthly
+    if now.isoweekday() == 7:
+        log(f"Sunday detected - promoted to weekly: {repo.promote(manifest, 'weekly')['id']}")
+    if now.day == 1:
+        log(f"First of month detected - promoted to monthly: {repo.promote(manifest, 'monthly')['id']}")
+
+    pruned = repo.prune()
+    if pruned["snapshots_removed"] or pruned["chunks_removed"]:
+        log(f"Pruned {pruned['snapshots_removed']} snapshot(s), {pruned['chunks_removed']} chunk(s) "
+            f"({_format_bytes(pruned['bytes_freed'])} freed)")
+
+    log("✅ Backup process completed successfully")
+    return manifest
+
+
+def main():
+    """CLI entry point."""
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  python3 backup_engine.py backup [--workers N] [--throttle MB/s]")
+        print("  python3 backup_engine.py list")
+        print("  python3 backup_engine.py restore <snapshot-id|latest> [--path <relpath>] [--dest <dir>]")
+        print("  python3 backup_engine.py prune")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    def option(name: str, default=None):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    try:
+        if command == "backup":
+            workers = option("--workers")
+            throttle = option("--throttle")
+            manifest = run_backup(workers=int(workers) if workers else None,
+                                  throttle_mb_per_sec=float(throttle) if throttle else None)
+            if manifest["stats"]["errors"]:
+                sys.exit(1)
+
+        elif command == "list":
+            repo = BackupRepository()
+            for tier in RETENTION:
+                print(f"{tier.capitalize()} (Retention: {RETENTION[tier]}):")
+                snapshots = repo.list_snapshots(tier)
+                if not snapshots:
+                    print("  None")
+                for snapshot in reversed(snapshots):
+                    print(f"  {snapshot['id']}  {snapshot['files']} files, "
+                          f"{_format_bytes(snapshot['total_bytes'])} "
+                          f"(+{_format_bytes(snapshot['stored_bytes'])} new)")
+                print()
+            chunk_bytes = sum(p.stat().st_size for p in repo.chunks_dir.glob("*/*"))
+            print(f"Repository size: {_format_bytes(chunk_bytes)}")
+
+        elif command == "restore":
+            if len(sys.argv) < 3:
+                print("Usage: backup_engine.py restore <snapshot-id|latest> [--path <relpath>] [--dest <dir>]")
+                sys.exit(1)
+            dest = Path(option("--dest", str(Path.home() / ".claude-restored" / ".claude")))
+            count = BackupRepository().restore(sys.argv[2], dest, option("--path"))
+            print(f"✅ Restored {count} file(s) to: {dest}")
+
+        elif command == "prune":
+            result = BackupRepository().prune()
+            print(f"✅ Removed {result['snapshots_removed']} snapshot(s), {result['chunks_removed']} chunk(s) "
+                  f"({_format_bytes(result['bytes_freed'])} freed)")
+
+        else:
+            print(f"Unknown command: {command}")
+            print("Valid commands: backup, list, restore, prune")
+            sys.exit(1)
+
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
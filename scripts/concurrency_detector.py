@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Concurrency Detector - Overlapping agent sessions without a self-join
+
+Finds sessions in constitution_compliance.db that overlap other sessions
+beyond the constitution's limits, and records each one in `violations`:
+
+    critical  launched while max_concurrent sessions were running
+    warning   launched while max_per_agent_type sessions of the same agent
+              type were running
+
+Two interval-based detectors share those rules:
+
+- sweep() audits history in O(n log n): launches and completions are
+  sorted once and swept in time order, keeping the running sessions per
+  agent type (instead of an O(n²) self-join on launched_at/completed_at).
+- LiveDetector answers "how many sessions were running at t" in O(log n)
+  per event from IntervalIndex (sorted start and end times). It is what
+  constitution_tracker.py uses as events stream in; because it queries by
+  event time rather than arrival order, late spooled events are counted
+  correctly.
+
+Limits come from ~/.claude/config/constitution.json, as for the tracker.
+
+Usage:
+    python3 concurrency_detector.py audit [--since YYYY-MM-DD] [--dry-run] [--json]
+"""
+
+import json
+import sys
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from schema_registry import CONSTITUTION_DB
+
+# End time of a session that is still running (sorts after every timestamp)
+OPEN = "9999-12-31 23:59:59"
+
+# (session_id, violation_type, severity, details, detected_at)
+Violation = Tuple[str, str, str, str, str]
+
+
+def now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _violation(session_id: str, agent_type: str, running_total: int, running_same: int,
+               limits: Dict[str, int], at: str, overlapping: Iterable[str] = ()) -> Optional[Violation]:
+    """The violation for a launch seeing the given running counts, if any"""
+    if running_total >= limits["max_concurrent"]:
+        return (session_id, "concurrency", "critical",
+                f"{running_total + 1} sessions running (limit {limits['max_concurrent']})", at)
+    if running_same >= limits["max_per_agent_type"]:
+        details = (f"{running_same + 1} {agent_type} sessions running "
+                   f"(limit {limits['max_per_agent_type']})")
+        overlapping = list(overlapping)
+        if overlapping:
+            details += f"; overlaps {', '.join(overlapping)}"
+        return (session_id, "concurrency", "warning", details, at)
+    return None
+
+
+# ============================================================================
+# LIVE DETECTION
+# ============================================================================
+
+class IntervalIndex:
+    """
+    Sorted start and end times of a set of intervals.
+
+    Sessions running at t are those with start <= t < end, so the count is
+    two binary searches: starts <= t minus ends <= t.
+    """
+
+    def __init__(self):
+        self.starts: List[str] = []
+        self.ends: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def add(self, start: str, end: Optional[str] = None):
+        insort(self.starts, start)
+        insort(self.ends, end or OPEN)
+
+    def close(self, end: str, old_end: str = OPEN):
+        """Give a running interval its end time"""
+        index = bisect_right(self.ends, old_end) - 1
+        if index >= 0 and self.ends[index] == old_end:
+            del self.ends[index]
+            insort(self.ends, end)
+
+    def discard(self, start: str, end: str = OPEN):
+        """Remove one interval added with add(start, end)"""
+        for values, value in ((self.starts, start), (self.ends, end)):
+            index = bisect_left(values, value)
+            if index < len(values) and values[index] == value:
+                del values[index]
+
+    def count_at(self, t: str) -> int:
+        return bisect_right(self.starts, t) - bisect_right(self.ends, t)
+
+    def prune(self, before: str):
+        """
+        Forget intervals that ended before a horizon.
+
+        Each ended interval contributes one start and one end <= before to
+        both counts, so dropping as many of the earliest starts as ends keeps
+        count_at(t) exact for every t >= before.
+        """
+        dropped = bisect_right(self.ends, before)
+        if dropped:
+            del self.ends[:dropped]
+            del self.starts[:dropped]
+
+
+class LiveDetector:
+    """Per-event concurrency checks against interval indexes"""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self.total = IntervalIndex()
+        self.by_type: Dict[str, IntervalIndex] = {}
+
+    def on_launch(self, session_id: str, agent_type: str, at: str) -> Optional[Violation]:
+        """Record a launch; returns its violation, if any"""
+        index = self.by_type.setdefault(agent_type, IntervalIndex())
+        violation = _violation(session_id, agent_type, self.total.count_at(at),
+                               index.count_at(at), self.limits, at)
+        self.total.add(at)
+        index.add(at)
+        return violation
+
+    def on_complete(self, agent_type: str, completed_at: str):
+        self.total.close(completed_at)
+        if agent_type in self.by_type:
+            self.by_type[agent_type].close(completed_at)
+
+    def undo_launch(self, agent_type: str, at: str):
+        """Reverse on_launch (for a batch that failed to commit)"""
+        self.total.discard(at)
+        self.by_type[agent_type].discard(at)
+
+    def undo_complete(self, agent_type: str, completed_at: str):
+        """Reverse on_complete (for a batch that failed to commit)"""
+        self.total.close(OPEN, completed_at)
+        if agent_type in self.by_type:
+            self.by_type[agent_type].close(OPEN, completed_at)
+
+    def prune(self, before: str):
+        self.total.prune(before)
+        for index in self.by_type.values():
+            index.prune(before)
+
+
+# ============================================================================
+# AUDIT
+# ============================================================================
+
+def sweep(sessions: Iterable[Tuple[str, str, str, Optional[str]]],
+          limits: Dict[str, int], at: Optional[str] = None) -> List[Violation]:
+    """
+    Sweep-line audit of (session_id, agent_type, launched_at, completed_at).
+
+    A session ending exactly when another starts does not overlap it
+    (completions sort before launches at equal times).
+    """
+    at = at or now()
+    events = []
+    for session_id, agent_type, launched_at, completed_at in sessions:
+        events.append((launched_at, 1, session_id, agent_type))
+        if completed_at:
+            events.append((completed_at, 0, session_id, agent_type))
+    events.sort()
+
+    running: Dict[str, Dict[str, None]] = {}
+    running_total = 0
+    violations = []
+
+    for _, is_launch, session_id, agent_type in events:
+        same = running.setdefault(agent_type, {})
+        if is_launch:
+            violation = _violation(session_id, agent_type, running_total, len(same),
+                                   limits, at, islice(same, 3))
+            if violation:
+                violations.append(violation)
+            same[session_id] = None
+            running_total += 1
+        elif session_id in same:
+            del same[session_id]
+            running_total -= 1
+
+    return violations
+
+
+def audit(db_path: Path = CONSTITUTION_DB, since: Optional[str] = None,
+          limits: Optional[Dict[str, int]] = None, write: bool = True) -> Dict:
+    """
+    Audit recorded sessions and store violations not already recorded.
+
+    Returns:
+        {'sessions', 'violations' (all found), 'recorded' (newly written), 'seconds'}
+    """
+    from constitution_tracker import load_limits, open_database
+
+    started = time.time()
+    limits = limits or load_limits()
+    conn = open_database(db_path)
+    try:
+        query = "SELECT session_id, agent_type, launched_at, completed_at FROM agent_sessions"
+        params: tuple = ()
+        if since:
+            query += " WHERE launched_at >= ? OR completed_at IS NULL OR completed_at >= ?"
+            params = (since, since)
+        sessions = conn.execute(query, params).fetchall()
+        violations = sweep(sessions, limits)
+
+        known = {row[0] for row in conn.execute(
+            "SELECT session_id FROM violations WHERE violation_type = 'concurrency'")}
+        new = [v for v in violations if v[0] not in known]
+
+        if write and new:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("""
+                INSERT INTO violations (session_id, violation_type, severity, details, detected_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, new)
+            conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    return {
+        "sessions": len(sessions),
+        "violations": [dict(zip(("session_id", "type", "severity", "details", "detected_at"), v))
+                       for v in violations],
+        "recorded": len(new) if write else 0,
+        "seconds": round(time.time() - started, 3),
+    }
+
+
+def main():
+    """CLI entry point."""
+    args = sys.argv[1:]
+    if not args or args[0] != "audit":
+        print(__doc__.split("Usage:")[1].rstrip())
+        sys.exit(1)
+
+    since = args[args.index("--since") + 1] if "--since" in args else None
+    report = audit(since=since, write="--dry-run" not in args)
+
+    if "--json" in args:
+        print(json.dumps(report, indent=2))
+        return
+
+    critical = sum(1 for v in report["violations"] if v["severity"] == "critical")
+    print(f"🔍 Concurrency audit: {report['sessions']} session(s) in {report['seconds']}s")
+    for violation in report["violations"][:20]:
+        icon = "❌" if violation["severity"] == "critical" else "⚠️ "
+        print(f"  {icon} {violation['session_id'][:8]}: {violation['details']}")
+    if len(report["violations"]) > 20:
+        print(f"  ... {len(report['violations']) - 20} more")
+    print(f"\n📊 {len(report['violations'])} violation(s) ({critical} critical), "
+          f"{report['recorded']} newly recorded")
+
+
+if __name__ == "__main__":
+    main()
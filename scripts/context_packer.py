@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Context Packer - Token-budgeted context for specialist prompts
+
+Assembles task context (phase documents, research notes, prior review
+decisions) into a prompt section that fits a token budget:
+
+1. Each source file is split into passages (markdown sections, then
+   paragraphs for long sections).
+2. Passages repeated across files (boilerplate, copied requirements) are
+   kept once, at their highest-priority occurrence.
+3. Passages are ranked by source priority and by term overlap with the
+   task, then packed greedily until the budget is spent; a passage that
+   does not fit whole is truncated at a line boundary if enough room is left.
+4. The chosen passages are emitted in their original document order,
+   grouped under their file names.
+
+Token estimates per passage are cached in ~/.claude/data/context-cache.db,
+keyed by the file's content hash, so unchanged files are never re-split
+or re-counted.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CLAUDE_HOME = Path.home() / ".claude"
+CACHE_DB = CLAUDE_HOME / "data" / "context-cache.db"
+
+DEFAULT_BUDGET = 8000
+
+# Bump when splitting or estimation changes so cached entries are ignored
+ESTIMATOR_VERSION = 1
+
+# Source kinds in priority order (higher weight packs first)
+KIND_WEIGHTS = {
+    "phase": 3.0,
+    "decision": 2.0,
+    "research": 1.5,
+    "other": 1.0,
+}
+
+# workflow-coordinator.py writes the test plan as 04-test-plan.md; the phase
+# templates (and older projects) number it 05 after the implementation report
+PHASE_DOCUMENTS = [
+    "00-project-brief.md",
+    "01-vision.md",
+    "02-mission.md",
+    "03-execution.md",
+    "04-implementation-report.md",
+    "04-test-plan.md",
+    "05-test-plan.md",
+]
+
+HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+WORD = re.compile(r"[a-z0-9][a-z0-9_-]{2,}")
+MAX_PASSAGE_TOKENS = 600
+MIN_TRUNCATED_TOKENS = 80
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "will", "should",
+    "must", "have", "has", "not", "all", "any", "can", "you", "your", "our", "into", "each",
+}
+
+
+# ============================================================================
+# ESTIMATION
+# ============================================================================
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count: words and punctuation count as pieces,
+    long words as one piece per ~4 characters.
+    """
+    count = 0
+    for piece in TOKEN_PIECE.findall(text):
+        count += 1 if len(piece) <= 4 else (len(piece) + 3) // 4
+    return count + text.count("\n") // 2
+
+
+def split_passages(text: str) -> List[Tuple[int, int]]:
+    """Split into (start, end) character spans: sections, then paragraphs if large"""
+    starts = [m.start() for m in HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections = [(s, e) for s, e in zip(starts, starts[1:] + [len(text)]) if text[s:e].strip()]
+
+    passages = []
+    for start, end in sections:
+        if estimate_tokens(text[start:end]) <= MAX_PASSAGE_TOKENS:
+            passages.append((start, end))
+            continue
+        # Large section: break at blank lines
+        position = start
+        for match in re.finditer(r"\n\s*\n", text[start:end]):
+            split = start + match.end()
+            if text[position:split].strip():
+                passages.append((position, split))
+            position = split
+        if text[position:end].strip():
+            passages.append((position, end))
+    return passages
+
+
+class EstimateCache:
+    """Per-file passage spans and token counts keyed by content hash"""
+
+    def __init__(self, db_path: Optional[Path] = CACHE_DB):
+        self.conn = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(db_path, timeout=10)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_estimates (
+                    content_hash TEXT PRIMARY KEY,
+                    tokens INTEGER NOT NULL,
+                    passages TEXT NOT NULL
+                )
+            """)
+        self.hits = 0
+        self.misses = 0
+
+    def passages(self, text: str) -> List[Tuple[int, int, int]]:
+        """(start, end, tokens) for each passage of a file's text"""
+        content_hash = hashlib.sha256(f"v{ESTIMATOR_VERSION}\0{text}".encode()).hexdigest()
+
+        if self.conn:
+            row = self.conn.execute(
+                "SELECT passages FROM token_estimates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row:
+                self.hits += 1
+                return [tuple(p) for p in json.loads(row[0])]
+
+        self.misses += 1
+        spans = [(s, e, estimate_tokens(text[s:e])) for s, e in split_passages(text)]
+        if self.conn:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO token_estimates (content_hash, tokens, passages) VALUES (?, ?, ?)",
+                    (content_hash, sum(t for _, _, t in spans), json.dumps(spans))
+                )
+        return spans
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def collect_project_sources(project_name: str, include_research: bool = True,
+                            include_decisions: bool = True) -> List[Dict]:
+    """Phase documents, research notes and prior review reports for a project"""
+    project_dir = CLAUDE_HOME / "projects" / project_name.lower().replace(" ", "-")
+    sources = [{"path": str(project_dir / name), "kind": "phase"}
+               for name in PHASE_DOCUMENTS if (project_dir / name).exists()]
+
+    if include_decisions:
+        # Most recent review sessions first
+        reports = sorted((project_dir / "review-board").glob("session-*/consolidated-report.md"), reverse=True)
+        sources.extend({"path": str(p), "kind": "decision"} for p in reports[:3])
+
+    if include_research:
+        sources.extend({"path": str(p), "kind": "research"}
+                       for p in sorted((project_dir / "research").rglob("*.md")))
+
+    return sources
+
+
+def _weight(source: Dict) -> float:
+    return source.get("priority", KIND_WEIGHTS.get(source.get("kind", "other"), 1.0))
+
+
+def _normalize(passage: str) -> str:
+    return " ".join(passage.lower().split())
+
+
+def _terms(text: str) -> set:
+    return {w for w in WORD.findall(text.lower()) if w not in STOPWORDS}
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Keep whole lines of a passage up to a token budget"""
+    kept, used = [], 0
+    for line in text.splitlines(keepends=True):
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "".join(kept).rstrip() + "\n[…truncated]\n"
+
+
+# ============================================================================
+# PACKING
+# ============================================================================
+
+def pack_context(sources: List[Dict], task: str = "", budget_tokens: int = DEFAULT_BUDGET,
+                 cache: Optional[EstimateCache] = None) -> Tuple[str, Dict]:
+    """
+    Pack sources into a context block under a token budget.
+
+    Args:
+        sources: Dicts with 'path' and optional 'kind' (phase, decision,
+            research, other) and 'priority' (overrides the kind weight)
+        task: Task text; passages sharing its terms rank higher
+        budget_tokens: Maximum estimated tokens for the packed context
+        cache: Estimate cache (defaults to ~/.claude/data/context-cache.db)
+
+    Returns:
+        (packed text, report with tokens used, passages kept/dropped,
+        duplicates removed and cache hits)
+    """
+    own_cache = cache is None
+    cache = cache or EstimateCache()
+    task_terms = _terms(task)
+
+    candidates = []
+    seen = set()
+    duplicates = 0
+    missing = []
+
+    try:
+        # Highest-priority sources first, so a duplicate keeps its best copy
+        for source_index, source in sorted(enumerate(sources), key=lambda s: -_weight(s[1])):
+            path = Path(source["path"])
+            try:
+                text = path.read_text(errors="replace")
+            except (IOError, OSError):
+                missing.append(str(path))
+                continue
+
+            weight = _weight(source)
+            for order, (start, end, tokens) in enumerate(cache.passages(text)):
+                passage = text[start:end]
+                fingerprint = hashlib.sha1(_normalize(passage).encode()).hexdigest()
+                if fingerprint in seen:
+                    duplicates += 1
+                    continue
+                seen.add(fingerprint)
+
+                terms = _terms(passage)
+                relevance = len(terms & task_terms) / len(task_terms) if task_terms else 0.0
+                # Earlier passages (summaries, overviews) get a slight edge within a file
+                score = weight * (1.0 + relevance) - order * 0.001
+                candidates.append({
+                    "source": source_index,
+                    "order": order,
+                    "path": str(path),
+                    "text": passage,
+                    "tokens": tokens,
+                    "score": score,
+                })
+    finally:
+        hits, misses = cache.hits, cache.misses
+        if own_cache:
+            cache.close()
+
+    # Greedy by score; header cost per file is charged when a file first appears
+    chosen = []
+    used = 0
+    files_used = set()
+    dropped = 0
+    for candidate in sorted(candidates, key=lambda c: -c["score"]):
+        header = 0 if candidate["path"] in files_used else estimate_tokens(f"### {candidate['path']}\n")
+        remaining = budget_tokens - used - header
+        if candidate["tokens"] <= remaining:
+            chosen.append(candidate)
+        elif remaining >= MIN_TRUNCATED_TOKENS:
+            candidate = dict(candidate, text=_truncate(candidate["text"], remaining - 4))
+            candidate["tokens"] = estimate_tokens(candidate["text"])
+            chosen.append(candidate)
+        else:
+            dropped += 1
+            continue
+        used += candidate["tokens"] + header
+        files_used.add(candidate["path"])
+
+    # Re-emit in document order so the packed context reads naturally
+    sections = []
+    current = None
+    for candidate in sorted(chosen, key=lambda c: (c["source"], c["order"])):
+        if candidate["path"] != current:
+            current = candidate["path"]
+            sections.append(f"### {current}\n")
+        sections.append(candidate["text"].rstrip() + "\n")
+
+    report = {
+        "budget_tokens": budget_tokens,
+        "tokens": used,
+        "passages": len(chosen),
+        "dropped": dropped,
+        "duplicates": duplicates,
+        "files": len(files_used),
+        "missing": missing,
+        "cache_hits": hits,
+        "cache_misses": misses,
+    }
+    return "\n".join(sections), report
+
+
+def build_prompt(task: str, context: str) -> str:
+    """Prepend packed context to a task"""
+    if not context:
+        return task
+    return f"## Context\n\n{context}\n## Task\n\n{task}"
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Database Snapshots - Consistent online copies of live workflow databases
+
+Copies every workflow.db and the constitution compliance database under
+~/.claude through the SQLite online backup API, so coordinators can keep
+writing while a backup runs:
+
+- Pages are copied in small steps; the source read lock is released
+  between steps, so a writer never waits for more than one step.
+- A shared I/O throttle (bytes/second across all copies) sleeps between
+  steps so backups do not starve production agents.
+- If a writer changes the source mid-copy, SQLite restarts the backup.
+  After MAX_RESTARTS restarts the copy is finished in a single step.
+- Each copy is verified with PRAGMA quick_check.
+- Databases are copied in parallel, one thread per database.
+
+backup_engine.py uses snapshot_database() for every SQLite file it backs
+up. Settings can be set in ~/.claude/config/backup.json:
+
+    {"snapshot_pages": 256, "throttle_mb_per_sec": 20, "snapshot_workers": 4}
+
+Usage:
+    python3 db_snapshot.py [dest-dir] [--workers N] [--pages N] [--throttle MB/s] [--json]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CLAUDE_HOME = Path.home() / ".claude"
+CONFIG_PATH = CLAUDE_HOME / "config" / "backup.json"
+SNAPSHOTS_PATH = CLAUDE_HOME / "backups" / "db-snapshots"
+
+DEFAULT_PAGES = 256
+DEFAULT_WORKERS = 4
+MAX_RESTARTS = 3
+
+# Databases written by coordinators and hooks (relative to CLAUDE_HOME)
+DATABASE_PATTERNS = [
+    "data/workflow.db",
+    "data/constitution_compliance.db",
+    "projects/*/workflow.db",
+]
+
+
+class SnapshotError(Exception):
+    """A snapshot could not be taken or failed verification"""
+
+
+class Throttle:
+    """Byte-rate limit shared by every copy thread"""
+
+    def __init__(self, bytes_per_second: Optional[float]):
+        self.rate = bytes_per_second
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def consume(self, size: int):
+        """Account for size bytes, sleeping until the rate allows them"""
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + size / self.rate
+            delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def load_config(config_path: Path = CONFIG_PATH) -> Dict:
+    """Snapshot settings with defaults"""
+    config = {}
+    if config_path.exists():
+        try:
+            config = json.loads(config_path.read_text())
+        except (json.JSONDecodeError, IOError):
+            config = {}
+    return {
+        "pages": int(config.get("snapshot_pages", DEFAULT_PAGES)),
+        "throttle_mb_per_sec": config.get("throttle_mb_per_sec"),
+        "workers": int(config.get("snapshot_workers", DEFAULT_WORKERS)),
+    }
+
+
+def make_throttle(mb_per_sec: Optional[float]) -> Throttle:
+    return Throttle(float(mb_per_sec) * 1024 * 1024 if mb_per_sec else None)
+
+
+def find_databases(root: Path = CLAUDE_HOME) -> List[Path]:
+    """Every workflow and compliance database under root"""
+    found = []
+    for pattern in DATABASE_PATTERNS:
+        found.extend(sorted(p for p in root.glob(pattern) if p.is_file()))
+    return found
+
+
+def snapshot_database(src: Path, dest: Path, pages: int = DEFAULT_PAGES,
+                      throttle: Optional[Throttle] = None, verify: bool = True) -> Dict:
+    """
+    Copy a live database to dest with the online backup API.
+
+    Args:
+        src: Database to copy (opened read-only)
+        dest: Destination file (replaced atomically on success)
+        pages: Pages copied per step; the source is unlocked between steps
+        throttle: Shared I/O throttle
+        verify: Run PRAGMA quick_check on the copy
+
+    Returns:
+        {'source', 'dest', 'bytes', 'pages', 'restarts', 'seconds', 'check'}
+
+    Raises:
+        SnapshotError: The copy failed or did not pass quick_check
+    """
+    started = time.time()
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    source = sqlite3.connect(f"file:{src}?mode=ro", uri=True, timeout=30)
+    target = sqlite3.connect(str(tmp_path))
+    page_size = source.execute("PRAGMA page_size").fetchone()[0]
+    progress = {"remaining": None, "restarts": 0, "total": 0}
+
+    def on_progress(status, remaining, total):
+        # Remaining pages going back up means a writer forced a restart
+        if progress["remaining"] is not None and remaining > progress["remaining"]:
+            progress["restarts"] += 1
+            if progress["restarts"] > MAX_RESTARTS:
+                raise SnapshotError("restarted too often")
+        progress["remaining"], progress["total"] = remaining, total
+        if throttle:
+            throttle.consume(min(pages, total) * page_size)
+
+    try:
+        try:
+            source.backup(target, pages=pages, progress=on_progress)
+        except SnapshotError:
+            # Busy database: finish in one step under a single read lock
+            source.backup(target, pages=-1)
+
+        check = "skipped"
+        if verify:
+            check = target.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise SnapshotError(f"quick_check failed for snapshot of {src}: {check}")
+        target.close()
+        os.replace(tmp_path, dest)
+    except sqlite3.Error as e:
+        raise SnapshotError(f"Snapshot of {src} failed: {e}") from e
+    finally:
+        target.close()
+        source.close()
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return {
+        "source": str(src),
+        "dest": str(dest),
+        "bytes": dest.stat().st_size,
+        "pages": progress["total"],
+        "restarts": progress["restarts"],
+        "seconds": round(time.time() - started, 3),
+        "check": check,
+    }
+
+
+def snapshot_all(dest_dir: Path, root: Path = CLAUDE_HOME, workers: int = DEFAULT_WORKERS,
+                 pages: int = DEFAULT_PAGES, throttle: Optional[Throttle] = None) -> List[Dict]:
+    """
+    Snapshot every database under root into dest_dir, in parallel.
+
+    Copies keep their path relative to root. Failures are reported in the
+    result's 'error' field rather than raised.
+    """
+    databases = find_databases(root)
+    throttle = throttle or Throttle(None)
+    results = []
+
+    def work(src: Path) -> Dict:
+        try:
+            return snapshot_database(src, Path(dest_dir) / src.relative_to(root), pages, throttle)
+        except SnapshotError as e:
+            return {"source": str(src), "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(databases) or 1))) as pool:
+        for future in as_completed([pool.submit(work, db) for db in databases]):
+            results.append(future.result())
+
+    return sorted(results, key=lambda r: r["source"])
+
+
+def main():
+    """CLI entry point."""
+    config = load_config()
+    args = sys.argv[1:]
+
+    def option(name: str, default):
+        if name in args:
+            index = args.index(name)
+            value = args[index + 1]
+            del args[index:index + 2]
+            return value
+        return default
+
+    workers = int(option("--workers", config["workers"]))
+    pages = int(option("--pages", config["pages"]))
+    throttle = option("--throttle", config["throttle_mb_per_sec"])
+    as_json = "--json" in args
+    args = [a for a in args if a != "--json"]
+
+    if args and args[0] in ("-h", "--help"):
+        print("Usage: db_snapshot.py [dest-dir] [--workers N] [--pages N] [--throttle MB/s] [--json]")
+        sys.exit(0)
+
+    dest_dir = Path(args[0]) if args else SNAPSHOTS_PATH / datetime.now().strftime("%Y%m%d-%H%M%S")
+    started = time.time()
+    results = snapshot_all(dest_dir, workers=workers, pages=pages, throttle=make_throttle(throttle))
+
+    if as_json:
+        print(json.dumps({"dest": str(dest_dir), "seconds": round(time.time() - started, 2),
+                          "databases": results}, indent=2))
+    else:
+        print(f"📸 Database snapshots → {dest_dir}\n")
+        for result in results:
+            name = Path(result["source"]).relative_to(CLAUDE_HOME)
+            if "error" in result:
+                print(f"  ❌ {name}: {result['error']}")
+            else:
+                restarts = f", {result['restarts']} restart(s)" if result["restarts"] else ""
+                print(f"  ✅ {name}: {result['bytes'] // 1024}KB in {result['seconds']}s "
+                      f"(quick_check {result['check']}{restarts})")
+        print(f"\n📊 {len(results)} database(s) in {round(time.time() - started, 2)}s")
+
+    if any("error" in r for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
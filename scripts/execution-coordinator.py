@@ -10,6 +10,11 @@ Used by: execution-director, delivery-coordinator, quality-enforcer, blocker-res
 Usage:
     python3 execution-coordinator.py init <project-name>
     python3 execution-coordinator.py health <project-name>
+    python3 execution-coordinator.py archive <project-name> [days] [--dry-run]
+    python3 execution-coordinator.py history <project-name>
+    python3 execution-coordinator.py gate <project-name> <task|feature|epic|phase> <items.json> [--workers N]
+    python3 execution-coordinator.py handoffs <project-name> [--convert] [--gc]
+    python3 execution-coordinator.py portfolio [--json] [--workers N] [--no-cache]
 """
 
 import sqlite3
@@ -17,6 +22,9 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+import tracing
+from project_migrations import connect, migrate
+
 
 def get_db_path(project_name):
     """Get path to project workflow database"""
@@ -25,184 +33,17 @@ def get_db_path(project_name):
     return db_path
 
 
+@tracing.traced()
 def init_execution_schema(db_path):
     """Initialize Phase 4 execution communication schema"""
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Agent Messages Table (Inter-agent communication)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS agent_messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            from_agent TEXT NOT NULL,
-            to_agent TEXT NOT NULL,
-            message_type TEXT NOT NULL,  -- 'task_assignment', 'status_update', 'handoff_notification', 'blocker_alert', 'clarification'
-            content TEXT NOT NULL,
-            task_id TEXT,
-            priority TEXT,  -- 'P0', 'P1', 'P2'
-            acknowledged BOOLEAN DEFAULT 0
-        )
-    """)
-
-    # Handoff Log Table (Team handoffs)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS handoff_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            from_team TEXT NOT NULL,
-            to_team TEXT NOT NULL,
-            deliverable TEXT NOT NULL,
-            handoff_package TEXT,  -- JSON: {deliverable, docs, tests, context, notes}
-            status TEXT NOT NULL,  -- 'initiated', 'confirmed', 'complete', 'rejected'
-            confirmed_by TEXT,
-            confirmed_at DATETIME,
-            notes TEXT
-        )
-    """)
-
-    # Quality Gates Table (Gate enforcement tracking)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS quality_gates (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            gate_level TEXT NOT NULL,  -- 'task', 'feature', 'epic', 'phase'
-            item_id TEXT NOT NULL,
-            item_name TEXT NOT NULL,
-            gate_status TEXT NOT NULL,  -- 'passed', 'failed'
-            checks_run TEXT,  -- JSON: list of checks performed
-            failed_checks TEXT,  -- JSON: list of failed checks (if failed)
-            enforced_by TEXT DEFAULT 'quality-enforcer'
-        )
-    """)
-
-    # SOP Compliance Table (Standard Operating Procedure tracking)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sop_compliance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            sop_name TEXT NOT NULL,  -- 'task_completion', 'team_handoff', 'quality_gate_enforcement', 'blocker_escalation', 'daily_sync'
-            item_id TEXT NOT NULL,
-            compliance_status TEXT NOT NULL,  -- 'compliant', 'violation', 'warning'
-            violations TEXT,  -- JSON: list of violations (if non-compliant)
-            agent TEXT,
-            notes TEXT
-        )
-    """)
-
-    # Blockers Table (Blocker tracking and resolution)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS blockers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            blocker_id TEXT UNIQUE NOT NULL,
-            blocker_type TEXT NOT NULL,  -- 'technical', 'information', 'resource', 'team_dependency'
-            blocker_subtype TEXT,
-            task_id TEXT,
-            description TEXT NOT NULL,
-            current_level TEXT NOT NULL,  -- 'L1', 'L2', 'L3', 'L4', 'L5'
-            status TEXT NOT NULL,  -- 'active', 'resolved', 'escalated'
-            on_critical_path BOOLEAN DEFAULT 0,
-            resolution TEXT,
-            resolved_at DATETIME
-        )
-    """)
-
-    # Blocker Patterns Table (Learning from blockers)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS blocker_patterns (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            blocker_type TEXT NOT NULL,
-            blocker_subtype TEXT,
-            blocker_signature TEXT NOT NULL,  -- Unique pattern identifier
-            solution TEXT NOT NULL,
-            solution_steps TEXT,
-            resolution_level TEXT,  -- 'L1', 'L2', 'L3', 'L4'
-            specialist_used TEXT,
-            success_rate REAL DEFAULT 1.0,
-            usage_count INTEGER DEFAULT 1,
-            last_used DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Team Status Table (Real-time team tracking)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS team_status (
-            team_name TEXT PRIMARY KEY,
-            active_tasks INTEGER DEFAULT 0,
-            queued_tasks INTEGER DEFAULT 0,
-            capacity INTEGER DEFAULT 3,
-            utilization_percent REAL DEFAULT 0,
-            current_epic TEXT,
-            blockers TEXT,  -- JSON: list of active blockers
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Review Deployments Table (Review agent deployment tracking)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS review_deployments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            reviewer_agent TEXT NOT NULL,
-            item_id TEXT NOT NULL,
-            item_type TEXT NOT NULL,  -- 'task', 'feature', 'epic'
-            review_status TEXT NOT NULL,  -- 'requested', 'in_progress', 'complete'
-            review_result TEXT,  -- 'approved', 'changes_requested', 'rejected'
-            feedback TEXT
-        )
-    """)
-
-    # Team Sync Log Table (Daily standups and syncs)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS team_sync_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            sync_date DATE NOT NULL,
-            sync_type TEXT NOT NULL,  -- 'daily_standup', 'epic_kickoff', 'epic_retro'
-            teams_involved TEXT NOT NULL,
-            summary TEXT,  -- JSON: {team_status, cross_team_issues, blockers_summary}
-            issues_identified TEXT,
-            actions_taken TEXT
-        )
-    """)
-
-    # Tactical Decisions Table (execution-director decisions)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS tactical_decisions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            decision_type TEXT NOT NULL,
-            situation TEXT NOT NULL,
-            decision_made TEXT NOT NULL,
-            rationale TEXT,
-            impact TEXT,
-            outcome TEXT
-        )
-    """)
-
-    # Initialize 7 agent teams in team_status
-    teams = [
-        ('Foundation', 3, 'database-architect, devops-engineer'),
-        ('Backend', 5, 'backend-developer, api-architect, sql-specialist'),
-        ('Frontend', 3, 'frontend-developer, ui-ux-designer'),
-        ('Research', 5, 'research-manager, documentation-expert, specialists'),
-        ('Quality', 10, 'qa-engineer, code-review-expert, security-auditor, performance-engineer'),
-        ('Integration', 3, 'integration-specialist, mcp-bridge-engineer'),
-        ('Orchestration', 999, 'execution-director, delivery-coordinator, quality-enforcer, blocker-resolver, progress-tracker')
-    ]
-
-    for team_name, capacity, members in teams:
-        cursor.execute("""
-            INSERT OR IGNORE INTO team_status (team_name, capacity, active_tasks, queued_tasks, utilization_percent)
-            VALUES (?, ?, 0, 0, 0)
-        """, (team_name, capacity))
-
-    conn.commit()
-    conn.close()
+    # Tables, indexes and the 7 agent teams are defined as numbered
+    # migrations so existing project databases receive later changes too
+    from_version, to_version = migrate(db_path)
 
     print(f"✅ Execution communication schema initialized")
     print(f"📍 Database: {db_path}")
+    print(f"🔢 Schema version: v{from_version} → v{to_version}")
     print(f"\n📋 Tables created:")
     print(f"  - agent_messages (inter-agent communication)")
     print(f"  - handoff_log (team handoffs)")
@@ -216,6 +57,7 @@ def init_execution_schema(db_path):
     print(f"  - tactical_decisions (execution-director decisions)")
 
 
+@tracing.traced()
 def check_health(db_path):
     """Check Phase 4 execution infrastructure health"""
 
@@ -224,7 +66,7 @@ def check_health(db_path):
         print(f"\nRun: python3 execution-coordinator.py init <project-name>")
         return
 
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
 
     print(f"📊 Phase 4 Execution Infrastructure Health Check")
@@ -312,15 +154,197 @@ def check_health(db_path):
     else:
         print(f"  No SOP compliance data yet")
 
+    # Archived history
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='archive_rollups'")
+    if cursor.fetchone():
+        cursor.execute("SELECT COUNT(DISTINCT period), COALESCE(SUM(row_count), 0) FROM archive_rollups")
+        periods, archived_rows = cursor.fetchone()
+        print(f"\n🗄️  Archived: {archived_rows} rows across {periods} month(s)")
+
     conn.close()
     print(f"\n✅ Health check complete")
 
 
+@tracing.traced()
+def archive_history(db_path, days=None, dry_run=False):
+    """Apply the retention policy and report what moved to archive partitions"""
+    from execution_archive import archive_project
+
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+
+    results = archive_project(db_path, override_days=days, dry_run=dry_run)
+
+    verb = "Would archive" if dry_run else "Archived"
+    if not results:
+        print(f"✅ Nothing to archive - all rows are within the retention window")
+        return
+
+    print(f"🗄️  {verb}:")
+    for table, periods in results.items():
+        total = sum(periods.values())
+        print(f"  - {table}: {total} rows ({', '.join(sorted(periods))})")
+
+    if not dry_run:
+        print(f"\n✅ Archive complete, free pages reclaimed")
+
+
+@tracing.traced()
+def show_history(db_path):
+    """Show archive partitions and live + archived row counts per table"""
+    from execution_archive import RETENTION_POLICY, list_partitions
+
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+
+    partitions = list_partitions(db_path)
+    print(f"🗄️  Archive partitions: {len(partitions)}")
+    for partition in partitions:
+        print(f"  - {partition.stem} ({partition.stat().st_size // 1024} KB)")
+
+    # Archived counts come from the rollups written with every partition, so
+    # they cover all months without attaching more partitions than SQLite allows
+    conn = connect(db_path)
+    archived = dict(conn.execute(
+        "SELECT table_name, SUM(row_count) FROM archive_rollups GROUP BY table_name"
+    ).fetchall())
+
+    print(f"\n📚 Rows (live + archived):")
+    for table in RETENTION_POLICY:
+        try:
+            live = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        except sqlite3.OperationalError:
+            continue
+        print(f"  - {table}: {live} live, {archived.get(table, 0)} archived")
+
+    conn.close()
+
+
+@tracing.traced()
+def run_quality_gate(db_path, gate_level, items_path, workers=None):
+    """Run a quality gate over the items in a JSON file and record the outcomes"""
+    from quality_gate_runner import load_items, run_gate
+
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        print(f"\nRun: python3 execution-coordinator.py init <project-name>")
+        return False
+
+    items = load_items(items_path)
+    print(f"🚦 Running {gate_level} gate over {len(items)} item(s)...")
+
+    result = run_gate(db_path, gate_level, items, workers=workers)
+
+    for outcome in result["items"]:
+        if outcome["gate_status"] == "failed":
+            print(f"  ❌ {outcome['item_id']} {outcome['item_name']}")
+            for failure in outcome["failed_checks"]:
+                print(f"     - {failure['check']}: {failure['detail']}")
+
+    print(f"\n📊 {result['passed']} passed, {result['failed']} failed "
+          f"({result['checks_executed']} checks run, {result['cache_hits']} cached, "
+          f"{result['duration_seconds']}s)")
+
+    return result["failed"] == 0
+
+
+@tracing.traced()
+def manage_handoff_store(db_path, convert=False, collect=False):
+    """Report on the handoff package store, optionally converting inline packages and collecting garbage"""
+    import handoff_store
+
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+
+    if convert:
+        converted = handoff_store.convert_inline_packages(db_path)
+        print(f"📦 Converted {converted} inline handoff package(s)")
+
+    if collect:
+        conn = connect(db_path)
+        with conn:
+            blobs, freed = handoff_store.gc(conn)
+        conn.close()
+        print(f"🧹 Collected {blobs} unreferenced blob(s), {freed // 1024} KB freed")
+
+    stats = handoff_store.store_stats(db_path)
+    ratio = stats["logical_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0
+
+    print(f"\n📦 Handoff Package Store:")
+    print(f"  - Handoffs (content-addressed): {stats['handoffs']}")
+    print(f"  - Handoffs (inline, legacy): {stats['inline_handoffs']}")
+    print(f"  - Blobs: {stats['blobs']} ({stats['stored_bytes'] // 1024} KB stored)")
+    print(f"  - Logical package size: {stats['logical_bytes'] // 1024} KB ({ratio:.1f}x dedup)")
+    if stats["garbage_bytes"]:
+        print(f"  - Unreferenced: {stats['garbage_bytes'] // 1024} KB (run with --gc)")
+
+
+@tracing.traced()
+def show_portfolio(as_json=False, workers=None, use_cache=True):
+    """Cross-project report: team bottlenecks, blockers and gate pass rates"""
+    import json
+    from portfolio_telemetry import build_portfolio_report
+
+    report = build_portfolio_report(workers=workers, use_cache=use_cache)
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+
+    stats = report["stats"]
+    print(f"📊 Portfolio Execution Report")
+    print(f"📁 {report['projects']} projects ({stats['cache_hits']}/{stats['databases']} cached, {stats['seconds']}s)\n")
+
+    print(f"🤝 Teams (by load):")
+    teams = sorted(report["teams"].items(), key=lambda t: t[1]["utilization_percent"], reverse=True)
+    for name, team in teams:
+        util = team["utilization_percent"]
+        status = "✅" if util < 85 else "⚠️" if util < 95 else "❌"
+        print(f"  {status} {name}: {team['active']}/{team['capacity']} active ({util:.0f}% util), "
+              f"{team['queued']} queued, {team['pending_handoffs']} inbound handoffs")
+
+    if report["bottlenecks"]:
+        print(f"\n🚧 Bottleneck: {report['bottlenecks'][0]}")
+
+    blockers = report["blockers"]
+    print(f"\n🛑 Active Blockers: {blockers['active']} ({blockers['critical_path']} on critical path)")
+    for project, count in sorted(blockers["by_project"].items(), key=lambda p: p[1], reverse=True)[:5]:
+        print(f"  - {project}: {count}")
+
+    print(f"\n🚦 Quality Gate Pass Rates:")
+    if not report["gates"]:
+        print(f"  No gate data yet")
+    for level in ("task", "feature", "epic", "phase"):
+        if level in report["gates"]:
+            gate = report["gates"][level]
+            print(f"  - {level}: {gate['pass_rate']}% ({gate['passed']}/{gate['total']})")
+
+    for project, error in report["errors"].items():
+        print(f"\n⚠️ {project}: {error}")
+
+
 def main():
+    tracing.setup()
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "portfolio":
+        workers = None
+        if "--workers" in sys.argv:
+            workers = int(sys.argv[sys.argv.index("--workers") + 1])
+        show_portfolio("--json" in sys.argv, workers, "--no-cache" not in sys.argv)
+        return
+
     if len(sys.argv) < 3:
         print("Usage:")
         print("  python3 execution-coordinator.py init <project-name>")
         print("  python3 execution-coordinator.py health <project-name>")
+        print("  python3 execution-coordinator.py archive <project-name> [days] [--dry-run]")
+        print("  python3 execution-coordinator.py history <project-name>")
+        print("  python3 execution-coordinator.py gate <project-name> <task|feature|epic|phase> <items.json> [--workers N]")
+        print("  python3 execution-coordinator.py handoffs <project-name> [--convert] [--gc]")
+        print("  python3 execution-coordinator.py portfolio [--json] [--workers N] [--no-cache]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -336,9 +360,33 @@ def main():
     elif command == "health":
         check_health(db_path)
 
+    elif command == "archive":
+        args = sys.argv[3:]
+        dry_run = "--dry-run" in args
+        days = [a for a in args if a != "--dry-run"]
+        archive_history(db_path, int(days[0]) if days else None, dry_run)
+
+    elif command == "history":
+        show_history(db_path)
+
+    elif command == "gate":
+        if len(sys.argv) < 5:
+            print("Usage: execution-coordinator.py gate <project-name> <task|feature|epic|phase> <items.json> [--workers N]")
+            sys.exit(1)
+
+        workers = None
+        if "--workers" in sys.argv:
+            workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+        if not run_quality_gate(db_path, sys.argv[3], Path(sys.argv[4]), workers):
+            sys.exit(1)
+
+    elif command == "handoffs":
+        manage_handoff_store(db_path, "--convert" in sys.argv, "--gc" in sys.argv)
+
     else:
         print(f"Unknown command: {command}")
-        print("Valid commands: init, health")
+        print("Valid commands: init, health, archive, history, gate, handoffs")
         sys.exit(1)
 
 
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Execution Archive - Retention and compaction for Phase 4 execution tables
+
+The execution tables created by execution-coordinator.py are append-only.
+This module moves rows older than a retention window out of the live
+project database into monthly SQLite partitions, keeps per-month rollups
+in the live database, and reclaims the freed pages with incremental VACUUM.
+
+Archived history stays queryable: open_with_history() attaches the monthly
+partitions and exposes one <table>_history view per archived table.
+
+Layout:
+    ~/.claude/projects/<name>/workflow.db           (live tables + archive_rollups)
+    ~/.claude/projects/<name>/archive/2025-01.db    (one partition per month)
+
+Policy (optional): ~/.claude/config/retention.json
+    {"default_days": 90, "tables": {"agent_messages": 30}}
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from handoff_store import gc as gc_handoff_blobs, inline_for_archive
+from project_migrations import connect
+
+CLAUDE_HOME = Path.home() / ".claude"
+POLICY_PATH = CLAUDE_HOME / "config" / "retention.json"
+
+DEFAULT_RETENTION_DAYS = 90
+
+# Archivable tables: the column that dates each row, and the columns
+# summarised into archive_rollups when rows leave the live database.
+RETENTION_POLICY = {
+    "agent_messages": {
+        "timestamp_column": "timestamp",
+        "rollup_columns": ["from_agent", "message_type"],
+    },
+    "handoff_log": {
+        "timestamp_column": "timestamp",
+        "rollup_columns": ["from_team", "to_team", "status"],
+    },
+    "quality_gates": {
+        "timestamp_column": "timestamp",
+        "rollup_columns": ["gate_level", "gate_status"],
+    },
+    "sop_compliance": {
+        "timestamp_column": "timestamp",
+        "rollup_columns": ["sop_name", "compliance_status"],
+    },
+    "team_sync_log": {
+        "timestamp_column": "sync_date",
+        "rollup_columns": ["sync_type"],
+    },
+    "tactical_decisions": {
+        "timestamp_column": "timestamp",
+        "rollup_columns": ["decision_type"],
+    },
+}
+
+# SQLite's default compile-time limit on attached databases
+DEFAULT_ATTACH_LIMIT = 10
+
+
+def get_archive_dir(db_path: Path) -> Path:
+    """Get the archive partition directory that belongs to a workflow database"""
+    return Path(db_path).parent / "archive"
+
+
+def load_retention_days(policy_path: Path = POLICY_PATH,
+                        override_days: Optional[int] = None) -> Dict[str, int]:
+    """
+    Resolve the retention window (in days) for every archivable table.
+
+    Precedence: explicit override > per-table policy > policy default > 90 days.
+    """
+    policy = {}
+    if policy_path.exists():
+        try:
+            policy = json.loads(policy_path.read_text())
+        except (json.JSONDecodeError, IOError):
+            policy = {}
+
+    default_days = policy.get("default_days", DEFAULT_RETENTION_DAYS)
+    per_table = policy.get("tables", {})
+
+    days = {}
+    for table in RETENTION_POLICY:
+        if override_days is not None:
+            days[table] = override_days
+        else:
+            days[table] = int(per_table.get(table, default_days))
+    return days
+
+
+def _table_columns(conn: sqlite3.Connection, table: str, schema: str = "main") -> List[str]:
+    """Return the column names of a table (empty if the table is missing)"""
+    rows = conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()
+    return [row[1] for row in rows]
+
+
+def _ensure_archive_table(conn: sqlite3.Connection, table: str, columns: List[str]):
+    """Create or widen the partition table so it can hold every live column"""
+    existing = _table_columns(conn, table, "arc")
+    if not existing:
+        conn.execute(f"CREATE TABLE arc.{table} AS SELECT * FROM main.{table} WHERE 0")
+        return
+
+    for column in columns:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE arc.{table} ADD COLUMN {column}")
+
+
+def _month_bounds(period: str):
+    """
+    Return the [start, end) bounds for a 'YYYY-MM' period.
+
+    Bounds are plain dates so they compare correctly against both DATE
+    ('2025-01-31') and DATETIME ('2025-01-31 12:00:00') columns.
+    """
+    start = datetime.strptime(period, "%Y-%m")
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+
+def archive_table(conn: sqlite3.Connection, archive_dir: Path, table: str,
+                  cutoff: str, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Move rows older than cutoff from one table into monthly partitions.
+
+    Each month is copied, rolled up and deleted in a single transaction,
+    so an interrupted run never loses or duplicates rows.
+
+    Returns:
+        Dict mapping 'YYYY-MM' period to number of rows archived
+    """
+    policy = RETENTION_POLICY[table]
+    ts_col = policy["timestamp_column"]
+    columns = _table_columns(conn, table)
+    if not columns:
+        return {}
+
+    periods = conn.execute(f"""
+        SELECT substr({ts_col}, 1, 7) AS period, COUNT(*)
+        FROM {table}
+        WHERE {ts_col} IS NOT NULL AND {ts_col} < ?
+        GROUP BY period
+        ORDER BY period
+    """, (cutoff,)).fetchall()
+
+    if dry_run:
+        return {period: count for period, count in periods}
+
+    archived = {}
+    column_list = ", ".join(columns)
+    group_expr = ", ".join(f"'{c}', {c}" for c in policy["rollup_columns"])
+    group_cols = ", ".join(policy["rollup_columns"])
+
+    for period, _ in periods:
+        month_start, month_end = _month_bounds(period)
+        upper = min(month_end, cutoff)
+        window = (f"{ts_col} >= ? AND {ts_col} < ?", (month_start, upper))
+
+        conn.execute("ATTACH DATABASE ? AS arc", (str(archive_dir / f"{period}.db"),))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            _ensure_archive_table(conn, table, columns)
+
+            cursor = conn.execute(f"""
+                INSERT INTO arc.{table} ({column_list})
+                SELECT {column_list} FROM main.{table} WHERE {window[0]}
+            """, window[1])
+            moved = cursor.rowcount
+
+            # Archived handoffs carry their package inline; the live
+            # content-addressed store only serves live rows
+            if table == "handoff_log" and "manifest_hash" in columns:
+                inline_for_archive(conn, window[0], window[1])
+
+            conn.execute(f"""
+                INSERT INTO archive_rollups (table_name, period, group_key, row_count, first_at, last_at)
+                SELECT ?, ?, json_object({group_expr}), COUNT(*), MIN({ts_col}), MAX({ts_col})
+                FROM main.{table}
+                WHERE {window[0]}
+                GROUP BY {group_cols}
+                ON CONFLICT (table_name, period, group_key) DO UPDATE SET
+                    row_count = row_count + excluded.row_count,
+                    first_at = MIN(first_at, excluded.first_at),
+                    last_at = MAX(last_at, excluded.last_at)
+            """, (table, period) + window[1])
+
+            conn.execute(f"DELETE FROM main.{table} WHERE {window[0]}", window[1])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute("DETACH DATABASE arc")
+
+        archived[period] = moved
+
+    return archived
+
+
+def compact(conn: sqlite3.Connection, max_pages: Optional[int] = None) -> int:
+    """
+    Reclaim free pages left behind by archiving.
+
+    Databases already in incremental auto-vacuum mode release pages with
+    PRAGMA incremental_vacuum. Older databases are switched to incremental
+    mode once, which requires a single full VACUUM.
+
+    Returns:
+        Number of pages freed
+    """
+    before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if auto_vacuum != 2:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    else:
+        # execute() steps the pragma once (one page); executescript() runs it to completion
+        pages = f"({int(max_pages)})" if max_pages else ""
+        conn.executescript(f"PRAGMA incremental_vacuum{pages};")
+
+    after = conn.execute("PRAGMA page_count").fetchone()[0]
+    return before - after
+
+
+def archive_project(db_path: Path, override_days: Optional[int] = None,
+                    dry_run: bool = False) -> Dict[str, Dict[str, int]]:
+    """
+    Apply the retention policy to every execution table in a project database.
+
+    Args:
+        db_path: Path to the project's workflow.db
+        override_days: Retention window applied to all tables (ignores policy file)
+        dry_run: Only report what would be archived
+
+    Returns:
+        Dict mapping table name to {period: rows archived}
+    """
+    db_path = Path(db_path)
+    archive_dir = get_archive_dir(db_path)
+    retention = load_retention_days(override_days=override_days)
+
+    # Autocommit mode: archive_table manages its own transactions.
+    # connect() applies pending migrations, which create archive_rollups.
+    conn = connect(db_path, isolation_level=None)
+    results = {}
+
+    try:
+        if not dry_run:
+            archive_dir.mkdir(parents=True, exist_ok=True)
+
+        for table, days in retention.items():
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+            archived = archive_table(conn, archive_dir, table, cutoff, dry_run=dry_run)
+            if archived:
+                results[table] = archived
+
+        if results and not dry_run:
+            if "handoff_log" in results:
+                gc_handoff_blobs(conn)
+            compact(conn)
+    finally:
+        conn.close()
+
+    return results
+
+
+def list_partitions(db_path: Path) -> List[Path]:
+    """List archive partitions for a project database, oldest first"""
+    archive_dir = get_archive_dir(db_path)
+    if not archive_dir.exists():
+        return []
+    return sorted(archive_dir.glob("[0-9][0-9][0-9][0-9]-[0-9][0-9].db"))
+
+
+def open_with_history(db_path: Path, since: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Open a project database with its archive partitions attached.
+
+    Creates a temporary <table>_history view for every archivable table that
+    unions the live rows with the attached partitions. Partitions missing
+    columns added by later schema changes yield NULL for those columns.
+
+    Args:
+        db_path: Path to the project's workflow.db
+        since: Optional 'YYYY-MM'; only partitions from this month onward are attached
+
+    Raises:
+        ValueError: If more partitions are requested than SQLite can attach
+    """
+    conn = connect(db_path)
+    conn.row_factory = sqlite3.Row
+
+    partitions = [p for p in list_partitions(db_path) if not since or p.stem >= since]
+
+    limit = DEFAULT_ATTACH_LIMIT
+    if hasattr(conn, "getlimit"):
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    if len(partitions) > limit:
+        conn.close()
+        raise ValueError(
+            f"{len(partitions)} archive partitions exceed SQLite's attach limit of {limit}. "
+            "Pass since='YYYY-MM' to narrow the range."
+        )
+
+    aliases = []
+    for index, partition in enumerate(partitions):
+        alias = f"archive_{index}"
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(partition),))
+        aliases.append(alias)
+
+    for table in RETENTION_POLICY:
+        columns = _table_columns(conn, table)
+        if not columns:
+            continue
+
+        selects = [f"SELECT {', '.join(columns)}, 'live' AS source FROM main.{table}"]
+        for alias, partition in zip(aliases, partitions):
+            archived_columns = set(_table_columns(conn, table, alias))
+            if not archived_columns:
+                continue
+            projected = ", ".join(c if c in archived_columns else f"NULL AS {c}" for c in columns)
+            selects.append(f"SELECT {projected}, '{partition.stem}' AS source FROM {alias}.{table}")
+
+        conn.execute(f"CREATE TEMP VIEW {table}_history AS " + " UNION ALL ".join(selects))
+
+    return conn
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Handoff Store - Content-addressed storage for handoff packages
+
+delivery-coordinator handoff packages ({deliverable, docs, tests, context,
+notes}) repeat the same large context across many handoffs. Instead of an
+inline JSON blob per handoff_log row, packages are stored as:
+
+    handoff_blobs      sha256-addressed chunks with a reference count
+    manifest           a blob listing, per package field, its chunk hashes
+    handoff_log        references the manifest through manifest_hash
+
+Writing a package only stores chunks the database does not already have,
+so a handoff costs O(new bytes). Fields can be streamed chunk by chunk with
+SQLite incremental blob I/O, and gc() removes chunks nothing references.
+
+Reference counting:
+    - a manifest's refcount is the number of handoff_log rows using it
+    - a chunk's refcount is the number of manifest entries using it
+    - chunk refs are taken when a manifest is first stored and dropped
+      when its refcount returns to zero
+"""
+
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from project_migrations import connect
+
+CHUNK_SIZE = 256 * 1024
+MANIFEST_VERSION = 1
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _missing_hashes(conn: sqlite3.Connection, hashes: List[str]) -> set:
+    """Return the subset of hashes not yet stored"""
+    present = set()
+    unique = list(set(hashes))
+    for i in range(0, len(unique), 500):
+        chunk = unique[i:i + 500]
+        rows = conn.execute(
+            f"SELECT hash FROM handoff_blobs WHERE hash IN ({','.join('?' * len(chunk))})",
+            chunk
+        ).fetchall()
+        present.update(row[0] for row in rows)
+    return set(unique) - present
+
+
+def _adjust_refs(conn: sqlite3.Connection, hashes: List[str], delta: int):
+    conn.executemany(
+        "UPDATE handoff_blobs SET refcount = refcount + ? WHERE hash = ?",
+        [(delta, h) for h in hashes]
+    )
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection):
+    """
+    BEGIN IMMEDIATE ... COMMIT on an autocommit connection.
+
+    put_package() decides what to insert from what it reads, so the write
+    lock must be held before those reads; with a deferred transaction two
+    writers sharing a chunk both see it missing and the second insert fails.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def put_package(conn: sqlite3.Connection, package: Dict) -> str:
+    """
+    Store a handoff package and take one reference on its manifest.
+
+    Runs inside the caller's transaction, which must already hold the write
+    lock (BEGIN IMMEDIATE); commit is left to the caller.
+
+    Returns:
+        Manifest hash to store in handoff_log.manifest_hash
+    """
+    fields = {}
+    new_chunks = {}
+
+    for field, value in package.items():
+        data = json.dumps(value, sort_keys=True).encode()
+        hashes = []
+        for offset in range(0, len(data), CHUNK_SIZE) or [0]:
+            chunk = data[offset:offset + CHUNK_SIZE]
+            digest = _hash(chunk)
+            hashes.append(digest)
+            new_chunks[digest] = chunk
+        fields[field] = {"size": len(data), "chunks": hashes}
+
+    manifest = json.dumps({"version": MANIFEST_VERSION, "fields": fields}, sort_keys=True).encode()
+    manifest_hash = _hash(manifest)
+
+    row = conn.execute("SELECT refcount FROM handoff_blobs WHERE hash = ?", (manifest_hash,)).fetchone()
+
+    if not row or row[0] <= 0:
+        # First (or revived) use of this manifest: store only chunks we don't
+        # have yet, then take one chunk ref per manifest entry
+        all_chunks = [h for f in fields.values() for h in f["chunks"]]
+        missing = _missing_hashes(conn, all_chunks)
+        conn.executemany(
+            "INSERT INTO handoff_blobs (hash, size, refcount, data) VALUES (?, ?, 0, ?)",
+            [(h, len(new_chunks[h]), new_chunks[h]) for h in missing]
+        )
+        _adjust_refs(conn, all_chunks, 1)
+
+        if not row:
+            conn.execute(
+                "INSERT INTO handoff_blobs (hash, size, refcount, data) VALUES (?, ?, 0, ?)",
+                (manifest_hash, len(manifest), manifest)
+            )
+
+    _adjust_refs(conn, [manifest_hash], 1)
+    return manifest_hash
+
+
+def get_manifest(conn: sqlite3.Connection, manifest_hash: str) -> Dict:
+    """Load a manifest by hash"""
+    row = conn.execute("SELECT data FROM handoff_blobs WHERE hash = ?", (manifest_hash,)).fetchone()
+    if not row:
+        raise KeyError(f"Handoff manifest not found: {manifest_hash}")
+    return json.loads(row[0])
+
+
+def iter_field(conn: sqlite3.Connection, manifest_hash: str, field: str,
+               read_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Stream one package field's serialized bytes without loading the whole field.
+
+    Uses SQLite incremental blob I/O (Python 3.11+) so only read_size bytes
+    are held in memory at a time; older Pythons fall back to one chunk at a time.
+    """
+    manifest = get_manifest(conn, manifest_hash)
+    if field not in manifest["fields"]:
+        raise KeyError(f"Field '{field}' not in handoff package {manifest_hash[:12]}")
+
+    for chunk_hash in manifest["fields"][field]["chunks"]:
+        row = conn.execute("SELECT rowid FROM handoff_blobs WHERE hash = ?", (chunk_hash,)).fetchone()
+        if not row:
+            raise KeyError(f"Handoff chunk missing: {chunk_hash}")
+
+        if hasattr(conn, "blobopen"):
+            with conn.blobopen("handoff_blobs", "data", row[0], readonly=True) as blob:
+                while True:
+                    data = blob.read(read_size)
+                    if not data:
+                        break
+                    yield data
+        else:
+            yield conn.execute("SELECT data FROM handoff_blobs WHERE rowid = ?", (row[0],)).fetchone()[0]
+
+
+def copy_field(conn: sqlite3.Connection, manifest_hash: str, field: str, out: BinaryIO) -> int:
+    """Stream one package field into a binary file object; returns bytes written"""
+    written = 0
+    for data in iter_field(conn, manifest_hash, field):
+        out.write(data)
+        written += len(data)
+    return written
+
+
+def load_package(conn: sqlite3.Connection, manifest_hash: str) -> Dict:
+    """Reassemble a full handoff package"""
+    manifest = get_manifest(conn, manifest_hash)
+    return {
+        field: json.loads(b"".join(iter_field(conn, manifest_hash, field)))
+        for field in manifest["fields"]
+    }
+
+
+def release(conn: sqlite3.Connection, manifest_hash: str):
+    """
+    Drop one reference to a manifest. When the last reference goes, the
+    manifest's chunk references are dropped too; gc() reclaims the space.
+    """
+    _adjust_refs(conn, [manifest_hash], -1)
+
+    row = conn.execute("SELECT refcount FROM handoff_blobs WHERE hash = ?", (manifest_hash,)).fetchone()
+    if row and row[0] <= 0:
+        manifest = get_manifest(conn, manifest_hash)
+        _adjust_refs(conn, [h for f in manifest["fields"].values() for h in f["chunks"]], -1)
+
+
+def gc(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """
+    Delete unreferenced blobs.
+
+    Returns:
+        (blobs_deleted, bytes_freed)
+    """
+    count, size = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM handoff_blobs WHERE refcount <= 0"
+    ).fetchone()
+    conn.execute("DELETE FROM handoff_blobs WHERE refcount <= 0")
+    return count, size
+
+
+def record_handoff(db_path: Path, from_team: str, to_team: str, deliverable: str,
+                   package: Dict, status: str = "initiated", notes: Optional[str] = None) -> int:
+    """
+    Log a team handoff with its package stored content-addressed.
+
+    Returns:
+        handoff_log row id
+    """
+    conn = connect(db_path, isolation_level=None)
+    try:
+        with _write_transaction(conn):
+            manifest_hash = put_package(conn, package)
+            cursor = conn.execute("""
+                INSERT INTO handoff_log (from_team, to_team, deliverable, status, notes, manifest_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (from_team, to_team, deliverable, status, notes, manifest_hash))
+            return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def get_handoff_package(db_path: Path, handoff_id: int) -> Optional[Dict]:
+    """Return the package for a handoff, whether stored inline or content-addressed"""
+    conn = connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT handoff_package, manifest_hash FROM handoff_log WHERE id = ?", (handoff_id,)
+        ).fetchone()
+        if not row:
+            return None
+        inline, manifest_hash = row
+        if manifest_hash:
+            return load_package(conn, manifest_hash)
+        return json.loads(inline) if inline else None
+    finally:
+        conn.close()
+
+
+def inline_for_archive(conn: sqlite3.Connection, where: str, params: Tuple,
+                       archive_schema: str = "arc"):
+    """
+    Make archived handoff rows self-contained.
+
+    Called by the archiver inside its transaction after rows in the window
+    were copied to the attached partition: writes each package inline into
+    the archived row and releases the live manifest reference.
+    """
+    rows = conn.execute(f"""
+        SELECT id, manifest_hash FROM main.handoff_log
+        WHERE manifest_hash IS NOT NULL AND {where}
+    """, params).fetchall()
+
+    for handoff_id, manifest_hash in rows:
+        package = load_package(conn, manifest_hash)
+        conn.execute(
+            f"UPDATE {archive_schema}.handoff_log SET handoff_package = ?, manifest_hash = NULL WHERE id = ?",
+            (json.dumps(package), handoff_id)
+        )
+        release(conn, manifest_hash)
+
+
+def convert_inline_packages(db_path: Path, batch_size: int = 500) -> int:
+    """
+    Move existing inline handoff_package JSON into the content-addressed store.
+
+    Returns:
+        Number of handoff rows converted
+    """
+    conn = connect(db_path, isolation_level=None)
+    converted = 0
+    try:
+        while True:
+            with _write_transaction(conn):
+                rows = conn.execute("""
+                    SELECT id, handoff_package FROM handoff_log
+                    WHERE handoff_package IS NOT NULL AND manifest_hash IS NULL
+                    LIMIT ?
+                """, (batch_size,)).fetchall()
+
+                for handoff_id, inline in rows:
+                    try:
+                        package = json.loads(inline)
+                    except json.JSONDecodeError:
+                        package = {"notes": inline}
+                    if not isinstance(package, dict):
+                        package = {"deliverable": package}
+
+                    manifest_hash = put_package(conn, package)
+                    conn.execute(
+                        "UPDATE handoff_log SET handoff_package = NULL, manifest_hash = ? WHERE id = ?",
+                        (manifest_hash, handoff_id)
+                    )
+            converted += len(rows)
+            if len(rows) < batch_size:
+                break
+    finally:
+        conn.close()
+
+    return converted
+
+
+def store_stats(db_path: Path) -> Dict:
+    """Summarise blob store size and deduplication"""
+    conn = connect(db_path)
+    try:
+        blobs, stored, garbage = conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(CASE WHEN refcount <= 0 THEN size END), 0)
+            FROM handoff_blobs
+        """).fetchone()
+        handoffs = conn.execute("SELECT COUNT(*) FROM handoff_log WHERE manifest_hash IS NOT NULL").fetchone()[0]
+        inline = conn.execute("SELECT COUNT(*) FROM handoff_log WHERE manifest_hash IS NULL AND handoff_package IS NOT NULL").fetchone()[0]
+
+        # Logical size: bytes the packages would occupy if stored inline
+        logical = 0
+        for manifest_hash, refs in conn.execute("""
+            SELECT manifest_hash, COUNT(*) FROM handoff_log
+            WHERE manifest_hash IS NOT NULL GROUP BY manifest_hash
+        """).fetchall():
+            manifest = get_manifest(conn, manifest_hash)
+            logical += refs * sum(f["size"] for f in manifest["fields"].values())
+
+        return {
+            "handoffs": handoffs,
+            "inline_handoffs": inline,
+            "blobs": blobs,
+            "stored_bytes": stored,
+            "logical_bytes": logical,
+            "garbage_bytes": garbage,
+        }
+    finally:
+        conn.close()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Health Check - Parallel, cached replacement for health-check-v2.sh
+
+Runs the same checks as health-check-v2.sh (MCP servers, system resources,
+Docker, critical files, backup freshness), but:
+
+- Probes run concurrently, each with its own timeout, so a full check
+  takes as long as its slowest probe. A probe that times out becomes a
+  warning instead of hanging the run.
+- Slow probes (the MCP server list, Docker) cache their result for a TTL in
+  ~/.claude/health/probe-cache.json; --no-cache forces fresh results.
+- Backup freshness is one directory walk instead of a `stat` per file.
+- System resources are read directly (/proc/meminfo or vm_stat/sysctl,
+  statvfs) instead of through shell pipelines.
+
+Writes ~/.claude/health/status.json in the same shape as the shell script,
+plus per-probe timings under "probes". Keeps the consecutive-failure
+counter and notification hook.
+
+Usage:
+    python3 health_check.py [--no-cache] [--json] [--interval SECONDS]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+CLAUDE_HOME = Path.home() / ".claude"
+LOG_DIR = CLAUDE_HOME / "logs" / "health"
+HEALTH_DIR = CLAUDE_HOME / "health"
+STATUS_FILE = HEALTH_DIR / "status.json"
+ERROR_COUNT_FILE = HEALTH_DIR / "error_count"
+CACHE_FILE = HEALTH_DIR / "probe-cache.json"
+NOTIFY_SCRIPT = CLAUDE_HOME / "scripts" / "send-notification.sh"
+
+ALERT_THRESHOLD = 3  # Number of failures before alert
+
+MCP_CONFIG = Path.home() / ".config" / "claude" / "claude_desktop_config.json"
+EXPECTED_MCP_SERVERS = ["filesystem", "memory", "serena", "github", "playwright", "browserbase", "context7", "ide"]
+EXPECTED_MCP_CONNECTED = 7  # Adjust based on your setup
+
+CRITICAL_FILES = [
+    CLAUDE_HOME / "settings.local.json",
+    CLAUDE_HOME / "scripts" / "backup-now.sh",
+    CLAUDE_HOME / "commands" / "help.md",
+]
+
+BACKUP_DIR = CLAUDE_HOME / "backups"
+BACKUP_MAX_AGE_HOURS = 48
+
+
+def log(level: str, message: str):
+    """Append to the daily health log (same format as health-check-v2.sh)"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}"
+    with open(LOG_DIR / f"health-check-{datetime.now().strftime('%Y%m%d')}.log", "a") as f:
+        f.write(line + "\n")
+
+
+def _result() -> Dict:
+    return {"failed": [], "warnings": [], "metrics": {}}
+
+
+def _run(command: List[str], timeout: float) -> Optional[subprocess.CompletedProcess]:
+    """Run a command, or None if it is not installed"""
+    if not shutil.which(command[0]):
+        return None
+    return subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+
+
+# ============================================================================
+# PROBES
+# ============================================================================
+
+def probe_mcp_servers() -> Dict:
+    result = _result()
+
+    try:
+        listing = _run(["claude", "mcp", "list"], timeout=20)
+    except subprocess.TimeoutExpired:
+        result["warnings"].append("MCP server list timed out")
+        listing = subprocess.CompletedProcess([], 1, "", "")
+    if listing is None:
+        result["failed"].append("Claude command not available")
+        return result
+
+    if not MCP_CONFIG.exists():
+        result["failed"].append("MCP configuration missing")
+        return result
+
+    config = MCP_CONFIG.read_text(errors="replace")
+    missing = [s for s in EXPECTED_MCP_SERVERS if f'"{s}"' not in config]
+    if missing:
+        result["warnings"].append(f"MCP servers not configured: {' '.join(missing)}")
+
+    connected = (listing.stdout + listing.stderr).count("✓ Connected")
+    result["metrics"]["mcp_connected"] = connected
+    if connected < EXPECTED_MCP_CONNECTED:
+        result["warnings"].append(f"MCP servers: {connected}/{EXPECTED_MCP_CONNECTED} connected")
+    return result
+
+
+def _memory_percent() -> Optional[int]:
+    meminfo = Path("/proc/meminfo")
+    if meminfo.exists():
+        values = {}
+        for line in meminfo.read_text().splitlines():
+            key, _, rest = line.partition(":")
+            values[key] = int(rest.split()[0])
+        total = values["MemTotal"]
+        available = values.get("MemAvailable", values.get("MemFree", 0))
+        return (total - available) * 100 // total
+
+    # macOS: free pages from vm_stat, total from sysctl
+    vm_stat = _run(["vm_stat"], timeout=5)
+    memsize = _run(["sysctl", "-n", "hw.memsize"], timeout=5)
+    if not vm_stat or not memsize:
+        return None
+    free_pages = 0
+    for line in vm_stat.stdout.splitlines():
+        if line.startswith("Pages free"):
+            free_pages = int(line.split()[-1].rstrip("."))
+    total = int(memsize.stdout.strip())
+    return (total - free_pages * 4096) * 100 // total
+
+
+def probe_system_resources() -> Dict:
+    result = _result()
+
+    memory = _memory_percent()
+    usage = shutil.disk_usage(str(Path.home()))
+    disk = usage.used * 100 // usage.total
+
+    for label, percent in (("Memory usage", memory), ("Disk usage", disk)):
+        if percent is None:
+            continue
+        if percent > 90:
+            result["failed"].append(f"{label}: {percent}%")
+        elif percent > 80:
+            result["warnings"].append(f"{label}: {percent}%")
+
+    result["metrics"]["memory_usage"] = str(memory if memory is not None else 0)
+    result["metrics"]["disk_usage"] = str(disk)
+    return result
+
+
+def probe_docker() -> Dict:
+    result = _result()
+    try:
+        docker = _run(["docker", "ps", "-q"], timeout=10)
+    except subprocess.TimeoutExpired:
+        result["warnings"].append("Docker daemon not responding")
+        return result
+
+    if docker is None:
+        result["warnings"].append("Docker not installed")
+    elif docker.returncode != 0:
+        result["warnings"].append("Docker daemon not running")
+    else:
+        result["metrics"]["docker_containers"] = len(docker.stdout.split())
+    return result
+
+
+def probe_critical_files() -> Dict:
+    result = _result()
+    for path in CRITICAL_FILES:
+        if not path.is_file():
+            result["warnings"].append(f"Missing file: {path.name}")
+    return result
+
+
+def _newest_backup(root: Path) -> Optional[float]:
+    """Newest mtime of a tar.gz archive or snapshot manifest, in one walk"""
+    newest = None
+    stack = [root]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name != "chunks":
+                    stack.append(entry.path)
+            elif entry.name.endswith((".tar.gz", ".json")) and not entry.name.startswith("."):
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+                newest = mtime if newest is None else max(newest, mtime)
+    return newest
+
+
+def probe_backups() -> Dict:
+    result = _result()
+    if not BACKUP_DIR.is_dir():
+        return result
+
+    newest = _newest_backup(BACKUP_DIR)
+    if newest is None:
+        result["warnings"].append("No backups found")
+        return result
+
+    age_hours = int((time.time() - newest) // 3600)
+    result["metrics"]["backup_age_hours"] = age_hours
+    if age_hours > BACKUP_MAX_AGE_HOURS:
+        result["warnings"].append(f"Backup age: {age_hours}h")
+    return result
+
+
+# name: (probe, timeout seconds, cache TTL seconds or 0)
+PROBES: Dict[str, tuple] = {
+    "mcp_servers": (probe_mcp_servers, 25, 300),
+    "system_resources": (probe_system_resources, 10, 0),
+    "docker": (probe_docker, 15, 120),
+    "critical_files": (probe_critical_files, 5, 0),
+    "backups": (probe_backups, 10, 600),
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def _load_cache() -> Dict:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (IOError, json.JSONDecodeError):
+        return {}
+
+
+def _save_cache(cache: Dict):
+    HEALTH_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_FILE.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(cache))
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def run_checks(probes: Dict[str, tuple] = PROBES, use_cache: bool = True) -> Dict:
+    """
+    Run every probe concurrently.
+
+    Returns:
+        Status dict in the status.json shape, with per-probe timings
+    """
+    started = time.time()
+    cache = _load_cache() if use_cache else {}
+    results: Dict[str, Dict] = {}
+    timings: Dict[str, Dict] = {}
+
+    pending = {}
+    for name, (probe, timeout, ttl) in probes.items():
+        cached = cache.get(name)
+        if use_cache and ttl and cached and time.time() - cached["at"] < ttl:
+            results[name] = cached["result"]
+            timings[name] = {"seconds": 0.0, "cached": True, "age_seconds": round(time.time() - cached["at"])}
+
+    for name, (probe, timeout, ttl) in probes.items():
+        if name not in results:
+            pending[name] = (_start(name, probe), timeout, ttl)
+
+    for name, (future, timeout, ttl) in pending.items():
+        remaining = max(0.0, timeout - (time.time() - started))
+        try:
+            result, seconds, error = future.result(timeout=remaining)
+        except FutureTimeout:
+            result, seconds = _result(), timeout
+            result["warnings"].append(f"{name} check timed out after {timeout}s")
+        else:
+            if error is not None:
+                result = _result()
+                result["warnings"].append(f"{name} check error: {error}")
+            elif ttl:
+                cache[name] = {"at": time.time(), "result": result}
+        results[name] = result
+        timings[name] = {"seconds": seconds, "cached": False}
+
+    if use_cache:
+        _save_cache(cache)
+
+    failed = [item for name in probes for item in results[name]["failed"]]
+    warnings = [item for name in probes for item in results[name]["warnings"]]
+    metrics = {"memory_usage": "0", "disk_usage": "0"}
+    for name in probes:
+        metrics.update(results[name]["metrics"])
+
+    timings = {name: timings[name] for name in probes}
+    for name in probes:
+        timings[name]["status"] = ("CRITICAL" if results[name]["failed"]
+                                   else "WARNING" if results[name]["warnings"] else "OK")
+
+    return {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "status": "CRITICAL" if failed else "WARNING" if warnings else "OK",
+        "failed_checks": failed,
+        "warnings": warnings,
+        "metrics": metrics,
+        "probes": timings,
+        "duration_seconds": round(time.time() - started, 3),
+    }
+
+
+def _start(name: str, probe: Callable[[], Dict]) -> Future:
+    """
+    Run a probe in a daemon thread.
+
+    A timed-out probe is abandoned: daemon threads are not joined at exit,
+    so a hung probe can neither block the process nor pile up across
+    --interval runs in a pool. The future resolves to
+    (result, seconds, error), timed from the probe's own start.
+    """
+    future: Future = Future()
+
+    def run():
+        probe_started = time.time()
+        try:
+            outcome = (probe(), None)
+        except Exception as e:
+            outcome = (None, e)
+        future.set_result((outcome[0], round(time.time() - probe_started, 3), outcome[1]))
+
+    threading.Thread(target=run, name=f"health-probe-{name}", daemon=True).start()
+    return future
+
+
+def update_error_count(status: str) -> int:
+    """Track consecutive CRITICAL runs and notify at the alert threshold"""
+    HEALTH_DIR.mkdir(parents=True, exist_ok=True)
+    count = 0
+    if status == "CRITICAL":
+        try:
+            count = int(ERROR_COUNT_FILE.read_text().strip() or 0)
+        except (IOError, ValueError):
+            count = 0
+        count += 1
+        if count >= ALERT_THRESHOLD:
+            log("CRITICAL", f"Error threshold reached: {count} consecutive failures")
+            if os.access(NOTIFY_SCRIPT, os.X_OK):
+                subprocess.run([str(NOTIFY_SCRIPT), "CRITICAL", f"Health check failed {count} times"],
+                               timeout=30, check=False)
+    ERROR_COUNT_FILE.write_text(str(count))
+    return count
+
+
+def write_status(status: Dict):
+    HEALTH_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATUS_FILE.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(status, indent=2))
+    os.replace(tmp_path, STATUS_FILE)
+
+
+def check_once(use_cache: bool = True, as_json: bool = False) -> Dict:
+    log("INFO", "Starting health check...")
+    status = run_checks(use_cache=use_cache)
+
+    for item in status["failed_checks"]:
+        log("ERROR", item)
+    for item in status["warnings"]:
+        log("WARNING", item)
+    log("INFO" if status["status"] == "OK" else status["status"],
+        f"Health check completed: {status['status']} in {status['duration_seconds']}s")
+
+    update_error_count(status["status"])
+    write_status(status)
+
+    if as_json:
+        print(json.dumps(status, indent=2))
+    else:
+        print("=== Health Check Summary ===")
+        print(f"Status: {status['status']}")
+        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if status["failed_checks"]:
+            print("Critical Issues:")
+            for item in status["failed_checks"]:
+                print(f"  - {item}")
+        if status["warnings"]:
+            print("Warnings:")
+            for item in status["warnings"]:
+                print(f"  - {item}")
+        print("Probes:")
+        for name, timing in status["probes"].items():
+            source = "cached" if timing["cached"] else f"{timing['seconds']}s"
+            print(f"  - {name}: {timing['status']} ({source})")
+        print(f"Duration: {status['duration_seconds']}s")
+    return status
+
+
+def main():
+    """CLI entry point."""
+    args = sys.argv[1:]
+    use_cache = "--no-cache" not in args
+    as_json = "--json" in args
+    interval = None
+    if "--interval" in args:
+        interval = float(args[args.index("--interval") + 1])
+
+    if interval:
+        while True:
+            check_once(use_cache, as_json)
+            time.sleep(interval)
+
+    status = check_once(use_cache, as_json)
+    # Warnings don't fail the health check
+    sys.exit(1 if status["status"] == "CRITICAL" else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,149 +5,112 @@ Project Database Initialization Script
 Creates a fresh, isolated database for each project in the 5-phase workflow system.
 Each project gets its own SQLite database to prevent cross-project contamination.
 
+New databases are cloned from a pre-built template at the latest schema
+version (one file copy), so initialization never replays the DDL.
+
 Usage:
-    python3 init-project-database.py <project-slug>
+    python3 init-project-database.py <project-slug> [--force | --if-missing]
+    python3 init-project-database.py init-many <slug>... [--file slugs.txt] [--force | --if-missing]
 
 Example:
     python3 init-project-database.py my-awesome-project
 """
 
+import argparse
 import sqlite3
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional
+
+from project_migrations import clone_template, get_template, get_version
 
 CLAUDE_HOME = Path.home() / ".claude"
 PROJECTS_PATH = CLAUDE_HOME / "projects"
 
 
-def create_project_database(project_slug: str) -> Path:
+def validate_slug(project_slug: str) -> Optional[str]:
+    """Return an error message if the slug is invalid, else None"""
+    if not project_slug or ' ' in project_slug:
+        return "Project slug cannot contain spaces (use hyphens instead: my-awesome-project)"
+    if project_slug != project_slug.lower():
+        return "Project slug must be lowercase"
+    if '/' in project_slug or project_slug.startswith('.'):
+        return "Project slug must be a plain directory name"
+    return None
+
+
+def create_project_database(project_slug: str, force: bool = False, interactive: bool = False) -> Path:
     """
     Create a fresh project-specific database with complete schema.
 
     Args:
         project_slug: URL-friendly project identifier
+        force: Replace an existing database without asking
+        interactive: Ask before replacing an existing database (only
+            honoured when stdin is a terminal)
 
     Returns:
         Path to the created database
-    """
-    # Create project directory if it doesn't exist
-    project_dir = PROJECTS_PATH / project_slug
-    project_dir.mkdir(parents=True, exist_ok=True)
 
-    db_path = project_dir / "workflow.db"
+    Raises:
+        FileExistsError: The database exists and was not replaced
+    """
+    db_path = PROJECTS_PATH / project_slug / "workflow.db"
 
-    # Remove old database if exists (fresh start)
-    if db_path.exists():
+    # Replace an existing database only when told to (never block on input
+    # when there is no terminal to answer)
+    if db_path.exists() and not force:
+        if not (interactive and sys.stdin.isatty()):
+            raise FileExistsError(f"Database already exists: {db_path} (use --force or --if-missing)")
         print(f"⚠️  Existing database found at {db_path}")
         response = input("Delete and recreate? (yes/no): ")
         if response.lower() != "yes":
-            print("Aborted.")
-            sys.exit(1)
-        db_path.unlink()
+            raise FileExistsError(f"Kept existing database: {db_path}")
 
-    # Create new database
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    # Clone the template at the latest schema version (atomic replace)
+    return clone_template(db_path, replace=True)
 
-    # Enable foreign keys
-    cursor.execute("PRAGMA foreign_keys = ON")
-
-    # Table 1: Workflow state
-    cursor.execute("""
-        CREATE TABLE workflow (
-            id TEXT PRIMARY KEY,
-            project_name TEXT NOT NULL,
-            project_slug TEXT NOT NULL,
-            current_phase TEXT NOT NULL DEFAULT 'brief-uploaded',
-            phase_number INTEGER NOT NULL DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Table 2: Phase deliverables
-    cursor.execute("""
-        CREATE TABLE deliverables (
-            id TEXT PRIMARY KEY,
-            phase_number INTEGER NOT NULL,
-            phase_name TEXT NOT NULL,
-            document_path TEXT NOT NULL,
-            status TEXT NOT NULL DEFAULT 'draft',
-            approved_at TIMESTAMP,
-            approved_by TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Table 3: Review Board sessions
-    cursor.execute("""
-        CREATE TABLE review_board_sessions (
-            id TEXT PRIMARY KEY,
-            session_number INTEGER NOT NULL,
-            status TEXT NOT NULL DEFAULT 'in-progress',
-            overall_verdict TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP
-        )
-    """)
-
-    # Table 4: Review Board findings (C-suite reviews)
-    cursor.execute("""
-        CREATE TABLE review_board_findings (
-            id TEXT PRIMARY KEY,
-            session_id TEXT NOT NULL,
-            executive_role TEXT NOT NULL,
-            agent_name TEXT NOT NULL,
-            verdict TEXT NOT NULL,
-            report_path TEXT NOT NULL,
-            blockers_count INTEGER DEFAULT 0,
-            concerns_count INTEGER DEFAULT 0,
-            recommendations_count INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (session_id) REFERENCES review_board_sessions(id)
-        )
-    """)
-
-    # Table 5: Tasks
-    cursor.execute("""
-        CREATE TABLE tasks (
-            id TEXT PRIMARY KEY,
-            phase_number INTEGER NOT NULL,
-            description TEXT NOT NULL,
-            assigned_agent TEXT,
-            status TEXT NOT NULL DEFAULT 'pending',
-            dependencies TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP
-        )
-    """)
-
-    # Table 6: Agent assignments
-    cursor.execute("""
-        CREATE TABLE agent_assignments (
-            id TEXT PRIMARY KEY,
-            phase_number INTEGER NOT NULL,
-            agent_name TEXT NOT NULL,
-            role TEXT NOT NULL,
-            assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Indexes for performance
-    cursor.execute("CREATE INDEX idx_deliverables_phase ON deliverables(phase_number)")
-    cursor.execute("CREATE INDEX idx_deliverables_status ON deliverables(status)")
-    cursor.execute("CREATE INDEX idx_tasks_phase ON tasks(phase_number)")
-    cursor.execute("CREATE INDEX idx_tasks_status ON tasks(status)")
-    cursor.execute("CREATE INDEX idx_tasks_agent ON tasks(assigned_agent)")
-    cursor.execute("CREATE INDEX idx_review_sessions_status ON review_board_sessions(status)")
-    cursor.execute("CREATE INDEX idx_review_findings_session ON review_board_findings(session_id)")
-    cursor.execute("CREATE INDEX idx_agent_assignments_phase ON agent_assignments(phase_number)")
-
-    conn.commit()
-    conn.close()
 
-    return db_path
+def init_many(project_slugs: List[str], force: bool = False, if_missing: bool = False) -> Dict[str, int]:
+    """
+    Initialize many project databases from the template.
+
+    Returns:
+        Summary counts: {'created', 'replaced', 'existing', 'failed', 'seconds'}
+    """
+    started = time.time()
+    summary = {"created": 0, "replaced": 0, "existing": 0, "failed": 0}
+
+    # Build (or find) the template once up front
+    get_template()
+
+    total = len(project_slugs)
+    for done, project_slug in enumerate(project_slugs, 1):
+        error = validate_slug(project_slug)
+        db_path = PROJECTS_PATH / project_slug / "workflow.db"
+        existed = not error and db_path.exists()
+
+        if error:
+            summary["failed"] += 1
+            line = f"❌ {project_slug}: {error}"
+        elif existed and if_missing:
+            summary["existing"] += 1
+            line = f"✅ {project_slug}: already exists"
+        else:
+            try:
+                create_project_database(project_slug, force=force)
+                summary["replaced" if existed else "created"] += 1
+                line = f"{'♻️ ' if existed else '🆕'} {project_slug}: {'replaced' if existed else 'created'}"
+            except (FileExistsError, OSError) as e:
+                summary["failed"] += 1
+                line = f"❌ {project_slug}: {e}"
+
+        print(f"  [{done}/{total}] {line}")
+
+    summary["seconds"] = round(time.time() - started, 2)
+    return summary
 
 
 def verify_schema(db_path: Path):
@@ -185,6 +148,7 @@ def verify_schema(db_path: Path):
     indexes = [row[0] for row in cursor.fetchall()]
 
     print(f"\n📑 Indexes Created: {len(indexes)}")
+    print(f"🔢 Schema Version: v{get_version(conn)}")
 
     conn.close()
 
@@ -192,27 +156,68 @@ def verify_schema(db_path: Path):
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
-        print("Usage: init-project-database.py <project-slug>")
+        print("Usage: init-project-database.py <project-slug> [--force | --if-missing]")
+        print("       init-project-database.py init-many <slug>... [--file slugs.txt] [--force | --if-missing]")
         print("\nExample:")
         print("  python3 init-project-database.py my-awesome-project")
         sys.exit(1)
 
-    project_slug = sys.argv[1]
+    if sys.argv[1] == "init-many":
+        parser = argparse.ArgumentParser(prog="init-project-database.py init-many",
+                                         description="Initialize many project databases")
+        parser.add_argument("slugs", nargs="*", help="Project slugs")
+        parser.add_argument("--file", help="File with one project slug per line")
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument("--force", action="store_true", help="Replace existing databases")
+        mode.add_argument("--if-missing", action="store_true", help="Skip projects that already have a database")
+        args = parser.parse_args(sys.argv[2:])
+
+        slugs = list(args.slugs)
+        if args.file:
+            slugs.extend(line.strip() for line in Path(args.file).read_text().splitlines()
+                         if line.strip() and not line.startswith("#"))
+        if not slugs:
+            parser.error("no project slugs given")
+
+        print(f"\n🔧 Initializing {len(slugs)} project databases")
+        print("-" * 50)
+        summary = init_many(slugs, force=args.force, if_missing=args.if_missing)
+
+        print(f"\n📊 {summary['created']} created, {summary['replaced']} replaced, "
+              f"{summary['existing']} already existed, {summary['failed']} failed ({summary['seconds']}s)")
+        if summary["failed"]:
+            sys.exit(1)
+        return
+
+    parser = argparse.ArgumentParser(prog="init-project-database.py",
+                                     description="Initialize a project database")
+    parser.add_argument("project_slug", help="URL-friendly project identifier")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--force", action="store_true", help="Replace an existing database without asking")
+    mode.add_argument("--if-missing", action="store_true", help="Do nothing if the database already exists")
+    args = parser.parse_args()
+
+    project_slug = args.project_slug
 
     # Validate slug (no spaces, all lowercase, hyphens ok)
-    if ' ' in project_slug:
-        print("❌ Error: Project slug cannot contain spaces")
-        print("   Use hyphens instead: my-awesome-project")
+    error = validate_slug(project_slug)
+    if error:
+        print(f"❌ Error: {error}")
         sys.exit(1)
 
-    if project_slug != project_slug.lower():
-        print("❌ Error: Project slug must be lowercase")
-        sys.exit(1)
+    db_path = PROJECTS_PATH / project_slug / "workflow.db"
+    if args.if_missing and db_path.exists():
+        print(f"✅ Database already exists: {db_path}")
+        return
 
     print(f"\n🔧 Initializing project database for: {project_slug}")
     print("-" * 50)
 
-    db_path = create_project_database(project_slug)
+    try:
+        db_path = create_project_database(project_slug, force=args.force, interactive=True)
+    except FileExistsError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
     print(f"\n✅ Database created: {db_path}")
 
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Invocation Log - Append-only store for specialist invocation results
+
+Replaces one pretty-printed JSON file per call with:
+
+    ~/.claude/logs/agent-invocations/segments/YYYY-MM-DD.jsonl
+        one line per invocation, appended under an exclusive lock
+    ~/.claude/logs/agent-invocations/index.db
+        SQLite index (agent, timestamp, model, tokens, duration) pointing
+        at each record's segment and byte offset
+
+Usage questions ("how many tokens did X use this week, how slow was it")
+are answered from the index alone; the raw record is read back only when
+needed. import_legacy() folds the old per-call .json files (and per-call
+stream .jsonl logs) into the store.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CLAUDE_HOME = Path.home() / ".claude"
+LOGS_DIR = CLAUDE_HOME / "logs" / "agent-invocations"
+SEGMENTS_DIR = LOGS_DIR / "segments"
+INDEX_DB = LOGS_DIR / "index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invocations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    model TEXT,
+    input_tokens INTEGER DEFAULT 0,
+    output_tokens INTEGER DEFAULT 0,
+    duration_seconds REAL,
+    error INTEGER DEFAULT 0,
+    cache_status TEXT,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    source TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS idx_invocations_agent_time ON invocations(agent, timestamp);
+CREATE INDEX IF NOT EXISTS idx_invocations_time ON invocations(timestamp);
+CREATE INDEX IF NOT EXISTS idx_invocations_model ON invocations(model);
+"""
+
+SINCE_PATTERN = re.compile(r"^(\d+)([hdw])$")
+
+
+def _connect(index_db: Path) -> sqlite3.Connection:
+    index_db.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(index_db, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _index_row(result: Dict, segment: str, offset: int, length: int,
+               source: Optional[str] = None) -> Tuple:
+    usage = result.get("usage") or {}
+    cache = result.get("cache") or {}
+    return (
+        result.get("timestamp") or datetime.now().isoformat(),
+        result.get("agent") or "unknown",
+        result.get("model"),
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        result.get("duration_seconds"),
+        1 if "error" in result else 0,
+        cache.get("status"),
+        segment,
+        offset,
+        length,
+        source,
+    )
+
+
+INSERT_SQL = """
+    INSERT OR IGNORE INTO invocations
+    (timestamp, agent, model, input_tokens, output_tokens, duration_seconds,
+     error, cache_status, segment, offset, length, source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class InvocationLog:
+    """Daily JSONL segments plus an SQLite index"""
+
+    def __init__(self, logs_dir: Path = LOGS_DIR):
+        self.logs_dir = Path(logs_dir)
+        self.segments_dir = self.logs_dir / "segments"
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = _connect(self.logs_dir / "index.db")
+
+    def _segment_for(self, timestamp: str) -> str:
+        return f"{timestamp[:10]}.jsonl"
+
+    def _append_lines(self, segment: str, lines: List[bytes]) -> List[Tuple[int, int]]:
+        """Append lines to a segment under an exclusive lock; returns (offset, length) per line"""
+        positions = []
+        with open(self.segments_dir / segment, "ab") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                offset = f.seek(0, os.SEEK_END)
+                for line in lines:
+                    positions.append((offset, len(line)))
+                    offset += len(line)
+                f.write(b"".join(lines))
+                f.flush()
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return positions
+
+    def append(self, result: Dict) -> Path:
+        """Record one invocation result; returns the segment it was written to"""
+        result.setdefault("timestamp", datetime.now().isoformat())
+        segment = self._segment_for(result["timestamp"])
+        line = (json.dumps(result) + "\n").encode()
+        [(offset, length)] = self._append_lines(segment, [line])
+
+        with self.conn:
+            self.conn.execute(INSERT_SQL, _index_row(result, segment, offset, length))
+        return self.segments_dir / segment
+
+    def read(self, invocation_id: int) -> Optional[Dict]:
+        """Read one full record back from its segment"""
+        row = self.conn.execute(
+            "SELECT segment, offset, length FROM invocations WHERE id = ?", (invocation_id,)
+        ).fetchone()
+        if not row:
+            return None
+        with open(self.segments_dir / row[0], "rb") as f:
+            f.seek(row[1])
+            return json.loads(f.read(row[2]))
+
+    def import_results(self, results: Iterable[Tuple[str, Dict]]) -> int:
+        """
+        Append many (source, result) pairs in bulk, one segment write and one
+        transaction per day. Sources already imported are skipped.
+
+        Returns:
+            Number of records imported
+        """
+        by_segment: Dict[str, List[Tuple[str, Dict]]] = {}
+        for source, result in results:
+            result.setdefault("timestamp", datetime.now().isoformat())
+            by_segment.setdefault(self._segment_for(result["timestamp"]), []).append((source, result))
+
+        imported = 0
+        for segment, items in sorted(by_segment.items()):
+            known = set()
+            sources = [source for source, _ in items]
+            for i in range(0, len(sources), 500):
+                chunk = sources[i:i + 500]
+                known.update(row[0] for row in self.conn.execute(
+                    f"SELECT source FROM invocations WHERE source IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            items = [(source, result) for source, result in items if source not in known]
+            if not items:
+                continue
+
+            lines = [(json.dumps(result) + "\n").encode() for _, result in items]
+            positions = self._append_lines(segment, lines)
+            with self.conn:
+                self.conn.executemany(INSERT_SQL, [
+                    _index_row(result, segment, offset, length, source)
+                    for (source, result), (offset, length) in zip(items, positions)
+                ])
+            imported += len(items)
+        return imported
+
+    def close(self):
+        self.conn.close()
+
+
+# ============================================================================
+# LEGACY IMPORT
+# ============================================================================
+
+def _read_legacy_file(path: Path) -> Optional[Dict]:
+    """Parse an old per-call .json log or a per-call stream .jsonl log"""
+    try:
+        if path.suffix == ".json":
+            return json.loads(path.read_text())
+
+        # Stream log: merge the start and end events into one result
+        result: Dict = {}
+        for line in path.read_text().splitlines():
+            event = json.loads(line)
+            kind = event.pop("event", None)
+            event.pop("t", None)
+            if kind == "start":
+                result.update(agent=event.get("agent"), task=event.get("task"),
+                              model=event.get("model"), timestamp=event.get("timestamp"))
+            elif kind in ("end", "error"):
+                result.update(event)
+        result["log_file"] = str(path)
+        return result if result.get("agent") else None
+    except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+        return None
+
+
+def import_legacy(logs_dir: Path = LOGS_DIR, delete: bool = False, batch_size: int = 5000) -> Dict:
+    """
+    Import per-call log files from the top of the log directory.
+
+    Safe to re-run: each file is recorded as the record's source, so files
+    already imported are skipped. With delete=True imported files are removed.
+
+    Returns:
+        {'files', 'imported', 'skipped', 'unreadable', 'deleted'}
+    """
+    store = InvocationLog(logs_dir)
+    stats = {"files": 0, "imported": 0, "skipped": 0, "unreadable": 0, "deleted": 0}
+
+    try:
+        paths = sorted(p for p in Path(logs_dir).iterdir()
+                       if p.is_file() and p.suffix in (".json", ".jsonl"))
+        stats["files"] = len(paths)
+
+        for i in range(0, len(paths), batch_size):
+            batch = []
+            readable = []
+            for path in paths[i:i + batch_size]:
+                result = _read_legacy_file(path)
+                if result is None:
+                    stats["unreadable"] += 1
+                    continue
+                if not result.get("timestamp"):
+                    result["timestamp"] = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+                batch.append((path.name, result))
+                readable.append(path)
+
+            imported = store.import_results(batch)
+            stats["imported"] += imported
+            stats["skipped"] += len(batch) - imported
+
+            if delete:
+                for path in readable:
+                    path.unlink()
+                    stats["deleted"] += 1
+    finally:
+        store.close()
+
+    return stats
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def parse_since(since: str) -> str:
+    """Turn '24h', '7d', '2w' or an ISO date into an ISO timestamp lower bound"""
+    match = SINCE_PATTERN.match(since.strip())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"h": timedelta(hours=amount), "d": timedelta(days=amount), "w": timedelta(weeks=amount)}[unit]
+        return (datetime.now() - delta).isoformat()
+    try:
+        return datetime.fromisoformat(since).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid --since value: {since} (use e.g. 24h, 7d, 2w or YYYY-MM-DD)")
+
+
+def build_filter(agent: Optional[str] = None, since: Optional[str] = None,
+                 model: Optional[str] = None) -> Tuple[str, List]:
+    """WHERE clause and parameters for the common usage filters"""
+    clauses, params = [], []
+    if agent:
+        clauses.append("agent = ?")
+        params.append(agent)
+    if model:
+        clauses.append("model = ?")
+        params.append(model)
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(parse_since(since))
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+GROUP_COLUMNS = {"agent": "agent", "model": "model", "day": "substr(timestamp, 1, 10)"}
+
+
+def query_usage(agent: Optional[str] = None, since: Optional[str] = None,
+                model: Optional[str] = None, group_by: str = "agent",
+                logs_dir: Path = LOGS_DIR) -> List[Dict]:
+    """
+    Aggregate calls, errors, tokens and latency from the index.
+
+    Cache hits count as calls but add no tokens or latency: their records
+    repeat the usage of the call that filled the cache.
+
+    Args:
+        agent: Restrict to one agent
+        since: '24h', '7d', '2w' or an ISO date
+        model: Restrict to one model
+        group_by: 'agent', 'model' or 'day'
+    """
+    if group_by not in GROUP_COLUMNS:
+        raise ValueError(f"Invalid group: {group_by} (expected one of {', '.join(GROUP_COLUMNS)})")
+
+    where, params = build_filter(agent, since, model)
+    conn = _connect(Path(logs_dir) / "index.db")
+    try:
+        rows = conn.execute(f"""
+            SELECT grp, COUNT(*), SUM(error),
+                   SUM(CASE WHEN hit THEN 0 ELSE input_tokens END) AS input_total,
+                   SUM(CASE WHEN hit THEN 0 ELSE output_tokens END) AS output_total,
+                   AVG(CASE WHEN hit THEN NULL ELSE duration_seconds END),
+                   MAX(CASE WHEN hit THEN NULL ELSE duration_seconds END),
+                   SUM(hit)
+            FROM (
+                SELECT {GROUP_COLUMNS[group_by]} AS grp, error, input_tokens, output_tokens,
+                       duration_seconds, COALESCE(cache_status, '') = 'hit' AS hit
+                FROM invocations {where}
+            )
+            GROUP BY grp
+            ORDER BY input_total + output_total DESC
+        """, params).fetchall()
+    finally:
+        conn.close()
+
+    return [{
+        group_by: grp,
+        "calls": calls,
+        "errors": errors or 0,
+        "input_tokens": input_tokens or 0,
+        "output_tokens": output_tokens or 0,
+        "avg_seconds": round(avg, 2) if avg is not None else None,
+        "max_seconds": round(peak, 2) if peak is not None else None,
+        "cache_hits": hits or 0,
+    } for grp, calls, errors, input_tokens, output_tokens, avg, peak, hits in rows]
+
+
+def _percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def query_latency(agent: Optional[str] = None, since: Optional[str] = None,
+                  model: Optional[str] = None, logs_dir: Path = LOGS_DIR) -> List[Dict]:
+    """p50/p95 latency of successful, uncached calls per agent and model"""
+    where, params = build_filter(agent, since, model)
+    where = (where + " AND" if where else "WHERE") + \
+        " error = 0 AND duration_seconds IS NOT NULL AND COALESCE(cache_status, '') != 'hit'"
+
+    conn = _connect(Path(logs_dir) / "index.db")
+    try:
+        groups: Dict[Tuple[str, str], List[float]] = {}
+        for agent_name, model_name, duration in conn.execute(f"""
+            SELECT agent, model, duration_seconds FROM invocations {where}
+            ORDER BY agent, model, duration_seconds
+        """, params):
+            groups.setdefault((agent_name, model_name), []).append(duration)
+    finally:
+        conn.close()
+
+    rows = [{
+        "agent": agent_name,
+        "model": model_name,
+        "calls": len(durations),
+        "p50_seconds": round(_percentile(durations, 50), 2),
+        "p95_seconds": round(_percentile(durations, 95), 2),
+    } for (agent_name, model_name), durations in groups.items()]
+    return sorted(rows, key=lambda r: r["p95_seconds"], reverse=True)
+
+
+# One store per thread: SQLite connections cannot be shared across threads
+_local = threading.local()
+
+
+def get_log() -> InvocationLog:
+    """Shared store for ~/.claude/logs/agent-invocations"""
+    if getattr(_local, "log", None) is None:
+        _local.log = InvocationLog()
+    return _local.log
@@ -4,56 +4,45 @@ Specialist Agent Invoker
 Directly invoke specialist agents via Anthropic API when Task tool doesn't support them
 """
 
-import anthropic
 import argparse
 import json
 import sys
 from pathlib import Path
 from datetime import datetime
 import os
+import time
+
+from agent_registry import get_registry
+import agent_server
+
+# Accounting, context packing, the invocation log and the response cache are
+# imported where they are used, so `list` and server forwarding start fast
 
 CLAUDE_HOME = Path.home() / ".claude"
-AGENTS_DIR = CLAUDE_HOME / "agents"
 LOGS_DIR = CLAUDE_HOME / "logs" / "agent-invocations"
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 def load_agent_definition(agent_name: str) -> dict:
-    """Load agent definition from markdown file"""
-    agent_file = AGENTS_DIR / f"{agent_name}.md"
-
-    if not agent_file.exists():
-        raise FileNotFoundError(f"Agent not found: {agent_name}")
-
-    content = agent_file.read_text()
-
-    # Parse YAML frontmatter
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            frontmatter_text = parts[1]
-            agent_instructions = parts[2].strip()
-
-            # Parse YAML manually (simple approach)
-            metadata = {}
-            for line in frontmatter_text.strip().split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    metadata[key.strip()] = value.strip().strip('"')
-
-            return {
-                'name': metadata.get('name', agent_name),
-                'description': metadata.get('description', ''),
-                'tools': metadata.get('tools', ''),
-                'model': metadata.get('model', 'claude-sonnet-4'),
-                'instructions': agent_instructions
-            }
-
-    raise ValueError(f"Agent file {agent_name}.md missing YAML frontmatter")
-
-def invoke_agent(agent_name: str, task: str, api_key: str = None) -> dict:
-    """Invoke a specialist agent with a task"""
-
-    # Get API key
+    """Load agent definition (indexed frontmatter + mmap-loaded instructions)"""
+    agent = get_registry().load(agent_name)
+    agent['tools'] = ', '.join(agent['tools'])
+    agent['model'] = agent['model'] or 'claude-sonnet-4'
+    return agent
+
+# One client per API key for the life of the process (connection pool reuse)
+_clients = {}
+
+def get_client(api_key: str, base_url: str = None):
+    """Return a shared Anthropic client for this API key and endpoint"""
+    # Imported here so thin-client runs forwarded to the agent server skip the SDK import
+    import anthropic
+
+    key = (api_key, base_url)
+    if key not in _clients:
+        _clients[key] = anthropic.Anthropic(api_key=api_key, base_url=base_url)
+    return _clients[key]
+
+def resolve_api_key(api_key: str = None) -> str:
+    """Return the API key from the argument or ANTHROPIC_API_KEY"""
     if not api_key:
         api_key = os.environ.get('ANTHROPIC_API_KEY')
 
@@ -64,6 +53,152 @@ def invoke_agent(agent_name: str, task: str, api_key: str = None) -> dict:
             "  2. Pass: --api-key sk-ant-...\n"
             "  3. Use password manager: ANTHROPIC_API_KEY=$(pass show anthropic/api-key)"
         )
+    return api_key
+
+def estimate_prompt_tokens(agent_name: str, task: str) -> int:
+    """Estimate prompt tokens from the indexed instruction size plus the task"""
+    from agent_accounting import estimate_tokens
+
+    entry = get_registry().get(agent_name) or {}
+    instructions_bytes = max(0, entry.get('size', 0) - entry.get('body_offset', 0))
+    return estimate_tokens(instructions_bytes) + estimate_tokens(task)
+
+def write_invocation_log(result: dict) -> Path:
+    """Append one invocation result to the invocation log store"""
+    from invocation_log import get_log
+
+    return get_log().append(result)
+
+class StreamLog:
+    """Append-only JSONL log, flushed per event so a crash keeps what arrived"""
+
+    def __init__(self, agent_name: str):
+        (LOGS_DIR / "streams").mkdir(parents=True, exist_ok=True)
+        self.path = LOGS_DIR / "streams" / f"{agent_name}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.jsonl"
+        self._file = open(self.path, 'a')
+        self._start = time.monotonic()
+
+    def write(self, event: str, **fields):
+        record = {'event': event, 't': round(time.monotonic() - self._start, 3), **fields}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def stream_agent(client, agent: dict, agent_name: str, task: str,
+                 max_tokens: int = 4096, max_continuations: int = 2, extra: dict = None) -> dict:
+    """
+    Stream an agent's response: print tokens as they arrive, append each
+    delta to a JSONL log, and continue the response when max_tokens is hit.
+    """
+    log = StreamLog(agent_name)
+    log.write('start', agent=agent_name, task=task, model=agent['model'],
+              max_tokens=max_tokens, timestamp=datetime.now().isoformat())
+
+    messages = [{"role": "user", "content": task}]
+    text = ''
+    usage = {'input_tokens': 0, 'output_tokens': 0}
+    model = agent['model']
+    stop_reason = None
+    continuations = 0
+    first_token_at = None
+    overlap = ''
+    start = time.monotonic()
+
+    try:
+        while True:
+            with client.messages.stream(
+                model=agent['model'],
+                max_tokens=max_tokens,
+                system=agent['instructions'],
+                messages=messages
+            ) as stream:
+                for delta in stream.text_stream:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                        log.write('first_token', ttft_seconds=round(first_token_at - start, 3))
+                    if overlap:
+                        # A continuation usually re-emits the whitespace trimmed from the prefill
+                        if delta.startswith(overlap):
+                            delta = delta[len(overlap):]
+                        overlap = ''
+                        if not delta:
+                            continue
+                    text += delta
+                    log.write('delta', text=delta)
+                    print(delta, end='', flush=True)
+                message = stream.get_final_message()
+
+            model = message.model
+            stop_reason = message.stop_reason
+            usage['input_tokens'] += message.usage.input_tokens
+            usage['output_tokens'] += message.usage.output_tokens
+
+            if stop_reason != 'max_tokens' or continuations >= max_continuations:
+                break
+
+            # Continue from where the response was cut off (assistant prefill;
+            # the API rejects prefill ending in whitespace)
+            continuations += 1
+            log.write('continuation', number=continuations, output_tokens=usage['output_tokens'])
+            messages = [
+                {"role": "user", "content": task},
+                {"role": "assistant", "content": text.rstrip()}
+            ]
+            overlap = text[len(text.rstrip()):]
+
+    except BaseException as e:
+        log.write('error', error=str(e) or type(e).__name__, partial_chars=len(text))
+        log.close()
+        raise
+
+    end = time.monotonic()
+    generation_seconds = end - (first_token_at or end)
+
+    result = {
+        'agent': agent_name,
+        'task': task,
+        'response': text,
+        'model': model,
+        'usage': usage,
+        'stop_reason': stop_reason,
+        'continuations': continuations,
+        'ttft_seconds': round(first_token_at - start, 3) if first_token_at else None,
+        'tokens_per_second': round(usage['output_tokens'] / generation_seconds, 1) if generation_seconds > 0 else None,
+        'duration_seconds': round(end - start, 3),
+        'timestamp': datetime.now().isoformat(),
+        **(extra or {}),
+        'log_file': str(log.path)
+    }
+    log.write('end', **{k: v for k, v in result.items() if k not in ('agent', 'task', 'response', 'log_file')})
+    log.close()
+    return result
+
+def store_cached(cache: 'ResponseCache', cache_key: str, result: dict):
+    """Store a completed invocation in the response cache (truncated responses are not cached)"""
+    if not cache or not cache_key or result.get('stop_reason') == 'max_tokens':
+        return
+    cache.put(cache_key, {k: v for k, v in result.items()
+                          if k not in ('cache', 'log_file', 'timestamp', 'duration_seconds')})
+
+def invoke_agent(agent_name: str, task: str, api_key: str = None, stream: bool = False,
+                 max_tokens: int = 4096, max_continuations: int = 2, base_url: str = None,
+                 cache: 'ResponseCache' = None, refresh: bool = False,
+                 accounting: 'Accounting' = None, project: str = None) -> dict:
+    """
+    Invoke a specialist agent with a task (optionally streaming the response).
+
+    With a ResponseCache, an identical earlier invocation is returned from
+    disk; refresh=True skips the lookup and overwrites the stored entry.
+    With Accounting, the call is refused up front if it could exceed a daily
+    budget, and its cost is added to the agent/project/day totals.
+    """
+    from agent_accounting import BudgetExceeded
+    from response_cache import make_key
+
+    # Get API key
+    api_key = resolve_api_key(api_key)
 
     # Load agent definition
     print(f"📋 Loading agent: {agent_name}")
@@ -71,22 +206,100 @@ def invoke_agent(agent_name: str, task: str, api_key: str = None) -> dict:
     print(f"   Description: {agent['description']}")
     print(f"   Model: {agent['model']}")
 
-    # Create client
-    client = anthropic.Anthropic(api_key=api_key)
+    # Reuse client (and its connection pool) across invocations
+    client = get_client(api_key, base_url)
 
     # Build system prompt from agent instructions
     system_prompt = agent['instructions']
 
+    # Serve repeated invocations from the response cache
+    cache_key = None
+    extra = {}
+    if cache:
+        cache_key = make_key(agent['model'], system_prompt, task, max_tokens=max_tokens,
+                             max_continuations=max_continuations if stream else 0)
+        cached = None if refresh else cache.get(cache_key)
+
+        if cached:
+            result = dict(cached, timestamp=datetime.now().isoformat(), duration_seconds=0.0,
+                          cache={'status': 'hit', **cache.stats()})
+            log_file = write_invocation_log(result)
+
+            print(f"⚡ Cached response (hit rate {result['cache']['hit_rate']}%)")
+            print(f"   Log: {log_file}")
+            print(f"\n{'='*80}")
+            print(f"RESPONSE:\n{result['response']}")
+            print(f"{'='*80}\n")
+            return result
+
+        extra['cache'] = {'status': 'refresh' if refresh else 'miss', **cache.stats()}
+
+    if project:
+        extra['project'] = project
+
+    # Refuse calls that could push a daily budget over its limit
+    reservation = None
+    if accounting:
+        try:
+            estimate = accounting.check(agent_name, agent['model'], estimate_prompt_tokens(agent_name, task),
+                                        max_tokens, project)
+        except BudgetExceeded as e:
+            error_result = {
+                'agent': agent_name,
+                'task': task,
+                'model': agent['model'],
+                'error': str(e),
+                'budget_exceeded': True,
+                'timestamp': datetime.now().isoformat(),
+                **extra
+            }
+            write_invocation_log(error_result)
+            print(f"❌ {e}")
+            return error_result
+        reservation = estimate['reservation']
+        print(f"   Estimated: ~{estimate['input_tokens']} input tokens, up to ${estimate['max_cost_usd']:.4f}")
+
     # Invoke agent
     print(f"\n🚀 Invoking {agent['name']}...")
     print(f"   Task: {task[:100]}{'...' if len(task) > 100 else ''}\n")
 
+    if stream:
+        try:
+            result = stream_agent(client, agent, agent_name, task, max_tokens, max_continuations, extra)
+        except Exception as e:
+            if accounting:
+                accounting.release(reservation)
+            error_result = {
+                'agent': agent_name,
+                'task': task,
+                'model': agent['model'],
+                'error': str(e),
+                'timestamp': datetime.now().isoformat(),
+                **extra
+            }
+            write_invocation_log(error_result)
+            print(f"\n❌ Agent invocation failed: {e}")
+            return error_result
+
+        print(f"\n\n✅ Agent completed in {result['duration_seconds']:.2f}s")
+        print(f"   Time to first token: {result['ttft_seconds']}s")
+        print(f"   Output: {result['usage']['output_tokens']} tokens ({result['tokens_per_second']} tokens/s)")
+        if result['continuations']:
+            print(f"   Continued {result['continuations']} time(s) after max_tokens")
+        if accounting:
+            result['cost_usd'] = round(accounting.record(result, project, reservation), 6)
+            print(f"   Cost: ${result['cost_usd']:.4f}")
+        print(f"   Log: {result['log_file']}")
+        write_invocation_log(result)
+        store_cached(cache, cache_key, result)
+        return result
+
     start_time = datetime.now()
 
     try:
         message = client.messages.create(
             model=agent['model'],
-            max_tokens=4096,
+            max_tokens=max_tokens,
             system=system_prompt,
             messages=[
                 {"role": "user", "content": task}
@@ -101,21 +314,27 @@ def invoke_agent(agent_name: str, task: str, api_key: str = None) -> dict:
             'task': task,
             'response': message.content[0].text if message.content else '',
             'model': message.model,
+            'stop_reason': message.stop_reason,
             'usage': {
                 'input_tokens': message.usage.input_tokens,
                 'output_tokens': message.usage.output_tokens
             },
             'duration_seconds': duration,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            **extra
         }
+        if accounting:
+            result['cost_usd'] = round(accounting.record(result, project, reservation), 6)
 
         # Log the invocation
-        log_file = LOGS_DIR / f"{agent_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        log_file.write_text(json.dumps(result, indent=2))
+        log_file = write_invocation_log(result)
+        store_cached(cache, cache_key, result)
 
         print(f"✅ Agent completed in {duration:.2f}s")
         print(f"   Input tokens: {result['usage']['input_tokens']}")
         print(f"   Output tokens: {result['usage']['output_tokens']}")
+        if 'cost_usd' in result:
+            print(f"   Cost: ${result['cost_usd']:.4f}")
         print(f"   Log: {log_file}")
         print(f"\n{'='*80}")
         print(f"RESPONSE:\n{result['response']}")
@@ -124,21 +343,160 @@ def invoke_agent(agent_name: str, task: str, api_key: str = None) -> dict:
         return result
 
     except Exception as e:
+        if accounting:
+            accounting.release(reservation)
         error_result = {
             'agent': agent_name,
             'task': task,
+            'model': agent['model'],
             'error': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            **extra
         }
 
-        log_file = LOGS_DIR / f"{agent_name}-ERROR-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        log_file.write_text(json.dumps(error_result, indent=2))
+        log_file = write_invocation_log(error_result)
 
         print(f"❌ Agent invocation failed: {e}")
         print(f"   Error log: {log_file}")
 
         return error_result
 
+def invoke_batch(input_path: str, output_path: str = None, api_key: str = None,
+                 concurrency: int = 8, rate: float = None, base_url: str = None,
+                 max_tokens: int = 4096, accounting: 'Accounting' = None, project: str = None) -> dict:
+    """Invoke many {agent, task} pairs from a JSONL file concurrently, streaming results as JSONL"""
+    import asyncio
+    from agent_accounting import BudgetExceeded
+    from agent_batch import load_requests, run_batch
+
+    api_key = resolve_api_key(api_key)
+
+    with open(input_path) as f:
+        requests = load_requests(f)
+
+    out = open(output_path, 'w') if output_path else sys.stdout
+
+    # Budget reservations of admitted requests, by request object
+    reservations = {}
+
+    def project_for(request: dict):
+        return request.get('project', project)
+
+    def admit(request, agent):
+        try:
+            estimate = accounting.check(request['agent'], agent['model'],
+                                        estimate_prompt_tokens(request['agent'], request['task']),
+                                        max_tokens, project_for(request))
+        except BudgetExceeded as e:
+            return str(e)
+        reservations[id(request)] = estimate['reservation']
+        return None
+
+    def on_result(result):
+        request = requests[result['index']]
+        request_project = project_for(request)
+        if request_project:
+            result['project'] = request_project
+        if accounting:
+            reservation = reservations.pop(id(request), None)
+            if 'error' in result:
+                accounting.release(reservation)
+            else:
+                result['cost_usd'] = round(accounting.record(result, request_project, reservation), 6)
+        write_invocation_log(result)
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        status = "❌" if 'error' in result else "✅"
+        print(f"  {status} [{result['index']}] {result['agent']}", file=sys.stderr)
+
+    print(f"🚀 Invoking {len(requests)} task(s), concurrency {concurrency}"
+          f"{f', {rate}/s' if rate else ''}", file=sys.stderr)
+
+    try:
+        summary = asyncio.run(run_batch(
+            requests, load_agent_definition, on_result, api_key,
+            concurrency=concurrency, rate=rate, base_url=base_url, max_tokens=max_tokens,
+            admit=admit if accounting else None
+        ))
+    finally:
+        if output_path:
+            out.close()
+
+    print(f"\n📊 {summary['succeeded']} succeeded, {summary['failed']} failed "
+          f"in {summary['duration_seconds']:.2f}s", file=sys.stderr)
+    return summary
+
+def show_usage(agent: str = None, since: str = None, model: str = None,
+               group_by: str = 'agent', as_json: bool = False):
+    """Summarise invocation usage from the log index"""
+    from invocation_log import query_usage
+
+    rows = query_usage(agent=agent, since=since, model=model, group_by=group_by)
+
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    scope = ', '.join(f for f in [f"agent {agent}" if agent else '', f"model {model}" if model else '',
+                                  f"since {since}" if since else ''] if f) or 'all time'
+    print(f"📊 Invocation usage ({scope}):\n")
+    if not rows:
+        print("   No invocations recorded")
+        return
+
+    print(f"   {group_by.upper():<30} {'CALLS':>6} {'ERR':>4} {'IN TOK':>10} {'OUT TOK':>10} {'AVG s':>7} {'MAX s':>7}")
+    for row in rows:
+        print(f"   {str(row[group_by]):<30} {row['calls']:>6} {row['errors']:>4} "
+              f"{row['input_tokens']:>10} {row['output_tokens']:>10} "
+              f"{row['avg_seconds'] if row['avg_seconds'] is not None else '-':>7} "
+              f"{row['max_seconds'] if row['max_seconds'] is not None else '-':>7}")
+
+def show_costs(group_by: str = 'agent', since: str = None, as_json: bool = False):
+    """Token and cost totals per agent, project or day, against configured budgets"""
+    from agent_accounting import Accounting
+    from invocation_log import parse_since
+
+    accounting = Accounting()
+    scope = {'agent': 'agent', 'project': 'project', 'day': 'total'}[group_by]
+    since_day = parse_since(since)[:10] if since else None
+    rows = accounting.report(scope, since_day)
+    accounting.close()
+
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"💰 Costs by {group_by}{f' since {since}' if since else ''}:\n")
+    if not rows:
+        print("   No usage recorded")
+        return
+
+    print(f"   {group_by.upper():<30} {'CALLS':>6} {'IN TOK':>10} {'OUT TOK':>10} {'COST $':>9} {'BUDGET $/DAY':>13}")
+    for row in rows:
+        budget = f"{row['daily_budget_usd']:.2f}" if row['daily_budget_usd'] is not None else '-'
+        print(f"   {row['name']:<30} {row['calls']:>6} {row['input_tokens']:>10} "
+              f"{row['output_tokens']:>10} {row['cost_usd']:>9.4f} {budget:>13}")
+
+def show_latency(agent: str = None, since: str = None, model: str = None, as_json: bool = False):
+    """p50/p95 latency per agent and model"""
+    from invocation_log import query_latency
+
+    rows = query_latency(agent=agent, since=since, model=model)
+
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"⏱️  Latency per agent and model{f' since {since}' if since else ''}:\n")
+    if not rows:
+        print("   No completed invocations recorded")
+        return
+
+    print(f"   {'AGENT':<30} {'MODEL':<28} {'CALLS':>6} {'P50 s':>7} {'P95 s':>7}")
+    for row in rows:
+        print(f"   {row['agent']:<30} {str(row['model']):<28} {row['calls']:>6} "
+              f"{row['p50_seconds']:>7} {row['p95_seconds']:>7}")
+
 def list_agents():
     """List all available specialist agents"""
     print("📋 Available Specialist Agents:\n")
@@ -155,20 +513,114 @@ def list_agents():
         'C-Suite': ['CIO', 'CTO', 'COO']
     }
 
+    installed = get_registry().agents()
+
     for category, agents in categories.items():
         print(f"{category}:")
         for agent in agents:
-            agent_file = AGENTS_DIR / f"{agent}.md"
-            exists = "✅" if agent_file.exists() else "❌"
+            exists = "✅" if agent in installed else "❌"
             print(f"  {exists} {agent}")
         print()
 
+    known = {agent for agents in categories.values() for agent in agents}
+    other = sorted(set(installed) - known)
+    if other:
+        print("Other:")
+        for agent in other:
+            print(f"  ✅ {agent}")
+        print()
+
+def run_invoke(args) -> int:
+    """Run the invoke command in this process; returns the exit code"""
+    from agent_accounting import Accounting
+    from response_cache import ResponseCache
+
+    task = args.task
+    if args.context or args.context_project:
+        from context_packer import DEFAULT_BUDGET, build_prompt, collect_project_sources, pack_context
+
+        sources = collect_project_sources(args.context_project) if args.context_project else []
+        sources.extend({'path': path, 'kind': 'other', 'priority': 3.5} for path in args.context)
+        context, report = pack_context(sources, args.task, args.context_budget or DEFAULT_BUDGET)
+        print(f"📦 Packed context: ~{report['tokens']}/{report['budget_tokens']} tokens, "
+              f"{report['passages']} passages from {report['files']} file(s), "
+              f"{report['duplicates']} duplicate(s) removed, {report['dropped']} dropped")
+        for path in report['missing']:
+            print(f"   ⚠️  Not found: {path}")
+        task = build_prompt(args.task, context)
+
+    use_cache = (args.cache or args.refresh) and not args.no_cache
+    cache = ResponseCache() if use_cache else None
+
+    try:
+        result = invoke_agent(args.agent, task, args.api_key, stream=args.stream,
+                              max_tokens=args.max_tokens, max_continuations=args.max_continuations,
+                              base_url=args.base_url, cache=cache, refresh=args.refresh,
+                              accounting=Accounting(), project=args.project)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    finally:
+        if cache:
+            cache.close()
+
+    return 1 if 'error' in result else 0
+
+def serve(args):
+    """Run the warm agent server until stopped"""
+    defaults = {'api_key': args.api_key, 'base_url': args.base_url}
+
+    def handle(request_args: dict) -> int:
+        request_args = dict(request_args)
+        for key, value in defaults.items():
+            if not request_args.get(key):
+                request_args[key] = value
+        return run_invoke(argparse.Namespace(**request_args))
+
+    # Warm up: SDK import, client, connection pool and agent index
+    get_registry().index()
+    api_key = args.api_key or os.environ.get('ANTHROPIC_API_KEY')
+    if api_key:
+        get_client(api_key, args.base_url)
+
+    agent_server.serve(handle, args.socket)
+
 def main():
     parser = argparse.ArgumentParser(description='Invoke Claude specialist agents')
-    parser.add_argument('command', choices=['list', 'invoke'], help='Command to execute')
+    parser.add_argument('command', choices=['list', 'invoke', 'invoke-batch', 'usage', 'costs', 'latency',
+                                            'import-logs', 'serve', 'server-status', 'server-stop'],
+                        help='Command to execute')
     parser.add_argument('--agent', help='Agent name to invoke')
     parser.add_argument('--task', help='Task for the agent')
     parser.add_argument('--api-key', help='Anthropic API key (or use ANTHROPIC_API_KEY env var)')
+    parser.add_argument('--input', help='invoke-batch: JSONL file of {"agent", "task"} requests')
+    parser.add_argument('--output', help='invoke-batch: JSONL results file (default: stdout)')
+    parser.add_argument('--concurrency', type=int, default=8, help='invoke-batch: max requests in flight')
+    parser.add_argument('--rate', type=float, help='invoke-batch: max requests started per second')
+    parser.add_argument('--base-url', help='API endpoint override (e.g. local mock server)')
+    parser.add_argument('--since', help='usage: time window, e.g. 24h, 7d, 2w or YYYY-MM-DD')
+    parser.add_argument('--model', help='usage: restrict to one model')
+    parser.add_argument('--by', choices=['agent', 'model', 'project', 'day'], default='agent',
+                        help='usage: agent|model|day, costs: agent|project|day')
+    parser.add_argument('--project', help='Project to charge invocations to (budgets, costs)')
+    parser.add_argument('--json', action='store_true', help='usage: print JSON')
+    parser.add_argument('--delete', action='store_true', help='import-logs: remove per-call files once imported')
+    parser.add_argument('--context', action='append', default=[],
+                        help='invoke: file to pack into the prompt as context (repeatable)')
+    parser.add_argument('--context-project', help="invoke: pack a project's phase docs, decisions and research")
+    parser.add_argument('--context-budget', type=int,
+                        help='invoke: token budget for packed context (default 8000)')
+    parser.add_argument('--stream', action='store_true', help='invoke: print tokens as they arrive, log incrementally')
+    parser.add_argument('--max-tokens', type=int, default=4096, help='Output token limit per request')
+    parser.add_argument('--cache', action='store_true',
+                        help='invoke: reuse stored responses for identical invocations (or AGENT_RESPONSE_CACHE=1)')
+    parser.add_argument('--no-cache', action='store_true', help='invoke: bypass the response cache')
+    parser.add_argument('--refresh', action='store_true', help='invoke: call the API and overwrite the cached response')
+    parser.add_argument('--socket', type=Path, default=agent_server.SOCKET_PATH,
+                        help='serve/invoke: agent server socket path')
+    parser.add_argument('--no-server', action='store_true', help='invoke: run in-process even if a server is running')
+    parser.add_argument('--max-continuations', type=int, default=2,
+                        help='invoke --stream: times to continue a response cut off at max_tokens')
 
     args = parser.parse_args()
 
@@ -184,9 +636,76 @@ def main():
             print("❌ Error: --task required for invoke command")
             sys.exit(1)
 
-        result = invoke_agent(args.agent, args.task, args.api_key)
+        # Resolved here so a forwarded invocation follows the caller's
+        # environment, not the server's
+        args.cache = args.cache or os.environ.get('AGENT_RESPONSE_CACHE') == '1'
+
+        if not args.no_server:
+            # Thin client: forward to a warm agent server when one is running
+            forwarded = dict(vars(args), api_key=args.api_key or os.environ.get('ANTHROPIC_API_KEY'),
+                             context=[str(Path(path).resolve()) for path in args.context],
+                             socket=str(args.socket))
+            done = agent_server.request({'op': 'invoke', 'args': forwarded}, args.socket,
+                                        on_output=lambda text: (sys.stdout.write(text), sys.stdout.flush()))
+            if done is not None:
+                sys.exit(done.get('exit_code', 1))
+
+        sys.exit(run_invoke(args))
+
+    elif args.command == 'serve':
+        serve(args)
+
+    elif args.command == 'server-status':
+        status = agent_server.ping(args.socket)
+        if not status:
+            print(f"⚪ No agent server at {args.socket}")
+            sys.exit(1)
+        print(f"🟢 Agent server running (pid {status['pid']}, up {status['uptime_seconds']}s, "
+              f"{status['requests']} requests, {status['active']} active)")
+
+    elif args.command == 'server-stop':
+        if agent_server.stop(args.socket):
+            print("🔴 Agent server stopping")
+        else:
+            print(f"⚪ No agent server at {args.socket}")
+
+    elif args.command == 'usage':
+        if args.by == 'project':
+            print("❌ Error: usage groups by agent, model or day (use 'costs --by project')")
+            sys.exit(1)
+        show_usage(args.agent, args.since, args.model, args.by, args.json)
+
+    elif args.command == 'costs':
+        if args.by == 'model':
+            print("❌ Error: costs groups by agent, project or day")
+            sys.exit(1)
+        show_costs(args.by, args.since, args.json)
+
+    elif args.command == 'latency':
+        show_latency(args.agent, args.since, args.model, args.json)
+
+    elif args.command == 'import-logs':
+        from invocation_log import import_legacy
+
+        print(f"📥 Importing per-call logs from {LOGS_DIR}...")
+        stats = import_legacy(LOGS_DIR, delete=args.delete)
+        print(f"   Files: {stats['files']}, imported: {stats['imported']}, "
+              f"already imported: {stats['skipped']}, unreadable: {stats['unreadable']}")
+        if args.delete:
+            print(f"   Deleted: {stats['deleted']}")
+
+    elif args.command == 'invoke-batch':
+        if not args.input:
+            print("❌ Error: --input required for invoke-batch command")
+            sys.exit(1)
+
+        from agent_accounting import Accounting
+
+        summary = invoke_batch(args.input, args.output, args.api_key,
+                               args.concurrency, args.rate, args.base_url, args.max_tokens,
+                               accounting=Accounting(), project=args.project)
 
-        if 'error' in result:
+        if summary['failed']:
             sys.exit(1)
 
 if __name__ == '__main__':
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Portfolio Telemetry - Cross-project execution metrics
+
+Every project keeps its execution tables in its own
+~/.claude/projects/<name>/workflow.db. This module discovers those
+databases, collects per-project metrics in parallel (read-only, batched
+across a process pool) and merges them into one portfolio report:
+team utilization and queue depth, active blockers, pending handoffs per
+receiving team, and quality gate pass rates per gate level.
+
+Per-database results are cached in ~/.claude/data/portfolio-cache.json,
+keyed by the size and mtime of the database and its WAL file. A database
+only changes on disk when one of those changes, so unchanged projects are
+never reopened. (PRAGMA data_version is only comparable within a single
+connection, so it cannot serve as a cross-process cache key.)
+"""
+
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from project_migrations import find_project_databases
+
+CLAUDE_HOME = Path.home() / ".claude"
+CACHE_PATH = CLAUDE_HOME / "data" / "portfolio-cache.json"
+
+# Databases per process-pool task: amortises IPC for small databases
+BATCH_SIZE = 16
+
+# Utilization above which a team counts as a bottleneck
+BOTTLENECK_UTILIZATION = 85
+
+
+def _file_signature(db_path: Path) -> List[int]:
+    """Change signature of a database: size + mtime of the main file and WAL"""
+    signature = []
+    for path in (db_path, Path(f"{db_path}-wal")):
+        try:
+            st = path.stat()
+            signature.extend([st.st_size, st.st_mtime_ns])
+        except FileNotFoundError:
+            signature.extend([0, 0])
+    return signature
+
+
+def _query(conn: sqlite3.Connection, sql: str) -> List[tuple]:
+    """Run a query, treating missing tables (older schemas) as empty"""
+    try:
+        return conn.execute(sql).fetchall()
+    except sqlite3.OperationalError:
+        return []
+
+
+def collect_project_metrics(db_path: str) -> Dict:
+    """Collect execution metrics from one project database (read-only)"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
+    try:
+        teams = {
+            name: {"active": active or 0, "queued": queued or 0, "capacity": capacity or 0}
+            for name, active, queued, capacity in _query(conn, """
+                SELECT team_name, active_tasks, queued_tasks, capacity FROM team_status
+            """)
+        }
+
+        blockers = {
+            blocker_type: {"active": active, "critical_path": critical or 0}
+            for blocker_type, active, critical in _query(conn, """
+                SELECT blocker_type, COUNT(*), SUM(on_critical_path)
+                FROM blockers WHERE status IN ('active', 'escalated')
+                GROUP BY blocker_type
+            """)
+        }
+
+        pending_handoffs = {
+            to_team: count
+            for to_team, count in _query(conn, """
+                SELECT to_team, COUNT(*) FROM handoff_log
+                WHERE status IN ('initiated', 'confirmed')
+                GROUP BY to_team
+            """)
+        }
+
+        gates = {
+            level: {"total": total, "passed": passed or 0}
+            for level, total, passed in _query(conn, """
+                SELECT gate_level, COUNT(*), SUM(gate_status = 'passed')
+                FROM quality_gates GROUP BY gate_level
+            """)
+        }
+
+        return {
+            "teams": teams,
+            "blockers": blockers,
+            "pending_handoffs": pending_handoffs,
+            "gates": gates,
+        }
+    finally:
+        conn.close()
+
+
+def _collect_batch(db_paths: List[str]) -> Dict[str, Dict]:
+    """Process-pool worker: collect metrics for a batch of databases"""
+    results = {}
+    for db_path in db_paths:
+        try:
+            results[db_path] = collect_project_metrics(db_path)
+        except sqlite3.Error as e:
+            results[db_path] = {"error": str(e)}
+    return results
+
+
+def _load_cache(cache_path: Path) -> Dict:
+    if cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text())
+        except (json.JSONDecodeError, IOError):
+            return {}
+    return {}
+
+
+def _save_cache(cache_path: Path, cache: Dict):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(cache))
+    os.replace(tmp_path, cache_path)
+
+
+def merge_metrics(per_project: Dict[str, Dict]) -> Dict:
+    """Merge per-project metrics into portfolio totals"""
+    teams: Dict[str, Dict] = {}
+    blockers = {"active": 0, "critical_path": 0, "by_type": {}, "by_project": {}}
+    gates: Dict[str, Dict] = {}
+    errors = {}
+
+    for project, metrics in per_project.items():
+        if "error" in metrics:
+            errors[project] = metrics["error"]
+            continue
+
+        for name, team in metrics["teams"].items():
+            total = teams.setdefault(name, {"active": 0, "queued": 0, "capacity": 0,
+                                            "pending_handoffs": 0, "projects": 0})
+            total["active"] += team["active"]
+            total["queued"] += team["queued"]
+            total["capacity"] += team["capacity"]
+            total["projects"] += 1
+
+        for to_team, count in metrics["pending_handoffs"].items():
+            total = teams.setdefault(to_team, {"active": 0, "queued": 0, "capacity": 0,
+                                               "pending_handoffs": 0, "projects": 0})
+            total["pending_handoffs"] += count
+
+        project_blockers = 0
+        for blocker_type, counts in metrics["blockers"].items():
+            blockers["active"] += counts["active"]
+            blockers["critical_path"] += counts["critical_path"]
+            blockers["by_type"][blocker_type] = blockers["by_type"].get(blocker_type, 0) + counts["active"]
+            project_blockers += counts["active"]
+        if project_blockers:
+            blockers["by_project"][project] = project_blockers
+
+        for level, counts in metrics["gates"].items():
+            total = gates.setdefault(level, {"total": 0, "passed": 0})
+            total["total"] += counts["total"]
+            total["passed"] += counts["passed"]
+
+    for team in teams.values():
+        team["utilization_percent"] = round(100.0 * team["active"] / team["capacity"], 1) if team["capacity"] else 0.0
+    for counts in gates.values():
+        counts["pass_rate"] = round(100.0 * counts["passed"] / counts["total"], 1) if counts["total"] else None
+
+    # Bottleneck: saturated teams first, then by work waiting on them
+    bottlenecks = sorted(
+        (name for name, t in teams.items()
+         if t["utilization_percent"] >= BOTTLENECK_UTILIZATION or t["queued"] or t["pending_handoffs"]),
+        key=lambda name: (teams[name]["utilization_percent"],
+                          teams[name]["queued"] + teams[name]["pending_handoffs"]),
+        reverse=True
+    )
+
+    return {
+        "projects": len(per_project) - len(errors),
+        "teams": teams,
+        "bottlenecks": bottlenecks,
+        "blockers": blockers,
+        "gates": gates,
+        "errors": errors,
+    }
+
+
+def build_portfolio_report(db_paths: Optional[List[Path]] = None, workers: Optional[int] = None,
+                           cache_path: Path = CACHE_PATH, use_cache: bool = True) -> Dict:
+    """
+    Build the portfolio report across all project databases.
+
+    Args:
+        db_paths: Databases to include (defaults to every project workflow.db)
+        workers: Process count for uncached databases (defaults to CPU count)
+        cache_path: Per-database result cache
+        use_cache: Set False to re-read every database
+
+    Returns:
+        Merged report plus 'stats' (databases scanned, cache hits, seconds)
+    """
+    started = time.time()
+    if db_paths is None:
+        db_paths = find_project_databases()
+
+    cache = _load_cache(cache_path) if use_cache else {}
+    per_db: Dict[str, Dict] = {}
+    signatures = {}
+    stale = []
+
+    for db_path in db_paths:
+        key = str(db_path)
+        signatures[key] = _file_signature(Path(db_path))
+        entry = cache.get(key)
+        if entry and entry.get("signature") == signatures[key]:
+            per_db[key] = entry["metrics"]
+        else:
+            stale.append(key)
+
+    if stale:
+        batches = [stale[i:i + BATCH_SIZE] for i in range(0, len(stale), BATCH_SIZE)]
+        if len(batches) == 1:
+            fresh = _collect_batch(batches[0])
+        else:
+            fresh = {}
+            max_workers = min(workers or os.cpu_count() or 1, len(batches))
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                for result in pool.map(_collect_batch, batches):
+                    fresh.update(result)
+
+        per_db.update(fresh)
+
+    # Rewrite the cache with current databases only (drops deleted projects)
+    _save_cache(cache_path, {
+        key: {"signature": signatures[key], "metrics": per_db[key]}
+        for key in signatures if "error" not in per_db[key]
+    })
+
+    report = merge_metrics({Path(key).parent.name: metrics for key, metrics in per_db.items()})
+    report["stats"] = {
+        "databases": len(db_paths),
+        "cache_hits": len(db_paths) - len(stale),
+        "seconds": round(time.time() - started, 3),
+    }
+    return report
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Project Database Migrations
+
+Forward-only, numbered schema migrations for the per-project workflow.db.
+The applied version is tracked in PRAGMA user_version; every migration runs
+in its own transaction and bumps user_version as its last statement, so a
+database is always at exactly one known version.
+
+Migrations are applied lazily: connect() brings a database up to date the
+first time it is opened in a process. migrate_all() upgrades every project
+database under ~/.claude/projects in parallel with a progress report.
+
+Rules for adding a migration:
+    - Append to MIGRATIONS with the next version number; never edit or
+      reorder a migration that has shipped.
+    - Use IF NOT EXISTS / INSERT OR IGNORE where the object may predate
+      user_version tracking (databases created by older scripts). SQLite
+      has no ADD COLUMN IF NOT EXISTS; use add_column() instead.
+
+New databases are cloned from a template (see clone_template()) built once
+per schema version, instead of replaying every migration.
+
+Usage:
+    python3 project_migrations.py status
+    python3 project_migrations.py migrate <project-name>
+    python3 project_migrations.py migrate-all [--workers N]
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+CLAUDE_HOME = Path.home() / ".claude"
+PROJECTS_PATH = CLAUDE_HOME / "projects"
+TEMPLATES_PATH = CLAUDE_HOME / "data" / "templates"
+
+
+def add_column(table: str, column: str, definition: str) -> Callable[[sqlite3.Connection], None]:
+    """Migration step that adds a column unless the table already has it"""
+    def step(conn: sqlite3.Connection):
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+Step = Union[str, Callable[[sqlite3.Connection], None]]
+
+
+def run_step(conn: sqlite3.Connection, step: Step):
+    """Apply one migration step: an SQL statement or a function of the connection"""
+    if callable(step):
+        step(conn)
+    else:
+        conn.execute(step)
+
+
+# (version, description, steps)
+MIGRATIONS: List[Tuple[int, str, List[Step]]] = [
+    (1, "Project workflow schema", [
+        """
+        CREATE TABLE IF NOT EXISTS workflow (
+            id TEXT PRIMARY KEY,
+            project_name TEXT NOT NULL,
+            project_slug TEXT NOT NULL,
+            current_phase TEXT NOT NULL DEFAULT 'brief-uploaded',
+            phase_number INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS deliverables (
+            id TEXT PRIMARY KEY,
+            phase_number INTEGER NOT NULL,
+            phase_name TEXT NOT NULL,
+            document_path TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'draft',
+            approved_at TIMESTAMP,
+            approved_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS review_board_sessions (
+            id TEXT PRIMARY KEY,
+            session_number INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'in-progress',
+            overall_verdict TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS review_board_findings (
+            id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            executive_role TEXT NOT NULL,
+            agent_name TEXT NOT NULL,
+            verdict TEXT NOT NULL,
+            report_path TEXT NOT NULL,
+            blockers_count INTEGER DEFAULT 0,
+            concerns_count INTEGER DEFAULT 0,
+            recommendations_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES review_board_sessions(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            phase_number INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            assigned_agent TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            dependencies TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agent_assignments (
+            id TEXT PRIMARY KEY,
+            phase_number INTEGER NOT NULL,
+            agent_name TEXT NOT NULL,
+            role TEXT NOT NULL,
+            assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_deliverables_phase ON deliverables(phase_number)",
+        "CREATE INDEX IF NOT EXISTS idx_deliverables_status ON deliverables(status)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_phase ON tasks(phase_number)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_agent ON tasks(assigned_agent)",
+        "CREATE INDEX IF NOT EXISTS idx_review_sessions_status ON review_board_sessions(status)",
+        "CREATE INDEX IF NOT EXISTS idx_review_findings_session ON review_board_findings(session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_agent_assignments_phase ON agent_assignments(phase_number)",
+    ]),
+
+    (2, "Phase 4 execution communication schema", [
+        """
+        CREATE TABLE IF NOT EXISTS agent_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            from_agent TEXT NOT NULL,
+            to_agent TEXT NOT NULL,
+            message_type TEXT NOT NULL,  -- 'task_assignment', 'status_update', 'handoff_notification', 'blocker_alert', 'clarification'
+            content TEXT NOT NULL,
+            task_id TEXT,
+            priority TEXT,  -- 'P0', 'P1', 'P2'
+            acknowledged BOOLEAN DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS handoff_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            from_team TEXT NOT NULL,
+            to_team TEXT NOT NULL,
+            deliverable TEXT NOT NULL,
+            handoff_package TEXT,  -- JSON: {deliverable, docs, tests, context, notes}
+            status TEXT NOT NULL,  -- 'initiated', 'confirmed', 'complete', 'rejected'
+            confirmed_by TEXT,
+            confirmed_at DATETIME,
+            notes TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS quality_gates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            gate_level TEXT NOT NULL,  -- 'task', 'feature', 'epic', 'phase'
+            item_id TEXT NOT NULL,
+            item_name TEXT NOT NULL,
+            gate_status TEXT NOT NULL,  -- 'passed', 'failed'
+            checks_run TEXT,  -- JSON: list of checks performed
+            failed_checks TEXT,  -- JSON: list of failed checks (if failed)
+            enforced_by TEXT DEFAULT 'quality-enforcer'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sop_compliance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            sop_name TEXT NOT NULL,  -- 'task_completion', 'team_handoff', 'quality_gate_enforcement', 'blocker_escalation', 'daily_sync'
+            item_id TEXT NOT NULL,
+            compliance_status TEXT NOT NULL,  -- 'compliant', 'violation', 'warning'
+            violations TEXT,  -- JSON: list of violations (if non-compliant)
+            agent TEXT,
+            notes TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS blockers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            blocker_id TEXT UNIQUE NOT NULL,
+            blocker_type TEXT NOT NULL,  -- 'technical', 'information', 'resource', 'team_dependency'
+            blocker_subtype TEXT,
+            task_id TEXT,
+            description TEXT NOT NULL,
+            current_level TEXT NOT NULL,  -- 'L1', 'L2', 'L3', 'L4', 'L5'
+            status TEXT NOT NULL,  -- 'active', 'resolved', 'escalated'
+            on_critical_path BOOLEAN DEFAULT 0,
+            resolution TEXT,
+            resolved_at DATETIME
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS blocker_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            blocker_type TEXT NOT NULL,
+            blocker_subtype TEXT,
+            blocker_signature TEXT NOT NULL,  -- Unique pattern identifier
+            solution TEXT NOT NULL,
+            solution_steps TEXT,
+            resolution_level TEXT,  -- 'L1', 'L2', 'L3', 'L4'
+            specialist_used TEXT,
+            success_rate REAL DEFAULT 1.0,
+            usage_count INTEGER DEFAULT 1,
+            last_used DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS team_status (
+            team_name TEXT PRIMARY KEY,
+            active_tasks INTEGER DEFAULT 0,
+            queued_tasks INTEGER DEFAULT 0,
+            capacity INTEGER DEFAULT 3,
+            utilization_percent REAL DEFAULT 0,
+            current_epic TEXT,
+            blockers TEXT,  -- JSON: list of active blockers
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS review_deployments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            reviewer_agent TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            item_type TEXT NOT NULL,  -- 'task', 'feature', 'epic'
+            review_status TEXT NOT NULL,  -- 'requested', 'in_progress', 'complete'
+            review_result TEXT,  -- 'approved', 'changes_requested', 'rejected'
+            feedback TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS team_sync_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sync_date DATE NOT NULL,
+            sync_type TEXT NOT NULL,  -- 'daily_standup', 'epic_kickoff', 'epic_retro'
+            teams_involved TEXT NOT NULL,
+            summary TEXT,  -- JSON: {team_status, cross_team_issues, blockers_summary}
+            issues_identified TEXT,
+            actions_taken TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tactical_decisions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            decision_type TEXT NOT NULL,
+            situation TEXT NOT NULL,
+            decision_made TEXT NOT NULL,
+            rationale TEXT,
+            impact TEXT,
+            outcome TEXT
+        )
+        """,
+        # 7 agent teams with their capacity
+        """
+        INSERT OR IGNORE INTO team_status (team_name, capacity, active_tasks, queued_tasks, utilization_percent)
+        VALUES ('Foundation', 3, 0, 0, 0), ('Backend', 5, 0, 0, 0), ('Frontend', 3, 0, 0, 0),
+               ('Research', 5, 0, 0, 0), ('Quality', 10, 0, 0, 0), ('Integration', 3, 0, 0, 0),
+               ('Orchestration', 999, 0, 0, 0)
+        """,
+    ]),
+
+    (3, "Archive rollups for retention policy", [
+        """
+        CREATE TABLE IF NOT EXISTS archive_rollups (
+            table_name TEXT NOT NULL,
+            period TEXT NOT NULL,  -- 'YYYY-MM'
+            group_key TEXT NOT NULL,  -- JSON: {rollup_column: value}
+            row_count INTEGER NOT NULL DEFAULT 0,
+            first_at DATETIME,
+            last_at DATETIME,
+            PRIMARY KEY (table_name, period, group_key)
+        )
+        """,
+    ]),
+
+    (4, "Execution table performance indexes", [
+        # Time-window scans (health check, archiver)
+        "CREATE INDEX IF NOT EXISTS idx_agent_messages_timestamp ON agent_messages(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_handoff_log_timestamp ON handoff_log(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_quality_gates_timestamp ON quality_gates(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_sop_compliance_timestamp ON sop_compliance(timestamp, sop_name)",
+        "CREATE INDEX IF NOT EXISTS idx_team_sync_log_date ON team_sync_log(sync_date)",
+        "CREATE INDEX IF NOT EXISTS idx_tactical_decisions_timestamp ON tactical_decisions(timestamp)",
+        # Agent inbox and item lookups
+        "CREATE INDEX IF NOT EXISTS idx_agent_messages_inbox ON agent_messages(to_agent, acknowledged)",
+        "CREATE INDEX IF NOT EXISTS idx_handoff_log_status ON handoff_log(status)",
+        "CREATE INDEX IF NOT EXISTS idx_quality_gates_item ON quality_gates(gate_level, item_id)",
+        "CREATE INDEX IF NOT EXISTS idx_blockers_status ON blockers(status)",
+        "CREATE INDEX IF NOT EXISTS idx_review_deployments_item ON review_deployments(item_id)",
+    ]),
+
+    (5, "Quality gate check result cache", [
+        """
+        CREATE TABLE IF NOT EXISTS quality_gate_cache (
+            cache_key TEXT PRIMARY KEY,  -- sha256(check name + item content hash)
+            check_name TEXT NOT NULL,
+            passed BOOLEAN NOT NULL,
+            detail TEXT,
+            checked_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+
+    (6, "Content-addressed handoff package store", [
+        """
+        CREATE TABLE IF NOT EXISTS handoff_blobs (
+            hash TEXT PRIMARY KEY,  -- sha256 of data
+            size INTEGER NOT NULL,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            data BLOB NOT NULL  -- package chunk or manifest JSON
+        )
+        """,
+        # Handoff rows reference a manifest instead of an inline handoff_package
+        add_column("handoff_log", "manifest_hash", "TEXT"),
+        "CREATE INDEX IF NOT EXISTS idx_handoff_log_manifest ON handoff_log(manifest_hash)",
+        "CREATE INDEX IF NOT EXISTS idx_handoff_blobs_garbage ON handoff_blobs(refcount) WHERE refcount <= 0",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Databases already brought up to date by this process
+_migrated: set = set()
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in PRAGMA user_version"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db_path: Path, target: int = LATEST_VERSION) -> Tuple[int, int]:
+    """
+    Apply every pending migration to a database, one transaction per step.
+
+    Safe against concurrent migrators: each step takes the write lock with
+    BEGIN IMMEDIATE and re-reads user_version before applying anything.
+
+    Args:
+        db_path: Path to the project's workflow.db (created if missing)
+        target: Highest version to apply
+
+    Returns:
+        (from_version, to_version)
+    """
+    conn = sqlite3.connect(str(db_path), isolation_level=None, timeout=30)
+
+    try:
+        start = get_version(conn)
+
+        # Fresh databases start in incremental auto-vacuum mode so the
+        # archiver can release pages without a full VACUUM
+        if start == 0 and not conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+        for version, description, steps in MIGRATIONS:
+            if version > target:
+                break
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if get_version(conn) >= version:
+                    conn.execute("ROLLBACK")
+                    continue
+
+                for step in steps:
+                    run_step(conn, step)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                raise RuntimeError(
+                    f"Migration {version} ({description}) failed for {db_path}: {e}"
+                ) from e
+
+        return start, get_version(conn)
+    finally:
+        conn.close()
+
+
+def connect(db_path: Path, **kwargs) -> sqlite3.Connection:
+    """
+    Open a project database, applying pending migrations on first open.
+
+    Extra keyword arguments are passed to sqlite3.connect().
+    """
+    key = str(Path(db_path).resolve())
+
+    if key not in _migrated:
+        conn = sqlite3.connect(str(db_path), **kwargs)
+        if get_version(conn) >= LATEST_VERSION:
+            _migrated.add(key)
+            return conn
+        conn.close()
+
+        migrate(db_path)
+        _migrated.add(key)
+
+    return sqlite3.connect(str(db_path), **kwargs)
+
+
+def template_path(version: int = LATEST_VERSION) -> Path:
+    """Location of the pre-built template for a schema version"""
+    return TEMPLATES_PATH / f"project-v{version}.db"
+
+
+def get_template() -> Path:
+    """
+    Return the template database for the latest schema, building it if needed.
+
+    The template is built under a temporary name and renamed into place, so
+    concurrent builders never see a half-written file.
+    """
+    path = template_path()
+    if path.exists():
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        migrate(tmp_path)
+        conn = sqlite3.connect(str(tmp_path), isolation_level=None)
+        conn.execute("VACUUM")
+        conn.close()
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def clone_template(db_path: Path, replace: bool = False) -> Path:
+    """
+    Create a database at the latest schema by copying the template.
+
+    The template is never opened for writing once built (rollback journal,
+    no WAL), so a plain file copy is a consistent snapshot. The copy is made
+    under a temporary name and renamed into place.
+
+    Args:
+        db_path: Database to create
+        replace: Atomically replace an existing database (and drop its
+            -wal/-shm/-journal files)
+
+    Raises:
+        FileExistsError: db_path exists and replace is False
+    """
+    db_path = Path(db_path)
+    if db_path.exists() and not replace:
+        raise FileExistsError(f"Database already exists: {db_path}")
+
+    template = get_template()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_name(f".{db_path.name}.{os.getpid()}.tmp")
+    shutil.copyfile(template, tmp_path)
+
+    for suffix in ("-wal", "-shm", "-journal"):
+        sidecar = Path(f"{db_path}{suffix}")
+        if sidecar.exists():
+            sidecar.unlink()
+    os.replace(tmp_path, db_path)
+
+    _migrated.add(str(db_path.resolve()))
+    return db_path
+
+
+def find_project_databases(projects_path: Path = PROJECTS_PATH) -> List[Path]:
+    """Discover every project workflow.db"""
+    if not projects_path.exists():
+        return []
+    return sorted(projects_path.glob("*/workflow.db"))
+
+
+def _migrate_worker(db_path: str) -> Tuple[str, int, int, Optional[str]]:
+    """Process-pool worker: migrate one database and report the outcome"""
+    try:
+        start, end = migrate(Path(db_path))
+        return db_path, start, end, None
+    except Exception as e:
+        return db_path, -1, -1, str(e)
+
+
+def migrate_all(db_paths: List[Path], workers: Optional[int] = None,
+                progress: bool = True) -> Dict[str, int]:
+    """
+    Migrate many project databases in parallel.
+
+    Args:
+        db_paths: Databases to migrate
+        workers: Process count (defaults to CPU count)
+        progress: Print a line per database as it completes
+
+    Returns:
+        Summary counts: {'migrated', 'current', 'failed'}
+    """
+    summary = {"migrated": 0, "current": 0, "failed": 0}
+    total = len(db_paths)
+    if not total:
+        return summary
+
+    workers = workers or os.cpu_count() or 1
+    started = time.time()
+
+    with ProcessPoolExecutor(max_workers=min(workers, total)) as pool:
+        futures = [pool.submit(_migrate_worker, str(p)) for p in db_paths]
+
+        for done, future in enumerate(as_completed(futures), 1):
+            db_path, start, end, error = future.result()
+            name = Path(db_path).parent.name
+
+            if error:
+                summary["failed"] += 1
+                line = f"❌ {name}: {error}"
+            elif start == end:
+                summary["current"] += 1
+                line = f"✅ {name}: already at v{end}"
+            else:
+                summary["migrated"] += 1
+                line = f"⬆️  {name}: v{start} → v{end}"
+
+            if progress:
+                print(f"  [{done}/{total}] {line}")
+
+    summary["seconds"] = round(time.time() - started, 2)
+    return summary
+
+
+def main():
+    """CLI entry point."""
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  python3 project_migrations.py status")
+        print("  python3 project_migrations.py migrate <project-name>")
+        print("  python3 project_migrations.py migrate-all [--workers N]")
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    if command == "status":
+        print(f"📦 Latest schema version: v{LATEST_VERSION}\n")
+        for db_path in find_project_databases():
+            conn = sqlite3.connect(str(db_path))
+            version = get_version(conn)
+            conn.close()
+            status = "✅" if version >= LATEST_VERSION else "⬆️ "
+            print(f"  {status} {db_path.parent.name}: v{version}")
+
+    elif command == "migrate":
+        if len(sys.argv) < 3:
+            print("Usage: project_migrations.py migrate <project-name>")
+            sys.exit(1)
+
+        db_path = PROJECTS_PATH / sys.argv[2] / "workflow.db"
+        if not db_path.exists():
+            print(f"❌ Database not found: {db_path}")
+            sys.exit(1)
+
+        start, end = migrate(db_path)
+        if start == end:
+            print(f"✅ Already at v{end}")
+        else:
+            print(f"✅ Migrated v{start} → v{end}")
+
+    elif command == "migrate-all":
+        workers = None
+        if "--workers" in sys.argv:
+            workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+        db_paths = find_project_databases()
+        print(f"🔧 Migrating {len(db_paths)} project databases to v{LATEST_VERSION}\n")
+        summary = migrate_all(db_paths, workers=workers)
+
+        print(f"\n📊 {summary['migrated']} migrated, {summary['current']} already current, "
+              f"{summary['failed']} failed ({summary.get('seconds', 0)}s)")
+        if summary["failed"]:
+            sys.exit(1)
+
+    else:
+        print(f"Unknown command: {command}")
+        print("Valid commands: status, migrate, migrate-all")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
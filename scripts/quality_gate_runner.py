@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Quality Gate Runner - Executes quality-enforcer gate checks
+
+Evaluates work items against the checks defined for their gate level
+(task, feature, epic, phase) and records one quality_gates row per item.
+
+- Every (check, item) pair is independent, so all of them run concurrently
+  in a process pool; a gate over hundreds of tasks takes about as long as
+  its slowest check.
+- Results are cached in quality_gate_cache keyed by a hash of the check
+  and the content of the item's files, so unchanged items are not re-checked.
+  A check that crashes fails the item for this run only; it is not cached.
+- Gate outcomes and cache entries are written in one batched transaction.
+
+Items file (JSON list):
+    [{"item_id": "T-101", "item_name": "Auth API", "paths": ["src/auth.py", "tests/test_auth.py"]}]
+
+Relative paths are resolved against the items file's directory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from project_migrations import connect
+
+# Bump when check logic changes so cached results are invalidated
+CHECKS_VERSION = 1
+
+CONFLICT_MARKER = re.compile(r"^(<{7}|>{7}|={7})( |$)", re.MULTILINE)
+DEBUG_STATEMENT = re.compile(r"^\s*(breakpoint\(\)|import pdb|pdb\.set_trace\(\))", re.MULTILINE)
+PLACEHOLDER = re.compile(r"\[(Project Name|project-slug|Date)\]|\bTBD\b")
+TEST_FILE = re.compile(r"(^test_.*\.py$|_test\.(py|go)$|\.(test|spec)\.(js|ts|jsx|tsx)$)")
+
+
+# ============================================================================
+# CHECKS
+# Each check takes a list of file paths and returns (passed, detail).
+# ============================================================================
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(errors="replace")
+    except (IOError, OSError):
+        return None
+
+
+def check_deliverables_exist(paths: List[str]) -> Tuple[bool, str]:
+    """Every listed deliverable exists"""
+    if not paths:
+        return False, "no deliverables listed"
+    missing = [p for p in paths if not Path(p).exists()]
+    if missing:
+        return False, f"missing: {', '.join(missing)}"
+    return True, ""
+
+
+def check_no_merge_conflicts(paths: List[str]) -> Tuple[bool, str]:
+    """No unresolved merge conflict markers"""
+    conflicted = []
+    for p in paths:
+        content = _read_text(Path(p))
+        if content and CONFLICT_MARKER.search(content):
+            conflicted.append(p)
+    if conflicted:
+        return False, f"conflict markers in: {', '.join(conflicted)}"
+    return True, ""
+
+
+def check_python_syntax(paths: List[str]) -> Tuple[bool, str]:
+    """All Python files compile"""
+    for p in paths:
+        if not p.endswith(".py"):
+            continue
+        content = _read_text(Path(p))
+        if content is None:
+            continue
+        try:
+            compile(content, p, "exec")
+        except SyntaxError as e:
+            return False, f"{p}:{e.lineno}: {e.msg}"
+    return True, ""
+
+
+def check_json_valid(paths: List[str]) -> Tuple[bool, str]:
+    """All JSON files parse"""
+    for p in paths:
+        if not p.endswith(".json"):
+            continue
+        content = _read_text(Path(p))
+        if content is None:
+            continue
+        try:
+            json.loads(content)
+        except json.JSONDecodeError as e:
+            return False, f"{p}:{e.lineno}: {e.msg}"
+    return True, ""
+
+
+def check_no_debug_statements(paths: List[str]) -> Tuple[bool, str]:
+    """No leftover debugger statements in Python files"""
+    offenders = []
+    for p in paths:
+        if p.endswith(".py"):
+            content = _read_text(Path(p))
+            if content and DEBUG_STATEMENT.search(content):
+                offenders.append(p)
+    if offenders:
+        return False, f"debug statements in: {', '.join(offenders)}"
+    return True, ""
+
+
+def check_tests_present(paths: List[str]) -> Tuple[bool, str]:
+    """At least one test file is part of the deliverable"""
+    for p in paths:
+        path = Path(p)
+        if TEST_FILE.search(path.name) or "tests" in path.parts:
+            return True, ""
+    return False, "no test files among deliverables"
+
+
+def check_docs_present(paths: List[str]) -> Tuple[bool, str]:
+    """At least one markdown document is part of the deliverable"""
+    if any(p.endswith(".md") for p in paths):
+        return True, ""
+    return False, "no documentation among deliverables"
+
+
+def check_no_placeholders(paths: List[str]) -> Tuple[bool, str]:
+    """Documents have no unfilled template placeholders"""
+    offenders = []
+    for p in paths:
+        if p.endswith(".md"):
+            content = _read_text(Path(p))
+            if content and PLACEHOLDER.search(content):
+                offenders.append(p)
+    if offenders:
+        return False, f"template placeholders in: {', '.join(offenders)}"
+    return True, ""
+
+
+CHECKS = {
+    "deliverables_exist": check_deliverables_exist,
+    "no_merge_conflicts": check_no_merge_conflicts,
+    "python_syntax": check_python_syntax,
+    "json_valid": check_json_valid,
+    "no_debug_statements": check_no_debug_statements,
+    "tests_present": check_tests_present,
+    "docs_present": check_docs_present,
+    "no_placeholders": check_no_placeholders,
+}
+
+# Each gate level runs its own checks plus every check of the level below
+GATE_CHECKS = {
+    "task": ["deliverables_exist", "no_merge_conflicts", "python_syntax", "json_valid"],
+    "feature": ["no_debug_statements", "tests_present"],
+    "epic": ["docs_present"],
+    "phase": ["no_placeholders"],
+}
+
+GATE_LEVELS = ["task", "feature", "epic", "phase"]
+
+
+def get_checks_for_level(gate_level: str) -> List[str]:
+    """Return the cumulative list of checks for a gate level"""
+    if gate_level not in GATE_LEVELS:
+        raise ValueError(f"Invalid gate level: {gate_level} (expected one of {', '.join(GATE_LEVELS)})")
+
+    checks = []
+    for level in GATE_LEVELS[:GATE_LEVELS.index(gate_level) + 1]:
+        checks.extend(GATE_CHECKS[level])
+    return checks
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def hash_paths(paths: List[str]) -> str:
+    """Hash the names and content of an item's files (missing files hash by name)"""
+    digest = hashlib.sha256(f"v{CHECKS_VERSION}".encode())
+    for p in sorted(paths):
+        digest.update(b"\0" + p.encode())
+        try:
+            with open(p, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        except (IOError, OSError):
+            digest.update(b"\0missing")
+    return digest.hexdigest()
+
+
+def _cache_key(check_name: str, content_hash: str) -> str:
+    return hashlib.sha256(f"{check_name}:{content_hash}".encode()).hexdigest()
+
+
+def _load_cached(conn, keys: List[str]) -> Dict[str, Tuple[bool, str]]:
+    """Fetch cached check results for many keys (chunked to stay under SQLite's variable limit)"""
+    cached = {}
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(f"""
+            SELECT cache_key, passed, detail FROM quality_gate_cache
+            WHERE cache_key IN ({placeholders})
+        """, chunk).fetchall()
+        for key, passed, detail in rows:
+            cached[key] = (bool(passed), detail or "")
+    return cached
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def _run_check(check_name: str, paths: List[str]) -> Tuple[bool, str, bool]:
+    """
+    Process-pool worker: run one check, turning crashes into failures.
+
+    Returns:
+        (passed, detail, crashed) - crashed results are never cached, since
+        the cause (a missing tool, a timeout) may be transient
+    """
+    try:
+        passed, detail = CHECKS[check_name](paths)
+        return passed, detail, False
+    except Exception as e:
+        return False, f"check crashed: {e}", True
+
+
+def load_items(items_path: Path) -> List[Dict]:
+    """Load gate items from JSON, resolving relative paths against the file's directory"""
+    items = json.loads(Path(items_path).read_text())
+    base = Path(items_path).resolve().parent
+
+    for item in items:
+        if "item_id" not in item:
+            raise ValueError(f"Gate item missing item_id: {item}")
+        item.setdefault("item_name", item["item_id"])
+        item["paths"] = [str(p if Path(p).is_absolute() else base / p) for p in item.get("paths", [])]
+    return items
+
+
+def run_gate(db_path: Path, gate_level: str, items: List[Dict],
+             workers: Optional[int] = None, enforced_by: str = "quality-enforcer") -> Dict:
+    """
+    Evaluate a gate for many items and record the outcomes.
+
+    Args:
+        db_path: Project workflow.db
+        gate_level: 'task', 'feature', 'epic' or 'phase'
+        items: Dicts with item_id, item_name and paths
+        workers: Process count (defaults to CPU count)
+        enforced_by: Agent recorded in quality_gates.enforced_by
+
+    Returns:
+        Dict with per-item results and run statistics
+    """
+    started = time.time()
+    checks = get_checks_for_level(gate_level)
+
+    # One unit of work per (item, check); cache key covers check + content
+    item_hashes = [hash_paths(item["paths"]) for item in items]
+    units = []
+    for item, content_hash in zip(items, item_hashes):
+        for check_name in checks:
+            units.append((item, check_name, _cache_key(check_name, content_hash)))
+
+    conn = connect(db_path)
+    try:
+        results = _load_cached(conn, list({key for _, _, key in units}))
+        cache_hits = sum(1 for _, _, key in units if key in results)
+
+        # Deduplicate identical work (same check over identical content)
+        fresh, crashed_keys = {}, set()
+        pending = {}
+        for item, check_name, key in units:
+            if key not in results and key not in pending:
+                pending[key] = (check_name, item["paths"])
+
+        if pending:
+            max_workers = min(workers or os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {key: pool.submit(_run_check, name, paths)
+                           for key, (name, paths) in pending.items()}
+                for key, future in futures.items():
+                    try:
+                        passed, detail, crashed = future.result()
+                    except Exception as e:  # e.g. a worker process died
+                        passed, detail, crashed = False, f"check errored: {e}", True
+                    results[key] = (passed, detail)
+                    if crashed:
+                        crashed_keys.add(key)
+                    else:
+                        fresh[key] = (passed, detail)
+
+        # Assemble per-item outcomes
+        outcomes = []
+        for item, content_hash in zip(items, item_hashes):
+            failed = []
+            for check_name in checks:
+                passed, detail = results[_cache_key(check_name, content_hash)]
+                if not passed:
+                    failed.append({"check": check_name, "detail": detail})
+            outcomes.append({
+                "item_id": item["item_id"],
+                "item_name": item["item_name"],
+                "gate_status": "failed" if failed else "passed",
+                "failed_checks": failed,
+            })
+
+        # Single batched write: gate rows + new cache entries
+        with conn:
+            conn.executemany("""
+                INSERT INTO quality_gates
+                (gate_level, item_id, item_name, gate_status, checks_run, failed_checks, enforced_by)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                gate_level,
+                o["item_id"],
+                o["item_name"],
+                o["gate_status"],
+                json.dumps(checks),
+                json.dumps(o["failed_checks"]) if o["failed_checks"] else None,
+                enforced_by
+            ) for o in outcomes])
+
+            conn.executemany("""
+                INSERT OR REPLACE INTO quality_gate_cache (cache_key, check_name, passed, detail)
+                VALUES (?, ?, ?, ?)
+            """, [(key, pending[key][0], int(passed), detail) for key, (passed, detail) in fresh.items()])
+    finally:
+        conn.close()
+
+    return {
+        "gate_level": gate_level,
+        "items": outcomes,
+        "passed": sum(1 for o in outcomes if o["gate_status"] == "passed"),
+        "failed": sum(1 for o in outcomes if o["gate_status"] == "failed"),
+        "checks_executed": len(fresh) + len(crashed_keys),
+        "checks_crashed": len(crashed_keys),
+        "cache_hits": cache_hits,
+        "duration_seconds": round(time.time() - started, 3),
+    }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Response Cache - On-disk cache for repeated specialist invocations
+
+Re-running a specialist on unchanged input (e.g. a review of the same docs)
+returns the stored response instead of calling the API again.
+
+- Entries are keyed by a hash of model, system prompt, task and request
+  parameters, so any change to the agent definition or task is a miss.
+- Eviction is LRU, bounded by total response size and by entry age.
+- Hit/miss counters are kept alongside the entries and reported in the
+  invocation log.
+
+Stored in ~/.claude/data/response-cache.db. Opt-in: pass --cache or set
+AGENT_RESPONSE_CACHE=1.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+CLAUDE_HOME = Path.home() / ".claude"
+CACHE_DB = CLAUDE_HOME / "data" / "response-cache.db"
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS response_cache (
+    cache_key TEXT PRIMARY KEY,
+    agent TEXT,
+    model TEXT,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_response_cache_lru ON response_cache(last_used);
+
+CREATE TABLE IF NOT EXISTS cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def make_key(model: str, system: str, task: str, **params) -> str:
+    """Cache key over everything that determines the response"""
+    payload = json.dumps({"model": model, "system": system, "task": task, "params": params},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of invocation results"""
+
+    def __init__(self, db_path: Path = CACHE_DB, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def _count(self, name: str):
+        self.conn.execute("""
+            INSERT INTO cache_stats (name, value) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1
+        """, (name,))
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for a key (counting a hit or miss)"""
+        now = time.time()
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT result, created_at FROM response_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row and now - row[1] > self.max_age_seconds:
+                self.conn.execute("DELETE FROM response_cache WHERE cache_key = ?", (key,))
+                row = None
+
+            if not row:
+                self._count("misses")
+                return None
+
+            self.conn.execute("UPDATE response_cache SET last_used = ? WHERE cache_key = ?", (now, key))
+            self._count("hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict):
+        """Store a result, then evict expired and least-recently-used entries"""
+        data = json.dumps(result)
+        now = time.time()
+        with self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO response_cache
+                (cache_key, agent, model, result, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (key, result.get("agent"), result.get("model"), data, len(data), now, now))
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM response_cache WHERE created_at < ?", (now - self.max_age_seconds,))
+
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Walk from least recently used, deleting until under budget
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in self.conn.execute("SELECT cache_key, size FROM response_cache ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.conn.executemany("DELETE FROM response_cache WHERE cache_key = ?", doomed)
+        self.conn.execute("""
+            INSERT INTO cache_stats (name, value) VALUES ('evictions', ?)
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+        """, (len(doomed),))
+
+    def stats(self) -> Dict:
+        """Entry count, stored bytes and cumulative hit/miss/eviction counters"""
+        entries, size = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache"
+        ).fetchone()
+        counters = dict(self.conn.execute("SELECT name, value FROM cache_stats").fetchall())
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": round(100.0 * hits / (hits + misses), 1) if hits + misses else None,
+        }
+
+    def clear(self) -> int:
+        """Remove every entry; returns the number removed"""
+        with self.conn:
+            return self.conn.execute("DELETE FROM response_cache").rowcount
+
+    def close(self):
+        self.conn.close()
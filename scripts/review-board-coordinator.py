@@ -4,7 +4,6 @@ Review Board Coordinator
 Orchestrates the execution review process with 5 specialist agents
 """
 
-import sqlite3
 import json
 import sys
 from pathlib import Path
@@ -14,12 +13,20 @@ import time
 import subprocess
 import re
 
+import tracing
+from workflow_db import WorkflowDB
+from context_packer import collect_project_sources, pack_context
+
 class ReviewBoardCoordinator:
     def __init__(self):
         self.claude_home = Path.home() / '.claude'
         self.db_path = self.claude_home / 'data/workflow.db'
+        self.db = WorkflowDB(self.db_path)
         self.templates_dir = self.claude_home / 'templates/review-board'
 
+        # Token budget for phase-document context embedded in each prompt
+        self.context_budget = 12000
+
         # Review board composition - C-Suite Executives
         self.specialists = [
             {
@@ -44,22 +51,11 @@ class ReviewBoardCoordinator:
 
     def get_workflow(self, project_name):
         """Get workflow by project name"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("""
+        return self.db.query_one("""
             SELECT * FROM workflows
             WHERE project_name = ?
         """, (project_name,))
 
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            return dict(row)
-        return None
-
     def get_phase_documents(self, project_name):
         """Get paths to all phase documents"""
         projects_dir = self.claude_home / 'projects' / project_name.lower().replace(' ', '-')
@@ -88,22 +84,17 @@ class ReviewBoardCoordinator:
         review_dir.mkdir(parents=True, exist_ok=True)
 
         # Insert into database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         report_path = str(review_dir / 'consolidated-report.md')
 
-        cursor.execute("""
+        self.db.execute("""
             INSERT INTO review_board_sessions
             (id, workflow_id, session_timestamp, status, report_path)
             VALUES (?, ?, ?, 'in_progress', ?)
         """, (session_id, workflow_id, timestamp, report_path))
 
-        conn.commit()
-        conn.close()
-
         return session_id, review_dir
 
+    @tracing.traced()
     def generate_specialist_prompt(self, specialist, docs, output_path, project_name):
         """Generate detailed prompt for a specialist"""
         checklist_path = self.templates_dir / specialist['checklist']
@@ -119,6 +110,14 @@ class ReviewBoardCoordinator:
         else:
             template_content = "# Review Report\n\n## Executive Summary\n\n## Findings\n\n## Verdict"
 
+        # Pack the most relevant passages of the phase documents (plus prior
+        # review decisions and research) for this specialist's checklist
+        sources = collect_project_sources(project_name)
+        packed_paths = {source['path'] for source in sources}
+        sources.extend({'path': str(path), 'kind': 'phase'} for path in docs.values()
+                       if str(path) not in packed_paths)
+        context, _ = pack_context(sources, checklist_content, self.context_budget)
+
         prompt = f"""# Review Board Assignment: {specialist['name']}
 
 You are serving on the Review Board for project: **{project_name}**
@@ -131,6 +130,11 @@ You are serving on the Review Board for project: **{project_name}**
 2. Mission (Phase 2): {docs['mission']}
 3. Execution Plan (Phase 3): {docs['execution']}
 
+## Project Context
+Key passages from the project documents, packed to ~{self.context_budget} tokens. Open the full documents above when you need more detail.
+
+{context}
+
 ## Your Checklist
 {checklist_content}
 
@@ -210,6 +214,7 @@ Analysis pending - specialist review in progress.
 """
         output_path.write_text(report)
 
+    @tracing.traced()
     def aggregate_findings(self, session_dir):
         """Read all specialist reports and aggregate findings"""
         findings = []
@@ -282,6 +287,7 @@ Analysis pending - specialist review in progress.
         else:
             return 'APPROVED', 'Review passed with concerns noted'
 
+    @tracing.traced()
     def generate_consolidated_report(self, findings, decision, reason, project_name, session_dir):
         """Generate final consolidated report"""
         status, _ = decision
@@ -400,39 +406,38 @@ Analysis pending - specialist review in progress.
 
         final_status = status_map.get(decision[0], 'incomplete')
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Update session
-        cursor.execute("""
-            UPDATE review_board_sessions
-            SET status = ?, final_decision = ?, completed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (final_status, decision[0], session_id))
-
-        # Insert findings
-        for finding in findings:
-            finding_id = str(uuid.uuid4())
-            cursor.execute("""
+        # Rows are built first so a retried transaction reuses the same ids
+        rows = [(
+            str(uuid.uuid4()),
+            session_id,
+            finding['specialist']['role'],
+            finding['specialist']['agent'],
+            finding['verdict'],
+            finding.get('report_path', ''),
+            finding['blockers'],
+            finding['concerns'],
+            finding['recommendations']
+        ) for finding in findings]
+
+        def record(conn):
+            # Update session
+            conn.execute("""
+                UPDATE review_board_sessions
+                SET status = ?, final_decision = ?, completed_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (final_status, decision[0], session_id))
+
+            # Insert findings
+            conn.executemany("""
                 INSERT INTO review_board_findings
                 (id, session_id, specialist_role, agent_name, verdict, report_path,
                  blockers_count, concerns_count, recommendations_count)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                finding_id,
-                session_id,
-                finding['specialist']['role'],
-                finding['specialist']['agent'],
-                finding['verdict'],
-                finding.get('report_path', ''),
-                finding['blockers'],
-                finding['concerns'],
-                finding['recommendations']
-            ))
-
-        conn.commit()
-        conn.close()
+            """, rows)
 
+        self.db.write(record)
+
+    @tracing.traced()
     def prepare_review(self, project_name):
         """Prepare review session and return agent launch configs"""
         # Get workflow
@@ -461,6 +466,7 @@ Analysis pending - specialist review in progress.
             'launch_configs': launch_configs
         }
 
+    @tracing.traced()
     def finalize_review(self, session_id, session_dir, project_name):
         """Aggregate findings and generate final report"""
         session_dir = Path(session_dir)
@@ -556,30 +562,23 @@ Analysis pending - specialist review in progress.
     @staticmethod
     def get_latest_review_status(workflow_id):
         """Get status of most recent review for a workflow"""
-        db_path = Path.home() / '.claude/data/workflow.db'
-
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT status, final_decision, report_path, completed_at
-            FROM review_board_sessions
-            WHERE workflow_id = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-        """, (workflow_id,))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            return dict(row)
-        return None
+        db = WorkflowDB(Path.home() / '.claude/data/workflow.db')
+        try:
+            return db.query_one("""
+                SELECT status, final_decision, report_path, completed_at
+                FROM review_board_sessions
+                WHERE workflow_id = ?
+                ORDER BY created_at DESC
+                LIMIT 1
+            """, (workflow_id,))
+        finally:
+            db.close()
 
 
 def main():
     """CLI entry point"""
+    tracing.setup()
+
     if len(sys.argv) < 2:
         print("Usage: review-board-coordinator.py <project-name>")
         sys.exit(1)
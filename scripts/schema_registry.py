@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Schema Registry - One declaration for every workflow database
+
+Three kinds of SQLite database back the workflow, and their schemas used to
+live in whichever script happened to write them:
+
+    workflow      ~/.claude/data/workflow.db (shared). Written by
+                  WorkflowCoordinator (workflows, phase_deliverables,
+                  phase_tasks) and ReviewBoardCoordinator
+                  (review_board_sessions, review_board_findings),
+                  both through workflow_db.py.
+    project       ~/.claude/projects/<slug>/workflow.db. Owned by the
+                  numbered migrations in project_migrations.py (project
+                  tables plus the Phase 4 execution tables).
+    constitution  ~/.claude/data/constitution_compliance.db. Mirrors
+                  constitution/schema.sql.
+
+Each schema declares its tables, indexes and the hot-path queries the
+scripts run against it. DDL is generated from the declaration (the project
+schema is derived by replaying its migrations), and verify_schema() diffs a
+live database against it:
+
+    - missing/extra tables and columns, column type mismatches
+    - missing or differently-defined indexes
+    - EXPLAIN QUERY PLAN for every declared query, flagging full table
+      scans and temporary sort B-trees
+
+Usage:
+    python3 schema_registry.py list
+    python3 schema_registry.py ddl <schema>
+    python3 schema_registry.py init <workflow|constitution> [db-path]
+    python3 schema_registry.py verify [<schema> [db-path]] [--json]
+"""
+
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CLAUDE_HOME = Path.home() / ".claude"
+WORKFLOW_DB = CLAUDE_HOME / "data" / "workflow.db"
+CONSTITUTION_DB = CLAUDE_HOME / "data" / "constitution_compliance.db"
+PROJECTS_PATH = CLAUDE_HOME / "projects"
+
+
+# ============================================================================
+# DECLARATIONS
+# ============================================================================
+
+# Each schema:
+#   tables:  {table: [column or table-constraint definitions]}
+#   indexes: [(index, table, columns, where-clause or None)]
+#   queries: [(label, sql)] hot paths that must be served by an index
+#   seed:    statements run once after the tables exist
+
+WORKFLOW_SCHEMA = {
+    "description": "Shared workflow state (workflow and review board coordinators)",
+    "path": WORKFLOW_DB,
+    "tables": {
+        "workflows": [
+            "id TEXT PRIMARY KEY",
+            "project_name TEXT NOT NULL",
+            "current_phase INTEGER NOT NULL DEFAULT 1",
+            "phase_status TEXT NOT NULL DEFAULT 'in_progress'",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+        ],
+        "phase_deliverables": [
+            "id TEXT PRIMARY KEY",
+            "workflow_id TEXT NOT NULL",
+            "phase INTEGER NOT NULL",
+            "deliverable_type TEXT NOT NULL",
+            "content_path TEXT NOT NULL",
+            "status TEXT NOT NULL DEFAULT 'draft'",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "FOREIGN KEY (workflow_id) REFERENCES workflows(id)",
+        ],
+        "phase_tasks": [
+            "id TEXT PRIMARY KEY",
+            "workflow_id TEXT NOT NULL",
+            "phase INTEGER NOT NULL",
+            "task_description TEXT NOT NULL",
+            "assigned_agent TEXT",
+            "dependencies TEXT",  # JSON list of task ids
+            "status TEXT NOT NULL DEFAULT 'pending'",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "completed_at TIMESTAMP",
+            "FOREIGN KEY (workflow_id) REFERENCES workflows(id)",
+        ],
+        "review_board_sessions": [
+            "id TEXT PRIMARY KEY",
+            "workflow_id TEXT NOT NULL",
+            "session_timestamp TEXT NOT NULL",
+            "status TEXT NOT NULL DEFAULT 'in_progress'",
+            "final_decision TEXT",
+            "report_path TEXT",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "completed_at TIMESTAMP",
+            "FOREIGN KEY (workflow_id) REFERENCES workflows(id)",
+        ],
+        "review_board_findings": [
+            "id TEXT PRIMARY KEY",
+            "session_id TEXT NOT NULL",
+            "specialist_role TEXT NOT NULL",
+            "agent_name TEXT NOT NULL",
+            "verdict TEXT NOT NULL",
+            "report_path TEXT",
+            "blockers_count INTEGER DEFAULT 0",
+            "concerns_count INTEGER DEFAULT 0",
+            "recommendations_count INTEGER DEFAULT 0",
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "FOREIGN KEY (session_id) REFERENCES review_board_sessions(id)",
+        ],
+    },
+    "indexes": [
+        ("idx_workflows_project", "workflows", "project_name", None),
+        ("idx_workflows_status", "workflows", "phase_status, updated_at", None),
+        ("idx_workflows_updated", "workflows", "updated_at", None),
+        ("idx_phase_deliverables_workflow", "phase_deliverables", "workflow_id, phase, created_at", None),
+        ("idx_phase_tasks_workflow", "phase_tasks", "workflow_id, phase, status, created_at", None),
+        ("idx_review_sessions_workflow", "review_board_sessions", "workflow_id, created_at", None),
+        ("idx_review_findings_session", "review_board_findings", "session_id", None),
+    ],
+    "queries": [
+        ("get_workflow_by_project", "SELECT * FROM workflows WHERE project_name = ?"),
+        ("list_workflows (status)", "SELECT * FROM workflows WHERE phase_status = ? ORDER BY updated_at DESC"),
+        ("list_workflows", "SELECT * FROM workflows ORDER BY updated_at DESC"),
+        ("get_deliverables (phase)",
+         "SELECT * FROM phase_deliverables WHERE workflow_id = ? AND phase = ? ORDER BY created_at DESC"),
+        ("get_deliverables", "SELECT * FROM phase_deliverables WHERE workflow_id = ? ORDER BY phase, created_at DESC"),
+        ("get_tasks", "SELECT * FROM phase_tasks WHERE workflow_id = ? AND phase = ? AND status = ? ORDER BY created_at"),
+        ("get_latest_review_status",
+         "SELECT status FROM review_board_sessions WHERE workflow_id = ? ORDER BY created_at DESC LIMIT 1"),
+        ("review findings", "SELECT * FROM review_board_findings WHERE session_id = ?"),
+    ],
+    "seed": [],
+}
+
+CONSTITUTION_SCHEMA = {
+    "description": "Agent constitution compliance tracking (constitution/schema.sql)",
+    "path": CONSTITUTION_DB,
+    "tables": {
+        "agent_sessions": [
+            "session_id TEXT PRIMARY KEY",
+            "agent_type TEXT NOT NULL",
+            "launched_at TIMESTAMP NOT NULL",
+            "completed_at TIMESTAMP",
+            "acknowledged BOOLEAN DEFAULT 0",
+            "task_summary TEXT",
+            "status TEXT",  # 'running', 'completed', 'failed'
+        ],
+        "violations": [
+            "id INTEGER PRIMARY KEY AUTOINCREMENT",
+            "session_id TEXT NOT NULL",
+            "violation_type TEXT NOT NULL",  # 'no_acknowledgment', 'concurrency', 'tool_misuse'
+            "severity TEXT DEFAULT 'warning'",  # 'critical', 'warning', 'info'
+            "details TEXT",
+            "detected_at TIMESTAMP NOT NULL",
+            "FOREIGN KEY (session_id) REFERENCES agent_sessions(session_id)",
+        ],
+        "constitution_versions": [
+            "version TEXT PRIMARY KEY",
+            "released_at TIMESTAMP NOT NULL",
+            "active BOOLEAN DEFAULT 1",
+        ],
+    },
+    "indexes": [
+        ("idx_sessions_launched", "agent_sessions", "launched_at", None),
+        ("idx_sessions_agent_type", "agent_sessions", "agent_type", None),
+        ("idx_violations_session", "violations", "session_id", None),
+        ("idx_violations_detected", "violations", "detected_at", None),
+    ],
+    "queries": [
+        ("sessions since", "SELECT * FROM agent_sessions WHERE launched_at >= ? ORDER BY launched_at"),
+        ("sessions by agent type", "SELECT * FROM agent_sessions WHERE agent_type = ?"),
+        ("violations for session", "SELECT * FROM violations WHERE session_id = ?"),
+        ("recent violations", "SELECT * FROM violations WHERE detected_at >= ? ORDER BY detected_at DESC"),
+    ],
+    "seed": [
+        "INSERT OR IGNORE INTO constitution_versions (version, released_at, active) VALUES ('1.0', datetime('now'), 1)",
+    ],
+}
+
+PROJECT_SCHEMA = {
+    "description": "Per-project workflow and Phase 4 execution tables (project_migrations.py)",
+    "path": None,  # one per project: PROJECTS_PATH/<slug>/workflow.db
+    "tables": None,  # derived from MIGRATIONS
+    "indexes": None,
+    "queries": [
+        ("deliverables by phase", "SELECT * FROM deliverables WHERE phase_number = ?"),
+        ("tasks by status", "SELECT * FROM tasks WHERE status = ?"),
+        ("agent inbox", "SELECT * FROM agent_messages WHERE to_agent = ? AND acknowledged = 0"),
+        ("messages last 24h", "SELECT COUNT(*) FROM agent_messages WHERE timestamp >= datetime('now', '-1 day')"),
+        ("handoffs last 24h", "SELECT COUNT(*) FROM handoff_log WHERE timestamp >= datetime('now', '-1 day')"),
+        ("gates last 24h", "SELECT COUNT(*) FROM quality_gates WHERE timestamp >= datetime('now', '-1 day')"),
+        ("gates for item", "SELECT * FROM quality_gates WHERE gate_level = ? AND item_id = ?"),
+        ("active blockers", "SELECT COUNT(*) FROM blockers WHERE status = 'active'"),
+        ("handoffs by manifest", "SELECT id FROM handoff_log WHERE manifest_hash = ?"),
+        ("gate cache lookup", "SELECT passed, detail FROM quality_gate_cache WHERE cache_key = ?"),
+        ("review findings", "SELECT * FROM review_board_findings WHERE session_id = ?"),
+    ],
+    "seed": [],
+}
+
+SCHEMAS = {
+    "workflow": WORKFLOW_SCHEMA,
+    "project": PROJECT_SCHEMA,
+    "constitution": CONSTITUTION_SCHEMA,
+}
+
+
+# ============================================================================
+# DDL
+# ============================================================================
+
+def _get(name: str) -> Dict:
+    if name not in SCHEMAS:
+        raise ValueError(f"Unknown schema '{name}' (valid: {', '.join(SCHEMAS)})")
+    return SCHEMAS[name]
+
+
+def generate_ddl(name: str) -> List[str]:
+    """CREATE statements (tables, indexes, seed rows) for a schema"""
+    schema = _get(name)
+
+    if schema["tables"] is None:
+        # Migration-owned: the DDL is whatever the migrations leave behind
+        conn = _expected_connection(name)
+        try:
+            return [row[0] for row in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+                "ORDER BY type DESC, name"
+            )]
+        finally:
+            conn.close()
+
+    statements = []
+    for table, columns in schema["tables"].items():
+        body = ",\n    ".join(columns)
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table} (\n    {body}\n)")
+    for index, table, columns, where in schema["indexes"]:
+        statement = f"CREATE INDEX IF NOT EXISTS {index} ON {table}({columns})"
+        statements.append(f"{statement} WHERE {where}" if where else statement)
+    statements.extend(schema["seed"])
+    return statements
+
+
+def create_schema(conn: sqlite3.Connection, name: str):
+    """Create every missing table and index of a schema (idempotent)"""
+    if _get(name)["tables"] is None:
+        raise ValueError(f"Schema '{name}' is migration-owned; use project_migrations.migrate()")
+    with conn:
+        for statement in generate_ddl(name):
+            conn.execute(statement)
+
+
+def init_database(name: str, db_path: Optional[Path] = None) -> Path:
+    """Create (or complete) a database for a declared schema"""
+    db_path = Path(db_path or _get(name)["path"])
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        create_schema(conn, name)
+    finally:
+        conn.close()
+    return db_path
+
+
+def _expected_connection(name: str) -> sqlite3.Connection:
+    """In-memory database holding the expected schema"""
+    conn = sqlite3.connect(":memory:")
+    if _get(name)["tables"] is None:
+        from project_migrations import MIGRATIONS, run_step
+        for _, _, steps in MIGRATIONS:
+            for step in steps:
+                run_step(conn, step)
+    else:
+        create_schema(conn, name)
+    return conn
+
+
+# ============================================================================
+# VERIFICATION
+# ============================================================================
+
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+def introspect(conn: sqlite3.Connection) -> Dict:
+    """Tables (column -> (type, notnull, default, pk)) and indexes of a database"""
+    tables = {}
+    for (table,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall():
+        tables[table] = {
+            col[1]: (col[2].upper(), bool(col[3]), col[4], col[5])
+            for col in conn.execute(f"PRAGMA table_info('{table}')")
+        }
+
+    indexes = {}
+    for index, table, sql in conn.execute(
+        "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    ).fetchall():
+        columns = tuple(col[2] for col in conn.execute(f"PRAGMA index_info('{index}')"))
+        unique = sql.upper().startswith("CREATE UNIQUE")
+        where = re.split(r"\sWHERE\s", sql, 1, flags=re.IGNORECASE)
+        where = where[1].strip() if len(where) > 1 else None
+        indexes[index] = (table, columns, unique, where)
+
+    return {"tables": tables, "indexes": indexes}
+
+
+def _plan(conn: sqlite3.Connection, sql: str) -> List[str]:
+    params = [None] * sql.count("?")
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def check_query_plans(conn: sqlite3.Connection, name: str) -> List[Dict]:
+    """EXPLAIN QUERY PLAN for each declared hot-path query"""
+    results = []
+    for label, sql in _get(name)["queries"]:
+        try:
+            plan = _plan(conn, sql)
+        except sqlite3.OperationalError as e:
+            results.append({"query": label, "sql": sql, "plan": [], "error": str(e)})
+            continue
+
+        result = {"query": label, "sql": sql, "plan": plan}
+        scans = [m.group(1) for m in map(FULL_SCAN.match, plan) if m]
+        if scans:
+            result["full_scan"] = scans
+        if any("USE TEMP B-TREE" in step for step in plan):
+            result["temp_sort"] = True
+        results.append(result)
+    return results
+
+
+def verify_schema(db_path: Path, name: str) -> Dict:
+    """
+    Diff a live database against its declared schema.
+
+    The database is opened read-only.
+
+    Returns:
+        {'schema', 'db', 'errors': [...], 'warnings': [...], 'plans': [...]};
+        errors are things that break queries (missing tables/columns,
+        failing plans), warnings are drift and slow plans.
+    """
+    schema = _get(name)
+    report = {"schema": name, "db": str(db_path), "errors": [], "warnings": [], "plans": []}
+
+    expected_conn = _expected_connection(name)
+    try:
+        expected = introspect(expected_conn)
+    finally:
+        expected_conn.close()
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
+    try:
+        actual = introspect(conn)
+        errors, warnings = report["errors"], report["warnings"]
+
+        for table, columns in expected["tables"].items():
+            live = actual["tables"].get(table)
+            if live is None:
+                errors.append(f"missing table {table}")
+                continue
+            for column, (col_type, notnull, _, pk) in columns.items():
+                if column not in live:
+                    errors.append(f"missing column {table}.{column}")
+                elif live[column][0] != col_type:
+                    warnings.append(f"column {table}.{column} is {live[column][0] or 'untyped'}, expected {col_type}")
+                elif live[column][3] != pk:
+                    warnings.append(f"column {table}.{column} primary key mismatch")
+            for column in live:
+                if column not in columns:
+                    warnings.append(f"undeclared column {table}.{column}")
+
+        for table in actual["tables"]:
+            if table not in expected["tables"]:
+                warnings.append(f"undeclared table {table}")
+
+        for index, definition in expected["indexes"].items():
+            live = actual["indexes"].get(index)
+            if live is None:
+                if definition[0] in actual["tables"]:
+                    warnings.append(f"missing index {index} on {definition[0]}({', '.join(definition[1])})")
+            elif live != definition:
+                warnings.append(f"index {index} is on {live[0]}({', '.join(live[1])}), "
+                                f"expected {definition[0]}({', '.join(definition[1])})")
+
+        if schema["tables"] is None:
+            from project_migrations import LATEST_VERSION, get_version
+            version = get_version(conn)
+            if version < LATEST_VERSION:
+                warnings.append(f"schema version v{version} is behind v{LATEST_VERSION} "
+                                f"(run project_migrations.py migrate)")
+
+        report["plans"] = check_query_plans(conn, name)
+        for plan in report["plans"]:
+            if "error" in plan:
+                errors.append(f"query '{plan['query']}' fails: {plan['error']}")
+            elif "full_scan" in plan:
+                warnings.append(f"query '{plan['query']}' scans {', '.join(plan['full_scan'])} without an index")
+    finally:
+        conn.close()
+
+    return report
+
+
+def find_databases() -> List[Tuple[str, Path]]:
+    """Every known database that exists: (schema name, path)"""
+    found = [(name, schema["path"]) for name, schema in SCHEMAS.items()
+             if schema["path"] and schema["path"].exists()]
+    if PROJECTS_PATH.exists():
+        found.extend(("project", p) for p in sorted(PROJECTS_PATH.glob("*/workflow.db")))
+    return found
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _print_report(report: Dict):
+    status = "❌" if report["errors"] else "⚠️ " if report["warnings"] else "✅"
+    print(f"{status} {report['schema']}: {report['db']}")
+    for error in report["errors"]:
+        print(f"    ❌ {error}")
+    for warning in report["warnings"]:
+        print(f"    ⚠️  {warning}")
+    sorts = [p["query"] for p in report["plans"] if p.get("temp_sort")]
+    if sorts:
+        print(f"    ℹ️  temp sort B-tree: {', '.join(sorts)}")
+
+
+def main():
+    """CLI entry point."""
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  python3 schema_registry.py list")
+        print("  python3 schema_registry.py ddl <schema>")
+        print("  python3 schema_registry.py init <workflow|constitution> [db-path]")
+        print("  python3 schema_registry.py verify [<schema> [db-path]] [--json]")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    as_json = "--json" in sys.argv
+    args = [a for a in sys.argv[2:] if a != "--json"]
+
+    try:
+        if command == "list":
+            for name, schema in SCHEMAS.items():
+                location = schema["path"] or PROJECTS_PATH / "<slug>" / "workflow.db"
+                print(f"📦 {name}: {schema['description']}")
+                print(f"   {location}")
+
+        elif command == "ddl":
+            if not args:
+                print("Usage: schema_registry.py ddl <schema>")
+                sys.exit(1)
+            for statement in generate_ddl(args[0]):
+                print(f"{statement.strip()};\n")
+
+        elif command == "init":
+            if not args:
+                print("Usage: schema_registry.py init <workflow|constitution> [db-path]")
+                sys.exit(1)
+            db_path = init_database(args[0], Path(args[1]) if len(args) > 1 else None)
+            print(f"✅ {args[0]} schema ready: {db_path}")
+
+        elif command == "verify":
+            if args:
+                name = args[0]
+                if len(args) > 1:
+                    db_path = Path(args[1])
+                elif _get(name)["path"]:
+                    db_path = _get(name)["path"]
+                else:
+                    print("Usage: schema_registry.py verify project <db-path>")
+                    sys.exit(1)
+                if not db_path.exists():
+                    print(f"❌ Database not found: {db_path}")
+                    sys.exit(1)
+                targets = [(name, db_path)]
+            else:
+                targets = find_databases()
+
+            reports = [verify_schema(db_path, name) for name, db_path in targets]
+            if as_json:
+                print(json.dumps(reports, indent=2))
+            else:
+                if not reports:
+                    print("No databases found")
+                for report in reports:
+                    _print_report(report)
+            if any(r["errors"] for r in reports):
+                sys.exit(1)
+
+        else:
+            print(f"Unknown command: {command}")
+            print("Valid commands: list, ddl, init, verify")
+            sys.exit(1)
+
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -155,8 +155,10 @@ echo "Step 8: Installing automation scripts..."
 
 cp "$REPO_ROOT"/scripts/*.py "$INSTALL_DIR/scripts/" 2>/dev/null || true
 cp "$REPO_ROOT"/scripts/*.sh "$INSTALL_DIR/scripts/" 2>/dev/null || true
+cp "$REPO_ROOT"/scripts/claude-workflow "$INSTALL_DIR/scripts/" 2>/dev/null || true
 chmod +x "$INSTALL_DIR/scripts"/*.sh 2>/dev/null || true
 chmod +x "$INSTALL_DIR/scripts"/*.py 2>/dev/null || true
+chmod +x "$INSTALL_DIR/scripts/claude-workflow" 2>/dev/null || true
 
 success "Scripts installed and made executable"
 
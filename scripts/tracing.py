@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Tracing - Opt-in spans for SQLite, file I/O and subprocess calls
+
+Off by default. The coordinators call setup() at the start of main(), which
+turns tracing on when `--trace` is on the command line (the flag is removed
+from sys.argv) or CLAUDE_TRACE is set:
+
+    CLAUDE_TRACE=1                  trace to ~/.claude/logs/traces/<script>-<time>.json
+    CLAUDE_TRACE=/tmp/run.json      trace to that file
+
+When enabled, sqlite3.connect, builtins.open, the pathlib read/write
+helpers, shutil copies and subprocess.run/call are wrapped process-wide, so
+every query, file access and child process made by a coordinator or the
+modules it uses becomes a span. When disabled nothing is patched; the only
+cost is a flag check in span() and @traced.
+
+At exit the spans are written in Chrome trace-event format (open in
+chrome://tracing or https://ui.perfetto.dev) and a summary is printed to
+stderr: time per category, query counts and the slowest statements.
+
+Usage:
+    python3 workflow-coordinator.py status <workflow_id> --trace
+    CLAUDE_TRACE=1 python3 review-board-coordinator.py <project-name>
+    python3 tracing.py summary <trace.json>
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CLAUDE_HOME = Path.home() / ".claude"
+TRACES_PATH = CLAUDE_HOME / "logs" / "traces"
+ENV_VAR = "CLAUDE_TRACE"
+
+SLOWEST_STATEMENTS = 10
+
+_enabled = False
+_events: List[Dict] = []
+_origin = 0
+_trace_path: Optional[Path] = None
+_originals: Dict[str, object] = {}
+_local = threading.local()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _now_us() -> float:
+    return (time.perf_counter_ns() - _origin) / 1000
+
+
+def _record(name: str, category: str, start_us: float, args: Optional[Dict] = None):
+    event = {"name": name, "cat": category, "ph": "X", "ts": round(start_us, 3),
+             "dur": round(_now_us() - start_us, 3), "pid": os.getpid(), "tid": threading.get_ident()}
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name: str, category: str, args: Optional[Dict]):
+        self.name, self.category, self.args = name, category, args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        _record(self.name, self.category, self.start, self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str = "app", **args):
+    """Context manager timing a block (a shared no-op when disabled)"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args or None)
+
+
+def traced(category: str = "app"):
+    """Decorator recording each call of a function as a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(func.__qualname__, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+def _statement(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _wrap(owner, attribute: str, category: str, describe):
+    original = getattr(owner, attribute)
+    _originals[f"{getattr(owner, '__name__', owner)}.{attribute}"] = (owner, attribute, original)
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        # Only the outermost call is recorded (shutil.copy opens files itself)
+        if getattr(_local, category, False):
+            return original(*args, **kwargs)
+        setattr(_local, category, True)
+        try:
+            with _Span(describe(*args, **kwargs), category, None):
+                return original(*args, **kwargs)
+        finally:
+            setattr(_local, category, False)
+
+    setattr(owner, attribute, wrapper)
+
+
+def _instrument():
+    # Imported here so that a disabled tracer costs nothing at startup
+    import builtins
+    import pathlib
+    import shutil
+    import sqlite3
+    import subprocess
+
+    class TracedCursor(sqlite3.Cursor):
+        def execute(self, sql, parameters=()):
+            with _Span(_statement(sql)[:80], "db", {"sql": _statement(sql)}):
+                return super().execute(sql, parameters)
+
+        def executemany(self, sql, seq_of_parameters):
+            with _Span(_statement(sql)[:80], "db", {"sql": _statement(sql), "many": True}):
+                return super().executemany(sql, seq_of_parameters)
+
+    class TracedConnection(sqlite3.Connection):
+        def cursor(self, factory=TracedCursor):
+            return super().cursor(factory)
+
+        def execute(self, sql, parameters=()):
+            with _Span(_statement(sql)[:80], "db", {"sql": _statement(sql)}):
+                return super().execute(sql, parameters)
+
+        def executemany(self, sql, seq_of_parameters):
+            with _Span(_statement(sql)[:80], "db", {"sql": _statement(sql), "many": True}):
+                return super().executemany(sql, seq_of_parameters)
+
+        def executescript(self, sql_script):
+            with _Span("executescript", "db", {"sql": _statement(sql_script)[:500]}):
+                return super().executescript(sql_script)
+
+        def commit(self):
+            with _Span("COMMIT", "db", {"sql": "COMMIT"}):
+                return super().commit()
+
+    original_connect = sqlite3.connect
+    _originals["sqlite3.connect"] = (sqlite3, "connect", original_connect)
+
+    @functools.wraps(original_connect)
+    def connect(database, *args, **kwargs):
+        if "factory" not in kwargs and len(args) < 5:
+            kwargs["factory"] = TracedConnection
+        with _Span(f"connect {Path(str(database)).name}", "db", {"database": str(database)}):
+            return original_connect(database, *args, **kwargs)
+
+    sqlite3.connect = connect
+
+    def name(prefix):
+        return lambda target, *a, **k: f"{prefix} {Path(str(target)).name}"
+
+    _wrap(builtins, "open", "file", lambda file, mode="r", *a, **k: f"open({mode}) {Path(str(file)).name}")
+    for method in ("read_text", "read_bytes", "write_text", "write_bytes"):
+        _wrap(pathlib.Path, method, "file", name(method))
+    for function in ("copy", "copy2", "copyfile", "copytree"):
+        _wrap(shutil, function, "file", name(function))
+    for function in ("run", "call"):
+        _wrap(subprocess, function, "subprocess",
+              lambda cmd, *a, **k: " ".join(map(str, cmd))[:80] if isinstance(cmd, (list, tuple)) else str(cmd)[:80])
+
+
+def _uninstrument():
+    for owner, attribute, original in _originals.values():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+# ============================================================================
+# LIFECYCLE
+# ============================================================================
+
+def enable(trace_path: Optional[Path] = None):
+    """Start tracing; the trace is written when the process exits"""
+    global _enabled, _origin, _trace_path
+    import atexit
+    from datetime import datetime
+
+    if _enabled:
+        return
+    _origin = time.perf_counter_ns()
+    script = Path(sys.argv[0]).stem or "python"
+    _trace_path = Path(trace_path) if trace_path else \
+        TRACES_PATH / f"{script}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json"
+    _instrument()
+    _enabled = True
+    _events.append({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                    "args": {"name": " ".join([script] + sys.argv[1:])}})
+    atexit.register(finish)
+
+
+def setup(argv: Optional[List[str]] = None) -> bool:
+    """
+    Enable tracing from --trace (removed from argv) or CLAUDE_TRACE.
+
+    Returns:
+        Whether tracing is on
+    """
+    argv = sys.argv if argv is None else argv
+    requested = "--trace" in argv
+    while "--trace" in argv:
+        argv.remove("--trace")
+
+    value = os.environ.get(ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no"):
+        value = ""
+    if requested or value:
+        path = value if value and value.lower() not in ("1", "true", "yes") else None
+        enable(Path(path).expanduser() if path else None)
+    return _enabled
+
+
+def summarize(events: List[Dict], slowest: int = SLOWEST_STATEMENTS) -> Dict:
+    """Per-category totals, query counts and the slowest statements"""
+    spans = [e for e in events if e.get("ph") == "X"]
+    categories: Dict[str, Dict] = {}
+    for event in spans:
+        totals = categories.setdefault(event["cat"], {"count": 0, "ms": 0.0})
+        totals["count"] += 1
+        totals["ms"] += event["dur"] / 1000
+
+    queries = [e for e in spans if e["cat"] == "db" and "sql" in e.get("args", {})]
+    by_statement: Dict[str, Dict] = {}
+    for event in queries:
+        stats = by_statement.setdefault(event["args"]["sql"], {"count": 0, "ms": 0.0})
+        stats["count"] += 1
+        stats["ms"] += event["dur"] / 1000
+
+    return {
+        "spans": len(spans),
+        "categories": {c: {"count": t["count"], "ms": round(t["ms"], 3)} for c, t in sorted(categories.items())},
+        "queries": len(queries),
+        "distinct_statements": len(by_statement),
+        "slowest_statements": [
+            {"sql": e["args"]["sql"][:300], "ms": round(e["dur"] / 1000, 3)}
+            for e in sorted(queries, key=lambda e: e["dur"], reverse=True)[:slowest]
+        ],
+        "top_statements": [
+            {"sql": sql[:300], "count": s["count"], "ms": round(s["ms"], 3)}
+            for sql, s in sorted(by_statement.items(), key=lambda i: i[1]["ms"], reverse=True)[:slowest]
+        ],
+    }
+
+
+def print_summary(summary: Dict, trace_path: Optional[Path] = None, out=sys.stderr):
+    target = f" → {trace_path}" if trace_path else ""
+    print(f"\n🔎 Trace: {summary['spans']} spans{target}", file=out)
+    for category, totals in summary["categories"].items():
+        print(f"  {category:<11} {totals['count']:>6} calls  {totals['ms']:>10.3f} ms", file=out)
+    print(f"  {summary['queries']} queries, {summary['distinct_statements']} distinct statements", file=out)
+    if summary["top_statements"]:
+        print("  Most time by statement:", file=out)
+        for stat in summary["top_statements"][:5]:
+            print(f"    {stat['ms']:>9.3f} ms  x{stat['count']:<4} {stat['sql'][:100]}", file=out)
+    if summary["slowest_statements"]:
+        print("  Slowest statements:", file=out)
+        for stat in summary["slowest_statements"][:5]:
+            print(f"    {stat['ms']:>9.3f} ms  {stat['sql'][:100]}", file=out)
+
+
+def finish():
+    """Write the trace file and print the summary (runs at exit)"""
+    global _enabled
+    import json
+
+    if not _enabled:
+        return
+    _enabled = False
+    _uninstrument()
+
+    summary = summarize(_events)
+    _trace_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _trace_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"traceEvents": _events, "displayTimeUnit": "ms",
+                                    "otherData": {"summary": summary}}))
+    os.replace(tmp_path, _trace_path)
+    print_summary(summary, _trace_path)
+
+
+def main():
+    """CLI entry point."""
+    if len(sys.argv) < 3 or sys.argv[1] != "summary":
+        print(__doc__.split("Usage:")[1].rstrip())
+        sys.exit(1)
+
+    import json
+
+    trace = json.loads(Path(sys.argv[2]).read_text())
+    events = trace["traceEvents"] if isinstance(trace, dict) else trace
+    print_summary(summarize(events), out=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
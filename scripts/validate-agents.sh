@@ -1,10 +1,13 @@
 #!/bin/bash
 # Agent Validation Script
 # Validates all agent files for correct YAML frontmatter and structure
+#
+# For large agent libraries use agent_validator.py instead: one process,
+# the registry's frontmatter parser, model/cross-reference checks, --json.
 
 set -e
 
-CLAUDE_AGENTS="/Users/richardglaubitz/Projects/claude-agents"
+CLAUDE_AGENTS="${1:-${CLAUDE_AGENTS_DIR:-$HOME/.claude/agents}}"
 ERRORS=0
 WARNINGS=0
 TOTAL=0
@@ -18,15 +18,16 @@ Enhanced with:
 Author: Claude Code
 """
 
-import sqlite3
 import os
 import json
 import uuid
-import subprocess
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
 
+import tracing
+from workflow_db import WorkflowDB
+
 # Configuration
 CLAUDE_HOME = Path.home() / ".claude"
 DB_PATH = CLAUDE_HOME / "data" / "workflow.db"
@@ -84,21 +85,17 @@ class WorkflowCoordinator:
     def __init__(self, db_path: Path = DB_PATH):
         self.db_path = db_path
         self._ensure_db_exists()
+        self.db = WorkflowDB(db_path)
 
     def _ensure_db_exists(self):
         """Ensure the workflow database exists."""
         if not self.db_path.exists():
             raise FileNotFoundError(
                 f"Workflow database not found at {self.db_path}. "
-                "Run database initialization first."
+                "Run: python3 ~/.claude/scripts/schema_registry.py init workflow"
             )
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.Connection(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
-
+    @tracing.traced()
     def create_project_structure(self, project_name: str, project_slug: str) -> Path:
         """
         Create the complete project folder structure with all templates.
@@ -159,6 +156,7 @@ class WorkflowCoordinator:
 
         return project_path
 
+    @tracing.traced()
     def create_workflow(self, project_name: str, user_prompt: str = "") -> Tuple[str, Path]:
         """
         Create a new workflow for a project.
@@ -188,63 +186,43 @@ class WorkflowCoordinator:
                 brief_path.write_text(content)
 
         # Create workflow in database
-        with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO workflows (id, project_name, current_phase, phase_status)
-                VALUES (?, ?, 1, 'in_progress')
-            """, (workflow_id, project_name))
-            conn.commit()
+        self.db.execute("""
+            INSERT INTO workflows (id, project_name, current_phase, phase_status)
+            VALUES (?, ?, 1, 'in_progress')
+        """, (workflow_id, project_name))
 
         return workflow_id, project_path
 
     def get_workflow(self, workflow_id: str) -> Optional[Dict]:
         """Get workflow details by ID."""
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM workflows WHERE id = ?",
-                (workflow_id,)
-            ).fetchone()
-
-            if row:
-                return dict(row)
-        return None
+        return self.db.query_one(
+            "SELECT * FROM workflows WHERE id = ?",
+            (workflow_id,)
+        )
 
     def get_workflow_by_project(self, project_name: str) -> Optional[Dict]:
         """Get workflow by project name."""
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM workflows WHERE project_name = ?",
-                (project_name,)
-            ).fetchone()
-
-            if row:
-                return dict(row)
-        return None
+        return self.db.query_one(
+            "SELECT * FROM workflows WHERE project_name = ?",
+            (project_name,)
+        )
 
     def list_workflows(self, status: Optional[str] = None) -> List[Dict]:
         """List all workflows, optionally filtered by status."""
-        with self._get_connection() as conn:
-            if status:
-                rows = conn.execute(
-                    "SELECT * FROM workflows WHERE phase_status = ? ORDER BY updated_at DESC",
-                    (status,)
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT * FROM workflows ORDER BY updated_at DESC"
-                ).fetchall()
-
-            return [dict(row) for row in rows]
+        if status:
+            return self.db.query(
+                "SELECT * FROM workflows WHERE phase_status = ? ORDER BY updated_at DESC",
+                (status,)
+            )
+        return self.db.query("SELECT * FROM workflows ORDER BY updated_at DESC")
 
     def update_phase(self, workflow_id: str, new_phase: int, status: str = "in_progress"):
         """Update workflow to a new phase."""
-        with self._get_connection() as conn:
-            conn.execute("""
-                UPDATE workflows
-                SET current_phase = ?, phase_status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (new_phase, status, workflow_id))
-            conn.commit()
+        self.db.execute("""
+            UPDATE workflows
+            SET current_phase = ?, phase_status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (new_phase, status, workflow_id))
 
     def get_phase_info(self, phase_number: int) -> Dict:
         """Get information about a specific phase."""
@@ -263,33 +241,27 @@ class WorkflowCoordinator:
         """Add a phase deliverable."""
         deliverable_id = str(uuid.uuid4())
 
-        with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO phase_deliverables
-                (id, workflow_id, phase, deliverable_type, content_path, status)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (deliverable_id, workflow_id, phase, deliverable_type, content_path, status))
-            conn.commit()
+        self.db.execute("""
+            INSERT INTO phase_deliverables
+            (id, workflow_id, phase, deliverable_type, content_path, status)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (deliverable_id, workflow_id, phase, deliverable_type, content_path, status))
 
         return deliverable_id
 
     def get_deliverables(self, workflow_id: str, phase: Optional[int] = None) -> List[Dict]:
         """Get deliverables for a workflow, optionally filtered by phase."""
-        with self._get_connection() as conn:
-            if phase:
-                rows = conn.execute("""
-                    SELECT * FROM phase_deliverables
-                    WHERE workflow_id = ? AND phase = ?
-                    ORDER BY created_at DESC
-                """, (workflow_id, phase)).fetchall()
-            else:
-                rows = conn.execute("""
-                    SELECT * FROM phase_deliverables
-                    WHERE workflow_id = ?
-                    ORDER BY phase, created_at DESC
-                """, (workflow_id,)).fetchall()
-
-            return [dict(row) for row in rows]
+        if phase:
+            return self.db.query("""
+                SELECT * FROM phase_deliverables
+                WHERE workflow_id = ? AND phase = ?
+                ORDER BY created_at DESC
+            """, (workflow_id, phase))
+        return self.db.query("""
+            SELECT * FROM phase_deliverables
+            WHERE workflow_id = ?
+            ORDER BY phase, created_at DESC
+        """, (workflow_id,))
 
     def add_task(
         self,
@@ -303,13 +275,11 @@ class WorkflowCoordinator:
         task_id = str(uuid.uuid4())
         deps_json = json.dumps(dependencies) if dependencies else None
 
-        with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO phase_tasks
-                (id, workflow_id, phase, task_description, assigned_agent, dependencies)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (task_id, workflow_id, phase, task_description, assigned_agent, deps_json))
-            conn.commit()
+        self.db.execute("""
+            INSERT INTO phase_tasks
+            (id, workflow_id, phase, task_description, assigned_agent, dependencies)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (task_id, workflow_id, phase, task_description, assigned_agent, deps_json))
 
         return task_id
 
@@ -320,39 +290,35 @@ class WorkflowCoordinator:
         status: Optional[str] = None
     ) -> List[Dict]:
         """Get tasks for a workflow."""
-        with self._get_connection() as conn:
-            query = "SELECT * FROM phase_tasks WHERE workflow_id = ?"
-            params = [workflow_id]
+        query = "SELECT * FROM phase_tasks WHERE workflow_id = ?"
+        params = [workflow_id]
 
-            if phase:
-                query += " AND phase = ?"
-                params.append(phase)
+        if phase:
+            query += " AND phase = ?"
+            params.append(phase)
 
-            if status:
-                query += " AND status = ?"
-                params.append(status)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
 
-            query += " ORDER BY created_at"
+        query += " ORDER BY created_at"
 
-            rows = conn.execute(query, params).fetchall()
-            return [dict(row) for row in rows]
+        return self.db.query(query, params)
 
     def update_task_status(self, task_id: str, status: str):
         """Update task status."""
-        with self._get_connection() as conn:
-            if status == "completed":
-                conn.execute("""
-                    UPDATE phase_tasks
-                    SET status = ?, completed_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (status, task_id))
-            else:
-                conn.execute("""
-                    UPDATE phase_tasks
-                    SET status = ?
-                    WHERE id = ?
-                """, (status, task_id))
-            conn.commit()
+        if status == "completed":
+            self.db.execute("""
+                UPDATE phase_tasks
+                SET status = ?, completed_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (status, task_id))
+        else:
+            self.db.execute("""
+                UPDATE phase_tasks
+                SET status = ?
+                WHERE id = ?
+            """, (status, task_id))
 
     def validate_phase_complete(self, workflow_id: str, phase: int) -> Tuple[bool, List[str]]:
         """
@@ -385,6 +351,7 @@ class WorkflowCoordinator:
 
         return (len(issues) == 0, issues)
 
+    @tracing.traced()
     def transition_phase(self, workflow_id: str) -> Tuple[bool, str]:
         """
         Transition to the next phase if current phase is complete.
@@ -467,6 +434,7 @@ class WorkflowCoordinator:
 
         return project_types
 
+    @tracing.traced()
     def detect_current_phase_from_state(self, project_path: Path) -> int:
         """
         Detect the appropriate workflow phase based on project state.
@@ -619,6 +587,8 @@ def main():
     """CLI interface for workflow coordinator."""
     import sys
 
+    tracing.setup()
+
     if len(sys.argv) < 2:
         print("Usage: workflow-coordinator.py <command> [args]")
         print("Commands:")
@@ -629,6 +599,7 @@ def main():
         print("  detect <project_path>        - Detect project type and phase")
         print("  agents <phase> [types...]    - Show recommended agents")
         print("  sync <workflow_id>           - Sync workflow from project context")
+        print("Add --trace (or set CLAUDE_TRACE=1) to write a timing trace of DB, file and subprocess calls")
         sys.exit(1)
 
     coordinator = WorkflowCoordinator()
@@ -671,7 +642,7 @@ def main():
         print(f"Project: {workflow['project_name']}")
         print(f"Current Phase: {workflow['current_phase']} - {phase_info['name']}")
         print(f"Status: {workflow['phase_status']}")
-        print(f"Started: {workflow['started_at']}")
+        print(f"Started: {workflow['created_at']}")
         print(f"Updated: {workflow['updated_at']}")
 
         # Show deliverables
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Workflow DB - Shared access layer for ~/.claude/data/workflow.db
+
+WorkflowCoordinator and ReviewBoardCoordinator write workflow.db from
+separate processes (and parallel agents run many of each). With the
+defaults - rollback journal, deferred transactions, no retry - a writer
+that meets another gets "database is locked". Both coordinators now go
+through WorkflowDB, which:
+
+- switches the database to WAL the first time it is opened (the mode is
+  persistent), so readers never block the writer or each other
+- sets busy_timeout, so short lock waits are absorbed by SQLite itself
+- runs every write as a short BEGIN IMMEDIATE transaction: the write lock
+  is taken up front, so a transaction never fails half-way when it tries
+  to upgrade a read lock
+- retries SQLITE_BUSY/SQLITE_LOCKED with bounded exponential backoff
+  (full jitter) when the busy timeout is not enough
+
+Callers pass writes as a function of the connection, so a retried write
+is replayed from the start inside a fresh transaction. Keep that function
+to statements only; do file I/O and id generation before calling write().
+
+Usage:
+    python3 workflow_db.py stress [--processes 32] [--writes 200] [--db PATH] [--json]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+CLAUDE_HOME = Path.home() / ".claude"
+DB_PATH = CLAUDE_HOME / "data" / "workflow.db"
+
+BUSY_TIMEOUT_MS = 5000
+MAX_RETRIES = 8
+BACKOFF_BASE = 0.01
+BACKOFF_CAP = 1.0
+
+T = TypeVar("T")
+
+
+def is_busy(error: sqlite3.OperationalError) -> bool:
+    """Whether an error is SQLITE_BUSY/SQLITE_LOCKED (worth retrying)"""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _retry_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class WorkflowDB:
+    """
+    One lazily opened connection to workflow.db with retrying reads and writes.
+
+    The connection is reopened after a fork, since SQLite connections must
+    not be shared between processes.
+    """
+
+    def __init__(self, db_path: Path = DB_PATH, max_retries: int = MAX_RETRIES):
+        self.db_path = Path(db_path)
+        self.max_retries = max_retries
+        self.stats = {"commits": 0, "retries": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except Exception:
+            conn.close()
+            raise
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = self._retry(self._open)
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _retry(self, operation: Callable[[], T]) -> T:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                if not is_busy(e) or attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(_retry_delay(attempt))
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    def query(self, sql: str, params=()) -> List[Dict]:
+        return self._retry(lambda: [dict(row) for row in self.connection().execute(sql, params).fetchall()])
+
+    def query_one(self, sql: str, params=()) -> Optional[Dict]:
+        def run():
+            row = self.connection().execute(sql, params).fetchone()
+            return dict(row) if row else None
+        return self._retry(run)
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def write(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Run work(conn) in one BEGIN IMMEDIATE transaction, retried on busy.
+
+        Returns:
+            Whatever work returns
+        """
+        def transaction():
+            conn = self.connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            return result
+
+        result = self._retry(transaction)
+        self.stats["commits"] += 1
+        return result
+
+    def execute(self, sql: str, params=()) -> int:
+        """Run one write statement in its own transaction; returns the row count"""
+        return self.write(lambda conn: conn.execute(sql, params).rowcount)
+
+
+# ============================================================================
+# STRESS TEST
+# ============================================================================
+
+def _stress_worker(db_path: str, index: int, writes: int, start, results):
+    """One writer process: the coordinators' write mix against a shared database"""
+    import uuid
+
+    rng = random.Random(index)
+    db = WorkflowDB(Path(db_path))
+    workflow_id = str(uuid.uuid4())
+    task_ids: List[str] = []
+    errors: List[str] = []
+    latencies: List[float] = []
+
+    db.connection()
+    start.wait()
+    started = time.perf_counter()
+
+    for number in range(writes):
+        kind = number % 4 if number else -1
+        t = time.perf_counter()
+        try:
+            if kind == -1:
+                db.execute("""
+                    INSERT INTO workflows (id, project_name, current_phase, phase_status)
+                    VALUES (?, ?, 1, 'in_progress')
+                """, (workflow_id, f"stress-{index}"))
+            elif kind in (0, 1) or not task_ids:
+                task_ids.append(str(uuid.uuid4()))
+                db.execute("""
+                    INSERT INTO phase_tasks (id, workflow_id, phase, task_description, assigned_agent)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (task_ids[-1], workflow_id, rng.randint(3, 5), f"Task {number}", "task-manager"))
+            elif kind == 2:
+                db.execute("""
+                    UPDATE phase_tasks SET status = 'completed', completed_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (rng.choice(task_ids),))
+                db.query("SELECT * FROM phase_tasks WHERE workflow_id = ? ORDER BY created_at", (workflow_id,))
+            else:
+                session_id = str(uuid.uuid4())
+                findings = [(str(uuid.uuid4()), session_id, role, role.upper(), "APPROVED", "", 0, 1, 2)
+                            for role in ("cio", "cto", "coo")]
+
+                def review(conn):
+                    conn.execute("""
+                        INSERT INTO review_board_sessions (id, workflow_id, session_timestamp, status)
+                        VALUES (?, ?, ?, 'approved')
+                    """, (session_id, workflow_id, str(number)))
+                    conn.executemany("""
+                        INSERT INTO review_board_findings
+                        (id, session_id, specialist_role, agent_name, verdict, report_path,
+                         blockers_count, concerns_count, recommendations_count)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, findings)
+                    conn.execute("UPDATE workflows SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                                 (workflow_id,))
+
+                db.write(review)
+        except sqlite3.Error as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - t)
+
+    results.put({"commits": db.stats["commits"], "retries": db.stats["retries"], "errors": errors,
+                 "seconds": time.perf_counter() - started, "latencies": latencies})
+    db.close()
+
+
+def stress(processes: int = 32, writes: int = 200, db_path: Optional[Path] = None) -> Dict:
+    """
+    Run concurrent writer processes against one workflow database.
+
+    Uses a fresh temporary database unless db_path is given. Workers open
+    their connections, then start together; throughput is commits over the
+    wall time from the start signal until the last worker finishes.
+    """
+    import multiprocessing
+    import shutil
+    import tempfile
+
+    from schema_registry import init_database
+
+    tmp_dir = None
+    if db_path is None:
+        tmp_dir = tempfile.mkdtemp(prefix="workflow-db-stress-")
+        db_path = Path(tmp_dir) / "workflow.db"
+    init_database("workflow", db_path)
+
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_stress_worker, args=(str(db_path), i, writes, start, results))
+               for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5)  # let every worker open its connection
+
+    started = time.perf_counter()
+    start.set()
+    reports = [results.get() for _ in workers]
+    seconds = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    journal_mode = sqlite3.connect(str(db_path)).execute("PRAGMA journal_mode").fetchone()[0]
+    if tmp_dir:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    commits = sum(r["commits"] for r in reports)
+    errors = [e for r in reports for e in r["errors"]]
+    latencies = sorted(t for r in reports for t in r["latencies"])
+    return {
+        "processes": processes,
+        "writes_per_process": writes,
+        "journal_mode": journal_mode,
+        "commits": commits,
+        "retries": sum(r["retries"] for r in reports),
+        "lock_errors": sum(1 for e in errors if "locked" in e.lower() or "busy" in e.lower()),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "seconds": round(seconds, 3),
+        "commits_per_second": round(commits / seconds) if seconds else None,
+        "write_p50_ms": round(latencies[len(latencies) // 2] * 1000, 3) if latencies else None,
+        "write_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3) if latencies else None,
+    }
+
+
+def main():
+    """CLI entry point."""
+    args = sys.argv[1:]
+    if not args or args[0] != "stress":
+        print(__doc__.split("Usage:")[1].rstrip())
+        sys.exit(1)
+
+    def option(name: str, default):
+        return type(default)(args[args.index(name) + 1]) if name in args else default
+
+    db_path = Path(args[args.index("--db") + 1]).expanduser() if "--db" in args else None
+    report = stress(option("--processes", 32), option("--writes", 200), db_path)
+
+    if "--json" in args:
+        import json
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"🧪 {report['processes']} writer processes x {report['writes_per_process']} writes "
+              f"({report['journal_mode']})")
+        print(f"  {report['commits']} commits in {report['seconds']}s → "
+              f"{report['commits_per_second']} commits/s")
+        print(f"  write latency p50 {report['write_p50_ms']} ms, p99 {report['write_p99_ms']} ms")
+        print(f"  {report['retries']} busy retries, {report['lock_errors']} lock errors, "
+              f"{report['errors']} errors")
+        for sample in report["error_samples"]:
+            print(f"  ❌ {sample}")
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()